@@ -0,0 +1,80 @@
+"""
+Local HTTP prediction server for the trained chest cancer classifier.
+Every model version saved under artifacts/training can be served: versions are loaded on their first request
+and the least recently used ones are unloaded beyond MAX_RESIDENT_MODELS / MAX_RESIDENT_MEMORY_MB. Requests
+without a version go to the trained model, or are split between versions by MODEL_TRAFFIC (A/B tests).
+Concurrent requests are coalesced into micro-batches (see MAX_BATCH_SIZE and MAX_WAIT_MS in params.yaml).
+
+Usage:
+    ```bash
+    python app.py --host 0.0.0.0 --port 8080
+    gunicorn --threads 8 app:app                # the pipeline is built on the first request
+    ```
+
+Endpoints:
+    - POST /predict: `{"image": "<base64 string>", "model_version": "<optional version>"}` -> predicted class,
+      probabilities and the model version that served it.
+    - GET /stats: resident model versions with their p50/p99 latency, throughput and mean batch size,
+      and prediction cache hit/miss counts.
+"""
+
+import argparse
+import threading
+from flask import Flask, jsonify, render_template, request
+from src.Chest_Cancer_Classification import logger
+from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
+from src.Chest_Cancer_Classification.components.model_registry import UnknownModelVersion
+from src.Chest_Cancer_Classification.pipeline.prediction_pipeline import PredictionPipeline
+
+app = Flask(__name__)
+prediction_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_prediction_pipeline() -> PredictionPipeline:
+    """
+    Returns the prediction pipeline, built on first use, so that WSGI servers importing `app:app` can serve it too.
+    """
+    global prediction_pipeline
+    if prediction_pipeline is None:
+        with _pipeline_lock:
+            if prediction_pipeline is None:
+                prediction_pipeline = PredictionPipeline(config=ConfigurationManager())
+    return prediction_pipeline
+
+
+@app.route("/", methods=["GET"])
+def home():
+    return render_template("index.html")
+
+
+@app.route("/predict", methods=["POST"])
+def predict():
+    payload = request.get_json(silent=True) or {}
+    if "image" not in payload:
+        return jsonify({"error": "Request body must be a JSON object with an 'image' base64 field."}), 400
+    try:
+        return jsonify(get_prediction_pipeline().predict(payload["image"], payload.get("model_version")))
+    except UnknownModelVersion as e:
+        return jsonify({"error": e.args[0]}), 404
+    except Exception as e:
+        logger.exception(f"Prediction failed: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/stats", methods=["GET"])
+def stats():
+    pipeline = get_prediction_pipeline()
+    return jsonify({"models": pipeline.registry.stats(), "cache": pipeline.cache.stats()})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve chest CT scan predictions over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    get_prediction_pipeline()
+    logger.info(f"Serving predictions on http://{args.host}:{args.port}")
+    # Threaded so that concurrent requests can be batched together
+    app.run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,40 @@
+"""
+Offline batch prediction over a directory of CT scans or a text file listing image paths.
+Predictions are appended to a CSV or JSON Lines file as they are produced; rerunning the same
+command after an interruption resumes from the last written record.
+
+Usage:
+    ```bash
+    python batch_predict.py path/to/scans --output artifacts/predictions/predictions.jsonl --workers 8
+    ```
+"""
+
+import argparse
+from src.Chest_Cancer_Classification import logger
+from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
+from src.Chest_Cancer_Classification.components.batch_predictor import BatchPredictor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a directory or list of chest CT images with the trained model.")
+    parser.add_argument("inputs", help="Directory of images, or a text file with one image path per line.")
+    parser.add_argument("--output", default="artifacts/predictions/predictions.jsonl",
+                        help="Output file (.csv for CSV, otherwise JSON Lines).")
+    parser.add_argument("--workers", type=int, default=None, help="Number of decode processes.")
+    parser.add_argument("--batch-size", type=int, default=32, help="Number of images per model call.")
+    parser.add_argument("--queue-size", type=int, default=256, help="Maximum decoded images waiting for the model.")
+    parser.add_argument("--no-resume", action="store_true", help="Overwrite the output file instead of resuming.")
+    args = parser.parse_args()
+
+    try:
+        batch_predictor = BatchPredictor(
+            config=ConfigurationManager().get_prediction_config(),
+            output_path=args.output,
+            num_workers=args.workers,
+            batch_size=args.batch_size,
+            queue_size=args.queue_size
+        )
+        batch_predictor.run(inputs=args.inputs, resume=not args.no_resume)
+    except Exception as e:
+        logger.exception(f"Exception occurred during batch prediction: {e}")
+        raise e
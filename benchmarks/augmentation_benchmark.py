@@ -0,0 +1,150 @@
+"""
+Benchmark of the in-graph RandomAffine augmentation against the ImageDataGenerator path it replaces.
+It measures the augmentation throughput (images/sec) of both paths on the same images, then checks that their
+outputs are comparable: the pixel intensity histograms of the augmented images and the average per-pixel change
+they apply to the originals must be close. The script exits with an error when they are not.
+Images come from the training data when it is available, otherwise synthetic images are used.
+
+Usage (from the project root):
+    ```bash
+    python -m benchmarks.augmentation_benchmark --images 256
+    ```
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from src.Chest_Cancer_Classification import logger
+from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
+from src.Chest_Cancer_Classification.components.augmentation import RandomAffine
+from src.Chest_Cancer_Classification.components.data_pipeline import DataPipeline
+from src.Chest_Cancer_Classification.utils.common import JSONHandler, create_directories
+
+
+def load_images(config: ConfigurationManager, count: int) -> np.ndarray:
+    """
+    Returns `count` float32 images with values in [0, 255], read from the training data or synthesized.
+    """
+    training_config = config.get_training_config()
+    height, width = training_config.params_image_size[:2]
+    if os.path.isdir(training_config.training_data):
+        data_pipeline = DataPipeline(config=training_config)
+        filepaths, labels = data_pipeline.list_files("training")
+        images = [
+            data_pipeline._load_image(tf.constant(path), tf.constant(label))[0].numpy()
+            for path, label in zip(filepaths[:count], labels[:count])
+        ]
+        return np.stack(images).astype(np.float32)
+
+    # Smooth gradients with bright discs, so that geometric transforms change the pixel statistics
+    rng = np.random.default_rng(0)
+    rows, cols = np.mgrid[0:height, 0:width]
+    images = np.empty((count, height, width, 3), dtype=np.float32)
+    for i in range(count):
+        image = 255 * (rows / height * rng.uniform(0.2, 0.8) + cols / width * rng.uniform(0.0, 0.2))
+        for _ in range(3):
+            center_r, center_c, radius = rng.uniform(0, height), rng.uniform(0, width), rng.uniform(10, 40)
+            image[(rows - center_r) ** 2 + (cols - center_c) ** 2 < radius ** 2] = 255
+        images[i] = np.clip(image, 0, 255)[..., None]
+    return images
+
+
+def augment_image_data_generator(images: np.ndarray, augmentation_config: dict) -> np.ndarray:
+    """
+    Augments the images one by one with ImageDataGenerator, like `flow_from_directory` does.
+    """
+    generator = keras.preprocessing.image.ImageDataGenerator(
+        **{key.lower(): value for key, value in augmentation_config.items()}
+    )
+    return np.stack([generator.random_transform(image) for image in images])
+
+
+def augment_random_affine(images: np.ndarray, augmentation_config: dict, batch_size: int) -> np.ndarray:
+    """
+    Augments the images batch by batch with RandomAffine inside a parallel tf.data pipeline.
+    """
+    augmentation = RandomAffine.from_params(augmentation_config)
+    dataset = (
+        tf.data.Dataset.from_tensor_slices(images)
+        .batch(batch_size)
+        .map(lambda batch: augmentation(batch, training=True), num_parallel_calls=tf.data.AUTOTUNE)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+    return np.concatenate([batch.numpy() for batch in dataset])
+
+
+def throughput(augment_fn, images: np.ndarray, repeats: int) -> float:
+    """
+    Returns the median augmentation throughput in images per second.
+    """
+    augment_fn(images[:8])
+    rates = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        augment_fn(images)
+        rates.append(len(images) / (time.perf_counter() - start))
+    return float(np.median(rates))
+
+
+def output_statistics(augmented: np.ndarray, images: np.ndarray) -> dict:
+    """
+    Returns the normalized pixel intensity histogram of augmented images and the mean absolute change per pixel.
+    """
+    histogram, _ = np.histogram(augmented, bins=64, range=(0, 255))
+    return {
+        "histogram": histogram / histogram.sum(),
+        "mean": float(augmented.mean()),
+        "std": float(augmented.std()),
+        "mean_abs_change": float(np.abs(augmented - images).mean())
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare ImageDataGenerator and in-graph batched augmentation.")
+    parser.add_argument("--images", type=int, default=256, help="Number of images to augment.")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of timed passes per path.")
+    parser.add_argument("--samples", type=int, default=4, help="Augmented passes used for the distribution check.")
+    parser.add_argument("--max-tv", type=float, default=0.05,
+                        help="Maximum total variation distance between the intensity histograms.")
+    parser.add_argument("--max-change-diff", type=float, default=0.15,
+                        help="Maximum relative difference of the mean absolute change.")
+    parser.add_argument("--output", default="artifacts/benchmarks/augmentation.json")
+    args = parser.parse_args()
+
+    config = ConfigurationManager()
+    augmentation_config = dict(config.params.AUGMENTATION_CONFIG)
+    batch_size = config.params.BATCH_SIZE
+    images = load_images(config, args.images)
+
+    paths = {
+        "image_data_generator": lambda x: augment_image_data_generator(x, augmentation_config),
+        "random_affine": lambda x: augment_random_affine(x, augmentation_config, batch_size)
+    }
+    results = {name: {"images_per_s": throughput(fn, images, args.repeats)} for name, fn in paths.items()}
+
+    statistics = {}
+    for name, fn in paths.items():
+        augmented = np.concatenate([fn(images) for _ in range(args.samples)])
+        statistics[name] = output_statistics(augmented, np.concatenate([images] * args.samples))
+        results[name].update({key: value for key, value in statistics[name].items() if key != "histogram"})
+
+    reference, candidate = statistics["image_data_generator"], statistics["random_affine"]
+    total_variation = 0.5 * float(np.abs(reference["histogram"] - candidate["histogram"]).sum())
+    change_diff = abs(candidate["mean_abs_change"] - reference["mean_abs_change"]) / max(reference["mean_abs_change"], 1e-6)
+    results["comparison"] = {
+        "speedup": results["random_affine"]["images_per_s"] / results["image_data_generator"]["images_per_s"],
+        "histogram_total_variation": total_variation,
+        "mean_abs_change_relative_diff": change_diff,
+        "comparable": total_variation <= args.max_tv and change_diff <= args.max_change_diff
+    }
+    for name, result in results.items():
+        logger.info(f"{name}: {result}")
+
+    create_directories([os.path.dirname(args.output)])
+    JSONHandler(path=args.output, data=results).save_json()
+    assert results["comparison"]["comparable"], (
+        f"Augmentation outputs differ: histogram TV {total_variation:.3f}, mean change diff {change_diff:.1%}"
+    )
@@ -0,0 +1,124 @@
+"""
+Benchmark of the backbones in the registry of `components.backbones`.
+For every backbone it reports the parameter count, the FLOPs of one forward pass, the median single-image CPU latency
+of the full model (backbone + the HEAD_* head of params.yaml), and, with `--epochs` > 0, the validation accuracy
+after training the head on the frozen backbone with our dataset.
+`--weights none` uses random weights so the size and speed measurements run offline.
+
+Usage (from the project root):
+    ```bash
+    python -m benchmarks.backbone_benchmark --weights none
+    python -m benchmarks.backbone_benchmark --weights imagenet --epochs 2
+    ```
+"""
+
+import os
+import time
+import argparse
+import dataclasses
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2_as_graph
+from src.Chest_Cancer_Classification import logger
+from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
+from src.Chest_Cancer_Classification.components.backbones import BACKBONES, get_backbone
+from src.Chest_Cancer_Classification.components.prepare_model import PrepareModel
+from src.Chest_Cancer_Classification.components.data_pipeline import DataPipeline
+from src.Chest_Cancer_Classification.utils.common import JSONHandler, create_directories
+
+
+def count_flops(model: keras.Model, image_size: list) -> int:
+    """
+    Returns the number of floating point operations of a single-image forward pass, counted on the frozen graph.
+    """
+    forward = tf.function(lambda images: model(images, training=False))
+    concrete = forward.get_concrete_function(tf.TensorSpec([1, *image_size], tf.float32))
+    frozen, _ = convert_variables_to_constants_v2_as_graph(concrete)
+    profile = tf.compat.v1.profiler.profile(
+        graph=frozen.graph,
+        run_meta=tf.compat.v1.RunMetadata(),
+        cmd="op",
+        options=tf.compat.v1.profiler.ProfileOptionBuilder.float_operation()
+    )
+    return int(profile.total_float_ops)
+
+
+def latency_ms(model: keras.Model, image_size: list, runs: int) -> float:
+    """
+    Returns the median single-image CPU latency of the model in milliseconds.
+    """
+    image = np.random.uniform(0, 255, size=(1, *image_size)).astype(np.float32)
+    model.predict_on_batch(image)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model.predict_on_batch(image)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def validation_accuracy(model: keras.Model, config: ConfigurationManager, backbone: str, epochs: int) -> float:
+    """
+    Trains the head of the model on the training subset and returns its accuracy on the validation subset.
+    """
+    training_config = dataclasses.replace(config.get_training_config(), params_backbone=backbone)
+    data_pipeline = DataPipeline(config=training_config)
+    if training_config.params_use_image_cache:
+        data_pipeline.prepare_cache()
+
+    model.compile(
+        optimizer=keras.optimizers.AdamW(learning_rate=config.params.LEARNING_RATE),
+        loss=keras.losses.CategoricalCrossentropy(),
+        metrics=["accuracy"]
+    )
+    model.fit(data_pipeline.build(subset="training", shuffle=True), epochs=epochs, verbose=0)
+    _, accuracy = model.evaluate(data_pipeline.build(subset="validation", shuffle=False), verbose=0)
+    return float(accuracy)
+
+
+def benchmark_backbone(name: str, config: ConfigurationManager, weights: str, runs: int, epochs: int) -> dict:
+    """
+    Builds the full model on the given backbone and measures it.
+    """
+    params = config.params
+    model = PrepareModel._prepare_full_model(
+        model=get_backbone(name).build(input_shape=params.IMAGE_SIZE, weights=weights, include_top=False),
+        classes=params.CLASSES,
+        freeze_all=True,
+        freeze_till=None,
+        learning_rate=params.LEARNING_RATE,
+        pooling=params.HEAD_POOLING,
+        hidden_units=params.HEAD_HIDDEN_UNITS,
+        dropout=params.HEAD_DROPOUT
+    )
+    result = {
+        "params": int(model.count_params()),
+        "backbone_params": int(model.layers[0].count_params()),
+        "flops": count_flops(model, params.IMAGE_SIZE),
+        "latency_ms": latency_ms(model, params.IMAGE_SIZE, runs),
+        "val_accuracy": None
+    }
+    if epochs > 0:
+        result["val_accuracy"] = validation_accuracy(model, config, name, epochs)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the size, speed and accuracy of the registered backbones.")
+    parser.add_argument("--backbones", nargs="+", default=list(BACKBONES), choices=list(BACKBONES))
+    parser.add_argument("--weights", default="imagenet", help="'imagenet', or 'none' for random weights (offline).")
+    parser.add_argument("--runs", type=int, default=20, help="Number of timed inference runs per backbone.")
+    parser.add_argument("--epochs", type=int, default=0, help="Head training epochs for the accuracy measurement (0 to skip).")
+    parser.add_argument("--output", default="artifacts/benchmarks/backbones.json")
+    args = parser.parse_args()
+
+    config = ConfigurationManager()
+    weights = None if args.weights.lower() == "none" else args.weights
+    results = {}
+    for name in args.backbones:
+        results[name] = benchmark_backbone(name, config, weights, args.runs, args.epochs)
+        logger.info(f"{name}: {results[name]}")
+
+    create_directories([os.path.dirname(args.output)])
+    JSONHandler(path=args.output, data=results).save_json()
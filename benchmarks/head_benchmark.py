@@ -0,0 +1,89 @@
+"""
+Benchmark of the classification head architectures built by `PrepareModel.build_head`.
+For every head it reports the head parameter count, the size of the saved .h5 file, the median training
+step time and the median single-image inference latency on CPU. The VGG16 backbone uses random weights
+(`weights=None`) so the benchmark runs offline, and it is frozen as in the prepare_model stage.
+
+Usage (from the project root):
+    ```bash
+    python -m benchmarks.head_benchmark --steps 10
+    ```
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+from tensorflow import keras
+from src.Chest_Cancer_Classification import logger
+from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
+from src.Chest_Cancer_Classification.components.prepare_model import PrepareModel
+from src.Chest_Cancer_Classification.utils.common import JSONHandler, create_directories
+
+HEADS = {
+    "flatten": {"pooling": "flatten"},
+    "avg": {"pooling": "avg"},
+    "max": {"pooling": "max"},
+    "avg+hidden256+dropout": {"pooling": "avg", "hidden_units": 256, "dropout": 0.5},
+}
+
+
+def _median_ms(fn, runs: int) -> float:
+    """
+    Calls `fn` once to warm up, then returns its median run time over `runs` calls in milliseconds.
+    """
+    fn()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def benchmark_head(head: dict, image_size: list, classes: int, batch_size: int, steps: int) -> dict:
+    """
+    Builds the full model with the given head and measures its size and speed.
+    """
+    model = PrepareModel._prepare_full_model(
+        model=keras.applications.vgg16.VGG16(input_shape=image_size, weights=None, include_top=False),
+        classes=classes,
+        freeze_all=True,
+        freeze_till=None,
+        learning_rate=0.01,
+        **head
+    )
+    head_params = sum(layer.count_params() for layer in model.layers[1:])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "model.h5")
+        model.save(path)
+        file_mb = os.path.getsize(path) / 2**20
+
+    images = np.random.rand(batch_size, *image_size).astype(np.float32)
+    labels = keras.utils.to_categorical(np.random.randint(classes, size=batch_size), classes)
+    image = images[:1]
+
+    return {
+        "head_params": int(head_params),
+        "model_file_mb": round(file_mb, 2),
+        "train_step_ms": _median_ms(lambda: model.train_on_batch(images, labels), steps),
+        "inference_ms": _median_ms(lambda: model.predict_on_batch(image), steps)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare classification head architectures.")
+    parser.add_argument("--steps", type=int, default=10, help="Number of timed steps per measurement.")
+    parser.add_argument("--output", default="artifacts/benchmarks/heads.json")
+    args = parser.parse_args()
+
+    params = ConfigurationManager().params
+    results = {}
+    for name, head in HEADS.items():
+        results[name] = benchmark_head(head, params.IMAGE_SIZE, params.CLASSES, params.BATCH_SIZE, args.steps)
+        logger.info(f"{name}: {results[name]}")
+
+    create_directories([os.path.dirname(args.output)])
+    JSONHandler(path=args.output, data=results).save_json()
@@ -0,0 +1,56 @@
+"""
+Benchmark of the import time of the configuration layer.
+Each module is imported in a fresh interpreter, which exits with an error if the import takes longer than
+the budget or pulls in TensorFlow, so the script can be used as a regression check.
+
+Usage (from the project root):
+    ```bash
+    python -m benchmarks.import_time_benchmark --budget 1.0
+    ```
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+
+MODULES = [
+    "Chest_Cancer_Classification.config.configuration",
+    "Chest_Cancer_Classification.pipeline.stage_runner",
+    "Chest_Cancer_Classification.components.data_ingestion",
+]
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start, "tensorflow": "tensorflow" in sys.modules}}))
+"""
+
+
+def measure(module: str) -> dict:
+    """
+    Imports a module in a fresh interpreter and returns its import time and whether TensorFlow was loaded.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        capture_output=True, text=True, check=True, cwd="src"
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that the configuration layer imports fast and without TensorFlow.")
+    parser.add_argument("--budget", type=float, default=1.0, help="Maximum import time per module in seconds.")
+    args = parser.parse_args()
+
+    failures = []
+    for module in MODULES:
+        result = measure(module)
+        print(f"{module}: {result['seconds'] * 1000:.0f} ms, tensorflow loaded: {result['tensorflow']}")
+        if result["tensorflow"]:
+            failures.append(f"{module} imports TensorFlow")
+        if result["seconds"] > args.budget:
+            failures.append(f"{module} took {result['seconds']:.2f}s (budget {args.budget:.2f}s)")
+
+    assert not failures, "; ".join(failures)
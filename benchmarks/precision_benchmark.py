@@ -0,0 +1,84 @@
+"""
+Benchmark of the training step time on CPU for every MIXED_PRECISION / JIT_COMPILE combination.
+The model is the VGG16 + Flatten + Dense network built by PrepareModel, with random weights (`weights=None`)
+so the benchmark runs offline, trained on a random batch of BATCH_SIZE images.
+
+Usage (from the project root):
+    ```bash
+    python -m benchmarks.precision_benchmark --steps 10
+    ```
+"""
+
+import os
+import time
+import argparse
+import itertools
+import numpy as np
+from tensorflow import keras
+from src.Chest_Cancer_Classification import logger
+from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
+from src.Chest_Cancer_Classification.components.prepare_model import PrepareModel
+from src.Chest_Cancer_Classification.components.trainer import Trainer
+from src.Chest_Cancer_Classification.utils.common import JSONHandler, create_directories
+
+POLICIES = ["float32", "mixed_float16", "mixed_bfloat16"]
+JIT_COMPILE = [False, True]
+
+
+def benchmark_step_time(policy: str, jit_compile: bool, image_size: list, classes: int,
+                        batch_size: int, steps: int) -> float:
+    """
+    Returns the median training step time in milliseconds for one precision/JIT setting.
+    """
+    keras.mixed_precision.set_global_policy("float32")
+    model = PrepareModel._prepare_full_model(
+        model=keras.applications.vgg16.VGG16(input_shape=image_size, weights=None, include_top=False),
+        classes=classes,
+        freeze_all=True,
+        freeze_till=None,
+        learning_rate=0.01
+    )
+    if policy != "float32":
+        model = Trainer.apply_precision_policy(model, policy)
+    model.compile(
+        optimizer=keras.optimizers.AdamW(learning_rate=0.01),
+        loss=keras.losses.CategoricalCrossentropy(),
+        metrics=["accuracy"],
+        jit_compile=jit_compile
+    )
+
+    images = np.random.rand(batch_size, *image_size).astype(np.float32)
+    labels = keras.utils.to_categorical(np.random.randint(classes, size=batch_size), classes)
+
+    # The first step traces (and compiles, with XLA) the train function
+    model.train_on_batch(images, labels)
+    timings = []
+    for _ in range(steps):
+        start = time.perf_counter()
+        model.train_on_batch(images, labels)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare CPU training step time across precision settings.")
+    parser.add_argument("--steps", type=int, default=10, help="Number of timed training steps per setting.")
+    parser.add_argument("--output", default="artifacts/benchmarks/precision.json")
+    args = parser.parse_args()
+
+    params = ConfigurationManager().params
+    results = {}
+    for policy, jit_compile in itertools.product(POLICIES, JIT_COMPILE):
+        name = f"{policy}{'+xla' if jit_compile else ''}"
+        try:
+            results[name] = benchmark_step_time(
+                policy, jit_compile, params.IMAGE_SIZE, params.CLASSES, params.BATCH_SIZE, args.steps
+            )
+            logger.info(f"{name}: {results[name]:.1f} ms/step")
+        except Exception as e:
+            # Not every CPU / TF build supports every policy under XLA
+            logger.error(f"{name}: failed with {e}")
+            results[name] = None
+
+    create_directories([os.path.dirname(args.output)])
+    JSONHandler(path=args.output, data=results).save_json()
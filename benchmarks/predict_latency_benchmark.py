@@ -0,0 +1,90 @@
+"""
+Benchmark of the inference latency of `model.predict`, `model.predict_on_batch` and the CompiledPredictor
+for batch sizes from 1 to 64, including sizes that are not buckets so that the padding cost shows up.
+It also reports how many times the CompiledPredictor function was traced over the whole run.
+The model is the trained model when it exists, otherwise the network built by PrepareModel with random weights
+(`weights=None`), so the benchmark runs offline.
+
+Usage (from the project root):
+    ```bash
+    python -m benchmarks.predict_latency_benchmark --repeats 20
+    ```
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+from tensorflow import keras
+from src.Chest_Cancer_Classification import logger
+from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
+from src.Chest_Cancer_Classification.components.prepare_model import PrepareModel
+from src.Chest_Cancer_Classification.components.compiled_predictor import CompiledPredictor
+from src.Chest_Cancer_Classification.utils.common import JSONHandler, create_directories
+
+BATCH_SIZES = [1, 2, 3, 4, 8, 12, 16, 24, 32, 48, 64]
+
+
+def load_model(config: ConfigurationManager) -> keras.Model:
+    """
+    Returns the trained model, or an untrained model of the same architecture.
+    """
+    prediction_config = config.get_prediction_config()
+    if os.path.exists(prediction_config.trained_model_path):
+        return keras.models.load_model(prediction_config.trained_model_path)
+    return PrepareModel._prepare_full_model(
+        model=keras.applications.vgg16.VGG16(input_shape=prediction_config.params_image_size, weights=None,
+                                             include_top=False),
+        classes=prediction_config.params_classes,
+        freeze_all=True,
+        freeze_till=None,
+        learning_rate=0.01
+    )
+
+
+def latency_ms(predict_fn, images: np.ndarray, repeats: int) -> dict:
+    """
+    Returns the median and p99 latency of one call in milliseconds, after a warmup call.
+    """
+    predict_fn(images)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict_fn(images)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": float(np.median(timings)), "p99_ms": float(np.percentile(timings, 99))}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare inference latency across batch sizes and predict paths.")
+    parser.add_argument("--repeats", type=int, default=20, help="Number of timed calls per batch size and path.")
+    parser.add_argument("--output", default="artifacts/benchmarks/predict_latency.json")
+    args = parser.parse_args()
+
+    config = ConfigurationManager()
+    prediction_config = config.get_prediction_config()
+    model = load_model(config)
+    predictor = CompiledPredictor.from_config(model, prediction_config)
+    predictor.warmup()
+
+    paths = {
+        "predict": lambda x: model.predict(x, verbose=0),
+        "predict_on_batch": model.predict_on_batch,
+        "compiled": predictor.predict
+    }
+    results = {}
+    for batch_size in BATCH_SIZES:
+        images = np.random.rand(batch_size, *prediction_config.params_image_size).astype(np.float32)
+        results[batch_size] = {
+            name: latency_ms(predict_fn, images, args.repeats) for name, predict_fn in paths.items()
+        }
+        results[batch_size]["bucket"] = predictor.bucket(batch_size)
+        results[batch_size]["speedup_vs_predict"] = (
+            results[batch_size]["predict"]["p50_ms"] / results[batch_size]["compiled"]["p50_ms"]
+        )
+        logger.info(f"batch {batch_size}: {results[batch_size]}")
+
+    results = {"batch_sizes": results, "compiled_tracing_count": predictor.tracing_count}
+    logger.info(f"CompiledPredictor traced {predictor.tracing_count} time(s)")
+    create_directories([os.path.dirname(args.output)])
+    JSONHandler(path=args.output, data=results).save_json()
@@ -1,31 +1,39 @@
+"""
+Runs the training pipeline stage by stage, skipping stages whose inputs and outputs did not change
+since their last successful run.
+
+Usage:
+    ```bash
+    python main.py                          # run the stages that are out of date
+    python main.py --dry-run                # report which stages would run
+    python main.py --force                  # run every stage
+    python main.py --from-stage training    # run training and every stage after it
+    python main.py --set params.EPOCHS=5    # override a params.yaml / config.yaml value for this run
+    ```
+"""
+
+import argparse
 from src.Chest_Cancer_Classification import logger
 from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
-from src.Chest_Cancer_Classification.pipeline.data_ingestion_pipeline import DataIngestionPipeline
-from src.Chest_Cancer_Classification.pipeline.prepare_model_pipeline import PrepareModelTrainingPipeline
-from src.Chest_Cancer_Classification.pipeline.training_pipeline import ModelTrainingPipeline
+from src.Chest_Cancer_Classification.pipeline.stage_runner import StageRunner
 from src.Chest_Cancer_Classification.constants import *
 
-config = ConfigurationManager()
-
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the chest cancer classification pipeline.")
+    parser.add_argument("--force", action="store_true", help="Run every stage, even if it is up to date.")
+    parser.add_argument("--from-stage", default=None,
+                        help="Run this stage and every stage after it, skipping the ones before.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report which stages would run.")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a value, e.g. params.LEARNING_RATE=0.001 or config.training.root_dir=out.")
+    args = parser.parse_args()
+    overrides = dict(override.split("=", 1) for override in args.set)
+
     try:
         logger.info(f"{'>>'*20} {'Pipeline Execution Started'} {'<<'*20}")
-
-        # logger.info(f"{'>>'*20} STAGE 1: Data Ingestion {'<<'*20}")
-        # data_ingestion_pipeline = DataIngestionPipeline(config=config)
-        # data_ingestion_pipeline.main()
-        # logger.info("Data Ingestion Pipeline completed successfully.")
-
-        # logger.info(f"{'>>'*20} STAGE 2: Prepare Model {'<<'*20}")
-        # prepare_model_pipeline = PrepareModelTrainingPipeline(config=config)
-        # prepare_model_pipeline.main()
-        # logger.info("Prepare Model Pipeline completed successfully.")
-
-        logger.info(f"{'>>'*20} STAGE 3: Model Training {'<<'*20}")
-        model_training_pipeline = ModelTrainingPipeline(config=config)
-        model_training_pipeline.main()
-        logger.info("Model Training Pipeline completed successfully.")
-
+        config = ConfigurationManager(overrides=overrides)
+        stage_runner = StageRunner(config=config)
+        stage_runner.run(force=args.force, from_stage=args.from_stage, dry_run=args.dry_run)
         logger.info(f"{'>>'*20} {'Pipeline Execution Completed'} {'<<'*20}")
     except Exception as e:
         logger.exception(f"Exception occurred during pipeline execution: {e}")
@@ -0,0 +1,116 @@
+"""
+This module contains the RandomAffine layer, the in-graph replacement of ImageDataGenerator's random augmentation.
+It samples the same random rotation, shifts, shear, zoom and horizontal flip as `ImageDataGenerator.random_transform`,
+composes them into one projective transform per image and resamples the whole batch with a single
+`ImageProjectiveTransformV3` op, so augmentation runs inside the TensorFlow runtime on every core instead of
+image by image in NumPy/SciPy.
+"""
+
+import math
+import tensorflow as tf
+from tensorflow import keras
+
+
+class RandomAffine(keras.layers.Layer):
+    """
+    Random affine augmentation of a batch of images, with the argument semantics of ImageDataGenerator:
+    rotation in degrees, shifts as fractions of the image size, shear angle in degrees and zoom as a range
+    around 1, with nearest fill mode and bilinear interpolation.
+    """
+    def __init__(self, rotation_range: float = 0.0, width_shift_range: float = 0.0, height_shift_range: float = 0.0,
+                 shear_range: float = 0.0, zoom_range: float = 0.0, horizontal_flip: bool = False,
+                 fill_mode: str = "nearest", interpolation: str = "bilinear", **kwargs):
+        super().__init__(**kwargs)
+        self.rotation_range = rotation_range
+        self.width_shift_range = width_shift_range
+        self.height_shift_range = height_shift_range
+        self.shear_range = shear_range
+        self.zoom_range = zoom_range
+        self.horizontal_flip = horizontal_flip
+        self.fill_mode = fill_mode
+        self.interpolation = interpolation
+
+    @classmethod
+    def from_params(cls, augmentation_config: dict) -> "RandomAffine":
+        """
+        Builds the layer from AUGMENTATION_CONFIG in params.yaml, whose keys are the upper-cased
+        ImageDataGenerator arguments (ROTATION_RANGE, WIDTH_SHIFT_RANGE, ...).
+        """
+        return cls(**{key.lower(): value for key, value in augmentation_config.items()})
+
+    def get_config(self) -> dict:
+        return {
+            **super().get_config(),
+            "rotation_range": self.rotation_range,
+            "width_shift_range": self.width_shift_range,
+            "height_shift_range": self.height_shift_range,
+            "shear_range": self.shear_range,
+            "zoom_range": self.zoom_range,
+            "horizontal_flip": self.horizontal_flip,
+            "fill_mode": self.fill_mode,
+            "interpolation": self.interpolation
+        }
+
+    def _transforms(self, batch_size: tf.Tensor, height: tf.Tensor, width: tf.Tensor) -> tf.Tensor:
+        """
+        Samples one transform per image, mapping output (x, y) coordinates to input coordinates.
+        Returns:
+            tf.Tensor: [batch_size, 8] transforms in the format of ImageProjectiveTransformV3.
+        """
+        def uniform(low, high):
+            return tf.random.uniform([batch_size], low, high, dtype=tf.float32)
+
+        theta = uniform(-self.rotation_range, self.rotation_range) * (math.pi / 180)
+        shear = uniform(-self.shear_range, self.shear_range) * (math.pi / 180)
+        shift_x = uniform(-self.width_shift_range, self.width_shift_range) * width
+        shift_y = uniform(-self.height_shift_range, self.height_shift_range) * height
+        zoom_y = uniform(1 - self.zoom_range, 1 + self.zoom_range)
+        zoom_x = uniform(1 - self.zoom_range, 1 + self.zoom_range)
+
+        # ImageDataGenerator maps output to input (row, col) coordinates with rotation @ shift @ shear @ zoom
+        # around the image center, shear being [[1, -sin], [0, cos]]; below is the same matrix in (x, y) order
+        cos, sin = tf.cos(theta), tf.sin(theta)
+        shear_cos, shear_sin = tf.cos(shear), tf.sin(shear)
+        a0 = (cos * shear_cos - sin * shear_sin) * zoom_x
+        a1 = sin * zoom_y
+        b0 = -(cos * shear_sin + sin * shear_cos) * zoom_x
+        b1 = cos * zoom_y
+        center_x, center_y = (width - 1) / 2, (height - 1) / 2
+        a2 = center_x - a0 * center_x - a1 * center_y + cos * shift_x + sin * shift_y
+        b2 = center_y - b0 * center_x - b1 * center_y - sin * shift_x + cos * shift_y
+
+        if self.horizontal_flip:
+            # The flip is applied to the transformed image: x_out -> width - 1 - x_out
+            flip = uniform(0.0, 1.0) < 0.5
+            a2 = tf.where(flip, a0 * (width - 1) + a2, a2)
+            b2 = tf.where(flip, b0 * (width - 1) + b2, b2)
+            a0 = tf.where(flip, -a0, a0)
+            b0 = tf.where(flip, -b0, b0)
+
+        zeros = tf.zeros([batch_size], dtype=tf.float32)
+        return tf.stack([a0, a1, a2, b0, b1, b2, zeros, zeros], axis=1)
+
+    def call(self, images: tf.Tensor, training: bool = None) -> tf.Tensor:
+        """
+        Augments a batch of images (or a single image); images are returned unchanged outside training.
+        """
+        if not training:
+            return images
+        unbatched = images.shape.rank == 3
+        if unbatched:
+            images = tf.expand_dims(images, 0)
+
+        dtype = images.dtype
+        images = tf.cast(images, tf.float32)
+        shape = tf.shape(images)
+        height, width = tf.cast(shape[1], tf.float32), tf.cast(shape[2], tf.float32)
+        images = tf.raw_ops.ImageProjectiveTransformV3(
+            images=images,
+            transforms=self._transforms(shape[0], height, width),
+            output_shape=shape[1:3],
+            fill_value=0.0,
+            interpolation=self.interpolation.upper(),
+            fill_mode=self.fill_mode.upper()
+        )
+        images = tf.cast(images, dtype)
+        return images[0] if unbatched else images
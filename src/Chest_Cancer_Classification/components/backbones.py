@@ -0,0 +1,93 @@
+"""
+This module contains the registry of backbones available to PrepareModel, selected with BACKBONE in params.yaml.
+Every backbone comes with the preprocessing its ImageNet weights were trained with, applied by the input pipelines
+to raw pixel values in [0, 255], and with the pattern grouping its layers into blocks for progressive fine-tuning.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable
+from tensorflow import keras
+
+
+@dataclass(frozen=True)
+class Backbone:
+    """
+    Backbone Definition
+    """
+    build: Callable
+    preprocess: Callable
+    block_pattern: str
+
+
+def _identity(images):
+    """
+    Returns the images unchanged, for backbones that rescale their inputs inside the model.
+    """
+    return images
+
+
+BACKBONES = {
+    "vgg16": Backbone(
+        build=keras.applications.VGG16,
+        preprocess=keras.applications.vgg16.preprocess_input,
+        block_pattern=r"^(block\d+)_"
+    ),
+    "resnet50": Backbone(
+        build=keras.applications.ResNet50,
+        preprocess=keras.applications.resnet50.preprocess_input,
+        block_pattern=r"^(conv\d+)_"
+    ),
+    # MobileNetV3 and EfficientNet include their Rescaling/Normalization layers and expect [0, 255] inputs
+    "mobilenet_v3_small": Backbone(
+        build=keras.applications.MobileNetV3Small,
+        preprocess=_identity,
+        block_pattern=r"^(expanded_conv(?:_\d+)?)/"
+    ),
+    "mobilenet_v3_large": Backbone(
+        build=keras.applications.MobileNetV3Large,
+        preprocess=_identity,
+        block_pattern=r"^(expanded_conv(?:_\d+)?)/"
+    ),
+    "efficientnet_b0": Backbone(
+        build=keras.applications.EfficientNetB0,
+        preprocess=_identity,
+        block_pattern=r"^(block\d+)[a-z]_"
+    ),
+}
+
+
+def get_backbone(name: str) -> Backbone:
+    """
+    Returns the registered backbone with the given name.
+    Args:
+        name (str): Backbone name, a key of BACKBONES.
+    Returns:
+        Backbone: The backbone definition.
+    """
+    if name not in BACKBONES:
+        raise ValueError(f"Invalid backbone {name}. Use one of {', '.join(BACKBONES)}.")
+    return BACKBONES[name]
+
+
+def preprocess_input(images, name: str):
+    """
+    Applies the preprocessing of a backbone to raw pixel values.
+    Args:
+        images (np.ndarray | tf.Tensor): Float images with values in [0, 255].
+        name (str): Backbone name.
+    Returns:
+        The preprocessed images, of the same type.
+    """
+    return get_backbone(name).preprocess(images)
+
+
+def block_of(layer_name: str, name: str) -> str:
+    """
+    Returns the block a backbone layer belongs to, or None for layers outside any block (stem, pooling, head).
+    Args:
+        layer_name (str): Name of the layer.
+        name (str): Backbone name.
+    """
+    match = re.match(get_backbone(name).block_pattern, layer_name)
+    return match.group(1) if match else None
@@ -0,0 +1,226 @@
+"""
+This module contains the BatchPredictor class, which scores large collections of images offline.
+Images are streamed through a bounded producer/consumer pipeline: a pool of decode worker processes
+reads and resizes the images, and a single consumer holding the model predicts them batch by batch
+and appends the results to a CSV or JSON Lines file, so that an interrupted run can resume where it stopped.
+Images already scored by the same model are answered from the prediction cache.
+"""
+
+import os
+import threading
+import multiprocessing as mp
+from pathlib import Path
+import numpy as np
+from PIL import Image
+from Chest_Cancer_Classification import logger
+from Chest_Cancer_Classification.entity.config_entity import PredictionConfig
+from Chest_Cancer_Classification.components.prediction_cache import PredictionCache, model_version
+from Chest_Cancer_Classification.constants import WHITE_LIST_FORMATS
+from Chest_Cancer_Classification.utils.common import CSVHandler, JSONLHandler, get_class_names
+
+_DONE = None
+
+
+def _decode_worker(task_queue: mp.Queue, result_queue: mp.Queue, image_size: list):
+    """
+    Decode worker loop: reads paths from the task queue and puts (path, uint8 image, error) on the result queue.
+    """
+    height, width = image_size[:2]
+    while True:
+        path = task_queue.get()
+        if path is _DONE:
+            result_queue.put(_DONE)
+            return
+        try:
+            with Image.open(path) as image:
+                array = np.asarray(image.convert("RGB").resize((width, height), Image.BILINEAR), dtype=np.uint8)
+            result_queue.put((path, array, None))
+        except Exception as e:
+            result_queue.put((path, None, str(e)))
+
+
+class BatchPredictor:
+    """
+    This class is responsible for batch prediction over a directory or a list of image files.
+    """
+    def __init__(self, config: PredictionConfig, output_path: Path, num_workers: int = None,
+                 batch_size: int = 32, queue_size: int = 256):
+        """
+        Initializes the BatchPredictor class.
+        Args:
+            config (PredictionConfig): Prediction configuration.
+            output_path (Path): Output file; ".csv" writes CSV, anything else writes JSON Lines.
+            num_workers (int): Number of decode processes (defaults to the CPU count).
+            batch_size (int): Number of images per model call.
+            queue_size (int): Maximum number of decoded images waiting for the model.
+        """
+        self.config = config
+        self.output_path = Path(output_path)
+        self.num_workers = num_workers or os.cpu_count()
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.class_names = get_class_names(config.training_data, config.params_classes)
+        self.writer = self._writer(self.output_path)
+        self.predictor = None
+        self.preprocess = None
+        self.model_version = None
+        self.cache = PredictionCache.from_config(config)
+
+    def _writer(self, path: Path):
+        """
+        Returns the CSV writer of a ".csv" path, otherwise the JSON Lines writer.
+        """
+        if path.suffix.lower() == ".csv":
+            return CSVHandler(path=str(path), fieldnames=["path", "prediction", "error", *self.class_names])
+        return JSONLHandler(path=str(path))
+
+    @staticmethod
+    def list_inputs(inputs: Path) -> list:
+        """
+        Lists the images to score.
+        Args:
+            inputs (Path): A directory (searched recursively) or a text file with one image path per line.
+        Returns:
+            list: Sorted image paths.
+        """
+        inputs = Path(inputs)
+        if inputs.is_dir():
+            return sorted(
+                os.path.join(root, fname)
+                for root, _, fnames in os.walk(inputs)
+                for fname in fnames
+                if fname.lower().endswith(WHITE_LIST_FORMATS)
+            )
+        with open(inputs, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+
+    def _pending(self, paths: list, resume: bool) -> list:
+        """
+        Removes the paths already scored in the output file when resuming.
+        Images that failed to decode are retried: their records are dropped from the output file.
+        """
+        if not resume:
+            if self.output_path.exists():
+                os.remove(self.output_path)
+            return paths
+        records = self.writer.load()
+        # CSV rows read back an empty string for a missing error
+        scored = [record for record in records if not record.get("error")]
+        if len(scored) < len(records):
+            logger.info(f"Retrying {len(records) - len(scored)} images that failed to decode")
+            tmp_path = self.output_path.with_name(f"{self.output_path.stem}.tmp{self.output_path.suffix}")
+            if tmp_path.exists():
+                os.remove(tmp_path)
+            self._writer(tmp_path).append(scored)
+            os.replace(tmp_path, self.output_path)
+        done = {record["path"] for record in scored}
+        if done:
+            logger.info(f"Resuming: {len(done)} images already scored in {self.output_path}")
+        return [path for path in paths if path not in done]
+
+    def _records(self, paths: list, images: list) -> list:
+        """
+        Predicts a batch of decoded images and builds the output records; only cache misses reach the model.
+        """
+        keys = [self.cache.key(image, self.model_version) for image in images]
+        probabilities = [self.cache.get(key) for key in keys]
+        misses = [i for i, probs in enumerate(probabilities) if probs is None]
+        if misses:
+            batch = np.stack([images[i] for i in misses]).astype(np.float32)
+            for i, probs in zip(misses, self.predictor.predict(self.preprocess(batch))):
+                self.cache.put(keys[i], probs)
+                probabilities[i] = probs
+        records = []
+        for path, probs in zip(paths, probabilities):
+            record = {"path": path, "prediction": self.class_names[int(np.argmax(probs))], "error": None}
+            scores = dict(zip(self.class_names, map(float, probs)))
+            if isinstance(self.writer, CSVHandler):
+                record.update(scores)
+            else:
+                record["probabilities"] = scores
+            records.append(record)
+        return records
+
+    def run(self, inputs: Path, resume: bool = True) -> int:
+        """
+        Scores every pending image and appends the predictions to the output file.
+        Args:
+            inputs (Path): A directory or a text file listing image paths.
+            resume (bool): Whether to skip images already present in the output file.
+        Returns:
+            int: Number of images written during this run.
+        """
+        paths = self._pending(self.list_inputs(inputs), resume)
+        logger.info(f"Scoring {len(paths)} images with {self.num_workers} decode workers")
+        if not paths:
+            return 0
+
+        os.makedirs(self.output_path.parent, exist_ok=True)
+        # Decode workers are spawned, not forked: a fork would copy the TensorFlow runtime with its thread pools
+        # (and the SQLite connection of the cache) into the children, which can deadlock them
+        context = mp.get_context("spawn")
+        from tensorflow import keras
+        from Chest_Cancer_Classification.components.backbones import get_backbone
+        from Chest_Cancer_Classification.components.compiled_predictor import CompiledPredictor
+
+        self.predictor = CompiledPredictor.from_config(keras.models.load_model(self.config.trained_model_path), self.config)
+        self.predictor.warmup()
+        self.model_version = model_version(self.config.trained_model_path)
+        self.preprocess = get_backbone(self.config.params_backbone).preprocess
+
+        task_queue = context.Queue(maxsize=self.queue_size)
+        result_queue = context.Queue(maxsize=self.queue_size)
+        workers = [
+            context.Process(
+                target=_decode_worker,
+                args=(task_queue, result_queue, self.config.params_image_size),
+                daemon=True
+            )
+            for _ in range(self.num_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        def _produce():
+            for path in paths:
+                task_queue.put(path)
+            for _ in workers:
+                task_queue.put(_DONE)
+
+        producer = threading.Thread(target=_produce, daemon=True)
+        producer.start()
+
+        written, finished = 0, 0
+        batch_paths, batch_images = [], []
+        try:
+            while finished < len(workers):
+                item = result_queue.get()
+                if item is _DONE:
+                    finished += 1
+                    continue
+
+                path, image, error = item
+                if error is not None:
+                    logger.error(f"Could not decode {path}: {error}")
+                    self.writer.append([{"path": path, "prediction": None, "error": error}])
+                    written += 1
+                    continue
+
+                batch_paths.append(path)
+                batch_images.append(image)
+                if len(batch_paths) == self.batch_size:
+                    self.writer.append(self._records(batch_paths, batch_images))
+                    written += len(batch_paths)
+                    batch_paths, batch_images = [], []
+
+            if batch_paths:
+                self.writer.append(self._records(batch_paths, batch_images))
+                written += len(batch_paths)
+        finally:
+            for worker in workers:
+                worker.join(timeout=1)
+                if worker.is_alive():
+                    worker.terminate()
+
+        logger.info(f"Wrote {written} predictions to {self.output_path}, cache: {self.cache.stats()}")
+        return written
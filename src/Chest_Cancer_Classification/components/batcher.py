@@ -0,0 +1,175 @@
+"""
+This module contains the DynamicBatcher class, which coalesces concurrent prediction requests into micro-batches.
+Requests are queued by the serving threads and a single worker thread groups them into batches of at most
+`max_batch_size` items, waiting at most `max_wait_ms` for a batch to fill, before calling the model once per batch.
+It also records per-request latency and throughput.
+"""
+
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable
+import numpy as np
+from Chest_Cancer_Classification import logger
+
+_CLOSE = None
+
+
+class LatencyStats:
+    """
+    This class keeps a sliding window of request latencies and counts served requests and batches.
+    """
+    def __init__(self, window: int = 10000):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.batches = 0
+        self.started_at = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def record(self, latencies: list):
+        """
+        Records the latencies (in seconds) of the requests served by one batch.
+        """
+        with self.lock:
+            self.latencies.extend(latencies)
+            self.requests += len(latencies)
+            self.batches += 1
+
+    def summary(self) -> dict:
+        """
+        Returns p50/p99 latency in milliseconds, throughput in requests per second and the mean batch size.
+        """
+        with self.lock:
+            latencies = np.array(self.latencies) * 1000
+            elapsed = time.perf_counter() - self.started_at
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+                "p50_latency_ms": float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+                "p99_latency_ms": float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+                "throughput_rps": self.requests / elapsed if elapsed > 0 else 0.0
+            }
+
+
+class DynamicBatcher:
+    """
+    This class is responsible for batching concurrent requests for a single model.
+    `submit` is thread-safe and returns a Future resolved with the prediction for that input.
+    """
+    def __init__(self, predict_fn: Callable, max_batch_size: int, max_wait_ms: float):
+        """
+        Initializes the DynamicBatcher class and starts the worker thread.
+        Args:
+            predict_fn (Callable): Function mapping a stacked batch of inputs to a batch of outputs.
+            max_batch_size (int): Maximum number of requests per batch.
+            max_wait_ms (float): Maximum time to wait for a batch to fill after its first request.
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.closed = False
+        self.lock = threading.Lock()
+        self.stats = LatencyStats()
+        self.worker = threading.Thread(target=self._run, name="dynamic-batcher", daemon=True)
+        self.worker.start()
+
+    def submit(self, item: np.ndarray) -> Future:
+        """
+        Queues a single input for prediction.
+        Args:
+            item (np.ndarray): One preprocessed input, without the batch dimension.
+        Returns:
+            Future: Resolved with the model output for this input.
+        Raises:
+            RuntimeError: If the batcher is closed.
+        """
+        future = Future()
+        # Checked and queued under the lock, so no request is queued behind the close marker
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("DynamicBatcher is closed")
+            self.queue.put((item, future, time.perf_counter()))
+        return future
+
+    def predict(self, item: np.ndarray, timeout: float = None) -> np.ndarray:
+        """
+        Queues a single input and blocks until its prediction is ready.
+        """
+        return self.submit(item).result(timeout=timeout)
+
+    def close(self):
+        """
+        Stops the worker thread once the requests already queued are served; later requests are rejected.
+        """
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.queue.put(_CLOSE)
+
+    def _collect(self) -> list:
+        """
+        Blocks for the first request, then gathers more until the batch is full or the wait time is over.
+        The close marker ends the batch and is returned as its last element.
+        """
+        batch = [self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size and batch[-1] is not _CLOSE:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """
+        Runs the worker loop, then fails the requests it left unserved, so that no future is left pending.
+        """
+        try:
+            self._serve()
+        finally:
+            with self.lock:
+                self.closed = True
+            while True:
+                try:
+                    entry = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is not _CLOSE:
+                    entry[1].set_exception(RuntimeError("DynamicBatcher is closed"))
+
+    def _serve(self):
+        """
+        Worker loop: collects a batch, runs the model once and resolves every request's future.
+        """
+        while True:
+            batch = self._collect()
+            closing = batch[-1] is _CLOSE
+            if closing:
+                batch.pop()
+                if not batch:
+                    return
+            items, futures, submitted = zip(*batch)
+            try:
+                outputs = self.predict_fn(np.stack(items))
+            except Exception as e:
+                logger.exception(f"Batch prediction failed: {e}")
+                for future in futures:
+                    future.set_exception(e)
+                if closing:
+                    return
+                continue
+
+            done = time.perf_counter()
+            for future, output in zip(futures, outputs):
+                future.set_result(output)
+            self.stats.record([done - start for start in submitted])
+            if closing:
+                return
@@ -0,0 +1,136 @@
+"""
+This module contains the training instrumentation used by the Trainer.
+`ThroughputLogger` writes per-step timings, images/sec, host memory and epoch durations to a JSON Lines log, which
+tells whether the input pipeline or the model is the bottleneck. Every epoch reports its stall fraction, the share of
+training time spent in steps slower than the median step, which is mostly time spent waiting for input. With PROFILE,
+`InputTimer` wraps the training dataset to measure exactly how long each step waits for its batch; the wrapper runs
+the input through a Python generator, so it is too expensive to leave on.
+"""
+
+import os
+import time
+import resource
+import statistics
+import tensorflow as tf
+from tensorflow import keras
+from Chest_Cancer_Classification.utils.common import JSONLHandler
+
+
+def _rss_mb() -> float:
+    """
+    Returns the resident set size of the process in MiB (the peak RSS where /proc is not available).
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+class InputTimer:
+    """
+    Measures the time the training loop spends waiting for input batches (used when profiling only).
+    """
+    def __init__(self):
+        self.wait_s = 0.0
+
+    def wrap(self, dataset: tf.data.Dataset) -> tf.data.Dataset:
+        """
+        Wraps a dataset so that every batch is pulled through a timed iterator.
+        The wrapper has no prefetch of its own, so the time spent in `next` is time the training step waits.
+        Args:
+            dataset (tf.data.Dataset): The (prefetched) training dataset.
+        Returns:
+            tf.data.Dataset: A dataset yielding the same batches.
+        """
+        def _generator():
+            iterator = iter(dataset)
+            while True:
+                start = time.perf_counter()
+                try:
+                    batch = next(iterator)
+                except StopIteration:
+                    return
+                self.wait_s += time.perf_counter() - start
+                yield batch
+
+        return tf.data.Dataset.from_generator(_generator, output_signature=dataset.element_spec)
+
+    def pop(self) -> float:
+        """
+        Returns the waiting time accumulated since the last call and resets it.
+        """
+        wait_s, self.wait_s = self.wait_s, 0.0
+        return wait_s
+
+
+class ThroughputLogger(keras.callbacks.Callback):
+    """
+    Keras callback logging per-step and per-epoch throughput to a JSON Lines file.
+    Step records are buffered and written at the end of every epoch.
+    """
+    def __init__(self, log_path: str, batch_size: int, input_timer: InputTimer = None, phase: str = "train"):
+        """
+        Args:
+            log_path (str): Path of the JSON Lines log.
+            batch_size (int): Number of images per step, used for images/sec.
+            input_timer (InputTimer): Timer wrapped around the training dataset when profiling; without it
+                only the stall fraction estimates input wait.
+            phase (str): Label of the fit call in the log (e.g. "full", "head", "progressive-2").
+        """
+        super().__init__()
+        self.writer = JSONLHandler(path=str(log_path))
+        self.batch_size = batch_size
+        self.input_timer = input_timer
+        self.phase = phase
+        self.records = []
+        self.epoch = 0
+        self.epoch_start = None
+        self.step_start = None
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch = epoch
+        self.epoch_start = time.perf_counter()
+        if self.input_timer is not None:
+            self.input_timer.pop()
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self.step_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        step_s = time.perf_counter() - self.step_start
+        input_wait_s = self.input_timer.pop() if self.input_timer is not None else None
+        self.records.append({
+            "event": "step",
+            "phase": self.phase,
+            "epoch": self.epoch,
+            "step": batch,
+            "step_s": round(step_s, 6),
+            "input_wait_s": None if input_wait_s is None else round(input_wait_s, 6),
+            "compute_s": None if input_wait_s is None else round(step_s - input_wait_s, 6),
+            "images_per_s": round(self.batch_size / step_s, 2) if step_s > 0 else None
+        })
+
+    def on_epoch_end(self, epoch, logs=None):
+        duration_s = time.perf_counter() - self.epoch_start
+        steps = [record for record in self.records if record["epoch"] == epoch]
+        step_times = [record["step_s"] for record in steps]
+        train_s = sum(step_times)
+        waits = [record["input_wait_s"] for record in steps if record["input_wait_s"] is not None]
+        # Steps slower than the median are assumed to wait for their batch; this needs no timed input wrapper
+        median_s = statistics.median(step_times) if step_times else 0.0
+        stall_s = sum(max(step_s - median_s, 0.0) for step_s in step_times)
+        self.records.append({
+            "event": "epoch",
+            "phase": self.phase,
+            "epoch": epoch,
+            "duration_s": round(duration_s, 3),
+            "steps": len(steps),
+            "images_per_s": round(len(steps) * self.batch_size / train_s, 2) if train_s > 0 else None,
+            "stall_fraction": round(stall_s / train_s, 4) if train_s > 0 else None,
+            "input_wait_fraction": round(sum(waits) / train_s, 4) if waits and train_s > 0 else None,
+            "rss_mb": round(_rss_mb(), 1),
+            **{key: float(value) for key, value in (logs or {}).items()}
+        })
+        self.writer.append(self.records)
+        self.records = []
@@ -0,0 +1,167 @@
+"""
+This module contains the TrainingCheckpointer class, which periodically checkpoints training so that an interrupted run
+resumes where it stopped instead of restarting from the prepared model.
+Checkpoints hold the model weights, the optimizer state, the training phase and the number of completed epochs of that
+phase, and are written with `tf.train.CheckpointManager`, which only records a checkpoint once all its files are
+written and keeps the last CHECKPOINT_KEEP of them. Checkpoints are taken at epoch boundaries, so the position of the
+input iterator does not need to be saved: a resumed run starts the next epoch with a fresh shuffle.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+import tensorflow as tf
+from tensorflow import keras
+from Chest_Cancer_Classification import logger
+from Chest_Cancer_Classification.components import distributed
+
+_PHASE_KEY = "phase/.ATTRIBUTES/VARIABLE_VALUE"
+_EPOCH_KEY = "epoch/.ATTRIBUTES/VARIABLE_VALUE"
+
+
+class TrainingCheckpointer:
+    """
+    This class is responsible for saving, restoring and cleaning up the checkpoints of one training run.
+    A run is identified by a fingerprint of its configuration; checkpoints of a run with another
+    fingerprint are discarded instead of being resumed.
+    """
+    def __init__(self, directory: Path, fingerprint: dict, max_to_keep: int, every_epochs: int,
+                 strategy: tf.distribute.Strategy = None):
+        """
+        Initializes the TrainingCheckpointer class.
+        Args:
+            directory (Path): Directory of the checkpoints.
+            fingerprint (dict): Values identifying the training run (configuration, base model).
+            max_to_keep (int): Number of most recent checkpoints kept on disk.
+            every_epochs (int): Checkpoint every that many epochs (the last epoch of a phase is always checkpointed).
+            strategy (tf.distribute.Strategy): Strategy of the training, defaults to the current one.
+        """
+        self.directory = Path(directory)
+        self.strategy = strategy or tf.distribute.get_strategy()
+        self.fingerprint = hashlib.sha256(json.dumps(fingerprint, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        self.max_to_keep = max_to_keep
+        self.every_epochs = every_epochs
+        self.phase = tf.Variable(0, dtype=tf.int64, trainable=False)
+        self.epoch = tf.Variable(0, dtype=tf.int64, trainable=False)
+        if distributed.is_chief():
+            self._discard_stale()
+
+    def _is_current(self) -> bool:
+        """
+        Returns whether the checkpoint directory belongs to a run with the current fingerprint.
+        """
+        run_path = self.directory / "run.json"
+        if not run_path.exists():
+            return False
+        with open(run_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("fingerprint") == self.fingerprint
+
+    def _discard_stale(self):
+        """
+        Removes checkpoints written by a run with a different fingerprint and records the current one.
+        """
+        run_path = self.directory / "run.json"
+        if self._is_current():
+            return
+        if self.directory.exists():
+            logger.info(f"Discarding checkpoints of a previous configuration in {self.directory}")
+            shutil.rmtree(self.directory)
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = run_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint}, f)
+        os.replace(tmp_path, run_path)
+
+    def latest(self) -> tuple:
+        """
+        Returns the (phase, completed epochs) of the latest checkpoint, or None if there is none.
+        Under MultiWorkerMirroredStrategy the chief decides for every worker, once it has discarded stale
+        checkpoints and finished writing, so that all workers resume at the same epoch.
+        """
+        latest = [-1, -1]
+        if distributed.is_chief():
+            path = tf.train.latest_checkpoint(str(self.directory)) if self._is_current() else None
+            if path is not None:
+                latest = [int(tf.train.load_variable(path, _PHASE_KEY)), int(tf.train.load_variable(path, _EPOCH_KEY))]
+        phase, epoch = distributed.broadcast_from_chief(self.strategy, latest)
+        return None if phase < 0 else (phase, epoch)
+
+    def _checkpoint(self, model: keras.Model, optimizer) -> tf.train.Checkpoint:
+        """
+        Builds the checkpoint object of a model and its optimizer.
+        """
+        return tf.train.Checkpoint(model=model, optimizer=optimizer, phase=self.phase, epoch=self.epoch)
+
+    def restore(self, model: keras.Model, optimizer, phase: int) -> int:
+        """
+        Restores the latest checkpoint if it was taken during the given phase.
+        Args:
+            model (keras.Model): The model being trained.
+            optimizer: Its compiled optimizer, whose slots are restored when they are created.
+            phase (int): Index of the phase about to run.
+        Returns:
+            int: Number of epochs of the phase already completed (0 when starting the phase).
+        """
+        latest = self.latest()
+        if latest is None or latest[0] != phase:
+            return 0
+        path = tf.train.latest_checkpoint(str(self.directory))
+        self._checkpoint(model, optimizer).restore(path).expect_partial()
+        logger.info(f"Resumed phase {phase} after {latest[1]} epochs from {path}")
+        return latest[1]
+
+    def callback(self, model: keras.Model, optimizer, phase: int, initial_epoch: int = 0) -> keras.callbacks.Callback:
+        """
+        Returns the Keras callback checkpointing a fit call.
+        Args:
+            model (keras.Model): The model being trained.
+            optimizer: Its compiled optimizer.
+            phase (int): Index of the phase.
+            initial_epoch (int): Keras epoch number at which the phase started.
+        """
+        return _CheckpointCallback(self, self._checkpoint(model, optimizer), phase, initial_epoch)
+
+    def clear(self):
+        """
+        Removes every checkpoint once the run is complete, so that the next run starts from scratch.
+        """
+        if distributed.is_chief() and self.directory.exists():
+            shutil.rmtree(self.directory)
+
+
+class _CheckpointCallback(keras.callbacks.Callback):
+    """
+    Keras callback saving a checkpoint every `every_epochs` epochs and at the end of the phase.
+    Under MultiWorkerMirroredStrategy every worker saves, but only the chief keeps its checkpoint.
+    """
+    def __init__(self, checkpointer: TrainingCheckpointer, checkpoint: tf.train.Checkpoint, phase: int, initial_epoch: int):
+        super().__init__()
+        self.checkpointer = checkpointer
+        self.phase = phase
+        self.initial_epoch = initial_epoch
+        if distributed.is_chief():
+            self.directory = None
+            self.manager = tf.train.CheckpointManager(
+                checkpoint, str(checkpointer.directory), max_to_keep=checkpointer.max_to_keep
+            )
+        else:
+            self.directory = tempfile.mkdtemp()
+            self.manager = tf.train.CheckpointManager(checkpoint, self.directory, max_to_keep=1)
+
+    def on_epoch_end(self, epoch, logs=None):
+        completed = epoch + 1 - self.initial_epoch
+        if completed % self.checkpointer.every_epochs and epoch + 1 != self.params["epochs"]:
+            return
+        self.checkpointer.phase.assign(self.phase)
+        self.checkpointer.epoch.assign(completed)
+        path = self.manager.save()
+        if self.directory is None:
+            logger.info(f"Saved checkpoint {path} (phase {self.phase}, epoch {completed})")
+
+    def on_train_end(self, logs=None):
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,88 @@
+"""
+This module contains the CompiledPredictor class, the inference wrapper used by every prediction path.
+`model.predict` builds a tf.data pipeline and callbacks on every call, and `predict_on_batch` may retrace its
+function when the batch size changes; for single images this overhead dominates the latency. The predictor instead
+calls the model directly inside one `tf.function` whose input signature is fixed to `[None, *IMAGE_SIZE]`, so it is
+traced once, and pads every batch to the next of a few bucket sizes (PREDICT_BUCKETS), so that a JIT compiled
+function only ever sees those batch shapes.
+"""
+
+import bisect
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from Chest_Cancer_Classification.entity.config_entity import PredictionConfig
+
+
+class CompiledPredictor:
+    """
+    This class is responsible for running a Keras model on batches of preprocessed images without retracing.
+    """
+    def __init__(self, model: keras.Model, image_size: list, buckets: list, jit_compile: bool = False):
+        """
+        Initializes the CompiledPredictor class.
+        Args:
+            model (keras.Model): The trained model.
+            image_size (list): Input size of the model, [height, width, channels].
+            buckets (list): Batch sizes batches are padded to; larger batches are split by the largest bucket.
+            jit_compile (bool): Whether to compile the function with XLA, once per bucket.
+        """
+        self.model = model
+        self.image_size = list(image_size)
+        self.buckets = sorted(set(buckets))
+        self.jit_compile = jit_compile
+        self._predict = tf.function(
+            self._forward,
+            input_signature=[tf.TensorSpec([None, *self.image_size], tf.float32)],
+            jit_compile=jit_compile
+        )
+
+    @classmethod
+    def from_config(cls, model: keras.Model, config: PredictionConfig) -> "CompiledPredictor":
+        """
+        Builds the predictor of a model from the IMAGE_SIZE, PREDICT_BUCKETS and JIT_COMPILE parameters.
+        """
+        return cls(model, config.params_image_size, config.params_predict_buckets, config.params_jit_compile)
+
+    def _forward(self, images: tf.Tensor) -> tf.Tensor:
+        # Mixed precision models may return float16 probabilities
+        return tf.cast(self.model(images, training=False), tf.float32)
+
+    def bucket(self, batch_size: int) -> int:
+        """
+        Returns the bucket a batch of `batch_size` images is padded to.
+        """
+        index = bisect.bisect_left(self.buckets, batch_size)
+        return self.buckets[min(index, len(self.buckets) - 1)]
+
+    def predict(self, images: np.ndarray) -> np.ndarray:
+        """
+        Predicts a batch of preprocessed images.
+        Args:
+            images (np.ndarray): Batch of preprocessed images of shape [batch_size, *IMAGE_SIZE].
+        Returns:
+            np.ndarray: Float32 probabilities of shape [batch_size, classes].
+        """
+        images = np.asarray(images, dtype=np.float32)
+        outputs = []
+        for start in range(0, len(images), self.buckets[-1]):
+            chunk = images[start:start + self.buckets[-1]]
+            padding = self.bucket(len(chunk)) - len(chunk)
+            if padding:
+                chunk = np.concatenate([chunk, np.zeros((padding, *chunk.shape[1:]), dtype=np.float32)])
+            outputs.append(self._predict(tf.constant(chunk)).numpy()[:len(chunk) - padding])
+        return np.concatenate(outputs)
+
+    def warmup(self):
+        """
+        Traces the function before the first request, and with XLA compiles it for every bucket.
+        """
+        for batch_size in (self.buckets if self.jit_compile else self.buckets[:1]):
+            self._predict(tf.zeros([batch_size, *self.image_size], dtype=tf.float32))
+
+    @property
+    def tracing_count(self) -> int:
+        """
+        Returns the number of times the function was traced (1 after warmup).
+        """
+        return self._predict.experimental_get_tracing_count()
@@ -1,17 +1,23 @@
 """
 This module contains the DataIngestion class, which is responsible for downloading and extracting the dataset.
 It handles the downloading of the dataset from a specified URL and extracts it to a specified directory.
-It uses gdown to download the file from Google Drive and zipfile to extract the contents.
+It uses gdown to download the file from Google Drive (or plain HTTP range requests for other URLs)
+and zipfile to extract the contents. Downloads are skipped when the local file matches the recorded SHA-256.
 It is designed to work with a specific dataset for chest cancer classification.
 """
 
 
 import os
+import json
+import zlib
 import zipfile
-import gdown
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from Chest_Cancer_Classification.constants import *
 from Chest_Cancer_Classification import logger
 from Chest_Cancer_Classification.entity.config_entity import DataIngestionConfig
+from Chest_Cancer_Classification.components.image_cache import ImageCache
+from Chest_Cancer_Classification.utils.download import sha256sum, download_in_chunks
 
 class DataIngestion:
     """
@@ -20,35 +26,177 @@ class DataIngestion:
     """
     def __init__(self, config: DataIngestionConfig):
         self.config = config
+        self._local = threading.local()
+        self._zip_refs = []
 
     def download_file(self) -> str:
         """
         This method downloads the dataset from the specified URL.
         It creates the directory if it does not exist.
-        It uses gdown to download the file from Google Drive.
+        The download is skipped when the local file matches the configured SHA-256,
+        and partial downloads are resumed instead of restarted.
+        Google Drive links are fetched with gdown, other URLs with HTTP range requests,
+        optionally in parallel chunks.
         """
         try:
             dataset_url = self.config.source_URL
             zip_download_dir = self.config.local_data_file
             os.makedirs(self.config.root_dir, exist_ok=True)
+
+            if self._is_up_to_date():
+                logger.info(f"File {zip_download_dir} matches the recorded SHA-256, skipping download")
+                return str(zip_download_dir)
+
             logger.info(f"Downloading data from {dataset_url} into file {zip_download_dir}")
+            if "drive.google.com" in dataset_url:
+                import gdown  # Imported lazily: only needed for Google Drive links
 
-            file_id = dataset_url.split("/")[-2]
-            prefix = 'https://drive.google.com/uc?/export=download&id='
-            gdown.download(prefix + file_id, str(zip_download_dir))
+                file_id = dataset_url.split("/")[-2]
+                prefix = 'https://drive.google.com/uc?/export=download&id='
+                gdown.download(prefix + file_id, str(zip_download_dir), resume=True)
+            else:
+                download_in_chunks(dataset_url, str(zip_download_dir), num_chunks=self.config.download_chunks)
             logger.info(f"Downloaded data from {dataset_url} into file {zip_download_dir}")
 
+            self._verify_checksum()
+            return str(zip_download_dir)
+
         except Exception as e:
             logger.error(f"Error occurred while downloading the file: {e}")
             raise e
-        
+
+    def _is_up_to_date(self) -> bool:
+        """
+        Checks whether the local file already matches the configured SHA-256.
+        """
+        return (
+            bool(self.config.sha256)
+            and os.path.exists(self.config.local_data_file)
+            and sha256sum(self.config.local_data_file) == self.config.sha256
+        )
+
+    def _verify_checksum(self):
+        """
+        Verifies the downloaded file against the configured SHA-256.
+        A mismatching file is removed so that the next run downloads it again.
+        """
+        checksum = sha256sum(self.config.local_data_file)
+        if not self.config.sha256:
+            logger.info(f"SHA-256 of {self.config.local_data_file} is {checksum}; "
+                        f"record it as data_ingestion.sha256 in config.yaml to skip future downloads")
+            return
+        if checksum != self.config.sha256:
+            os.remove(self.config.local_data_file)
+            raise ValueError(
+                f"SHA-256 mismatch for {self.config.local_data_file}: expected {self.config.sha256}, got {checksum}"
+            )
+
     def extract_zip_file(self):
         """
         This method extracts the downloaded zip file into the specified directory.
         It creates the directory if it does not exist.
+        Members already present with a matching size and CRC-32 are skipped, the others are
+        extracted concurrently. With `stream_to_image_cache`, images are decoded straight from
+        the archive into the preprocessed image store and never written to disk.
+        A manifest records every member and how it was materialized.
         """
         unzip_path = self.config.unzip_dir
         os.makedirs(unzip_path, exist_ok=True)
         logger.info(f"Extracting file {self.config.local_data_file} into directory {unzip_path}")
+
+        manifest = self._load_extract_manifest()
         with zipfile.ZipFile(self.config.local_data_file, 'r') as zip_ref:
-            zip_ref.extractall(unzip_path)
+            members = [info for info in zip_ref.infolist() if not info.is_dir()]
+
+        streamed = []
+        if self.config.stream_to_image_cache:
+            streamed = [info for info in members if info.filename.lower().endswith(WHITE_LIST_FORMATS)]
+        streamed_names = {info.filename for info in streamed}
+        extracted = [info for info in members if info.filename not in streamed_names]
+
+        pending = [info for info in extracted if not self._is_extracted(info, manifest)]
+        logger.info(f"{len(extracted) - len(pending)} members up to date, extracting {len(pending)}")
+        try:
+            with ThreadPoolExecutor(max_workers=self.config.extract_workers) as executor:
+                list(executor.map(self._extract_member, pending))
+        finally:
+            for zip_ref in self._zip_refs:
+                zip_ref.close()
+            self._zip_refs = []
+            self._local = threading.local()
+
+        entries = {
+            info.filename: {
+                "size": info.file_size,
+                "crc": info.CRC,
+                "mode": "extracted",
+                "mtime_ns": os.stat(os.path.join(unzip_path, info.filename)).st_mtime_ns
+            }
+            for info in extracted
+        }
+        if streamed:
+            self._stream_to_image_cache(streamed)
+            entries.update({
+                info.filename: {"size": info.file_size, "crc": info.CRC, "mode": "streamed"}
+                for info in streamed
+            })
+
+        with open(self.config.extract_manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({"root": str(unzip_path), "members": entries}, f)
+        logger.info(f"Extraction manifest saved to {self.config.extract_manifest_path}")
+
+    def _load_extract_manifest(self) -> dict:
+        """
+        Loads the members recorded by the previous extraction, or an empty dict.
+        """
+        if not os.path.exists(self.config.extract_manifest_path):
+            return {}
+        with open(self.config.extract_manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("members", {})
+
+    def _is_extracted(self, info: zipfile.ZipInfo, manifest: dict) -> bool:
+        """
+        Checks whether a member is already on disk with the same size and CRC-32.
+        The CRC of the file is only recomputed when the manifest cannot vouch for it.
+        """
+        target = os.path.join(self.config.unzip_dir, info.filename)
+        if not os.path.isfile(target) or os.path.getsize(target) != info.file_size:
+            return False
+
+        entry = manifest.get(info.filename, {})
+        if (entry.get("mode") == "extracted" and entry.get("crc") == info.CRC
+                and entry.get("mtime_ns") == os.stat(target).st_mtime_ns):
+            return True
+
+        crc = 0
+        with open(target, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                crc = zlib.crc32(block, crc)
+        return crc == info.CRC
+
+    def _extract_member(self, info: zipfile.ZipInfo):
+        """
+        Extracts a single member using a zip handle owned by the current thread.
+        """
+        if not hasattr(self._local, "zip_ref"):
+            self._local.zip_ref = zipfile.ZipFile(self.config.local_data_file, 'r')
+            self._zip_refs.append(self._local.zip_ref)
+        self._local.zip_ref.extract(info, self.config.unzip_dir)
+
+    def _stream_to_image_cache(self, members: list):
+        """
+        Decodes image members straight from the archive into the preprocessed image store.
+        """
+        paths = {os.path.join(self.config.unzip_dir, info.filename): info.filename for info in members}
+        image_cache = ImageCache(
+            root_dir=self.config.image_cache_dir,
+            image_size=self.config.params_image_size,
+            source_keys={
+                path: {"path": path, "crc": info.CRC, "size": info.file_size}
+                for path, info in zip(paths, members)
+            }
+        )
+        if image_cache.is_valid(list(paths)):
+            logger.info(f"Image cache {image_cache.cache_dir} is up to date")
+            return
+        image_cache.build_from_zip(self.config.local_data_file, paths)
@@ -0,0 +1,218 @@
+"""
+This module contains the DataPipeline class, which builds the training and validation input pipelines with tf.data.
+It reproduces the file listing, class indexing and validation split of Keras' `flow_from_directory`,
+but decodes, resizes and augments images in parallel inside the TensorFlow runtime and prefetches batches
+so that the input pipeline keeps up with `model.fit`.
+"""
+
+import os
+import json
+import numpy as np
+import tensorflow as tf
+from Chest_Cancer_Classification.constants import WHITE_LIST_FORMATS
+from Chest_Cancer_Classification.entity.config_entity import TrainingConfig
+from Chest_Cancer_Classification.components.image_cache import ImageCache
+from Chest_Cancer_Classification.components.backbones import preprocess_input
+from Chest_Cancer_Classification.components.augmentation import RandomAffine
+from Chest_Cancer_Classification.components import distributed
+
+VALIDATION_SPLIT = 0.20
+# Every worker must shuffle the same way: each keeps its slice of the same global batches
+SHUFFLE_SEED = 42
+
+
+class DataPipeline:
+    """
+    This class is responsible for building the tf.data input pipelines for training and validation.
+    It lists the images class by class, splits them into training and validation subsets and
+    returns batched, prefetched datasets of (image, one-hot label) pairs.
+    """
+    def __init__(self, config: TrainingConfig, batch_size: int = None):
+        """
+        Initializes the DataPipeline class with the given configuration.
+        Args:
+            config (TrainingConfig): Configuration object containing training parameters.
+            batch_size (int): Global batch size, defaults to BATCH_SIZE (multi-worker training uses BATCH_SIZE per worker).
+        """
+        self.config = config
+        self.batch_size = batch_size or config.params_batch_size
+        self.class_files, self.source_keys, self.zip_members = self._source_files()
+        self.class_names = sorted(self.class_files)
+        self.class_indices = dict(zip(self.class_names, range(len(self.class_names))))
+        num_parallel_calls = config.params_num_parallel_calls
+        self.num_parallel_calls = tf.data.AUTOTUNE if num_parallel_calls in (None, -1) else num_parallel_calls
+        # Out-of-order parallel maps would also give every worker different global batches
+        self.deterministic = config.params_deterministic or distributed.num_workers() > 1
+        self.image_cache = None
+        self.cached_images = None
+        self.cached_rows = None
+
+    def _source_files(self) -> tuple:
+        """
+        Lists the sorted image files of every class.
+        Images are read from the training data directory, or, when ingestion streams them into the image cache
+        without extracting them (`stream_to_image_cache`), from the extraction manifest.
+        Returns:
+            tuple: A dict mapping class names to file paths, and the identity and archive member name
+                of the streamed images keyed by path.
+        """
+        if not self.config.stream_to_image_cache:
+            class_files = {
+                class_name: sorted(
+                    os.path.join(root, fname)
+                    for root, _, fnames in os.walk(os.path.join(self.config.training_data, class_name))
+                    for fname in fnames
+                    if fname.lower().endswith(WHITE_LIST_FORMATS)
+                )
+                for class_name in os.listdir(self.config.training_data)
+                if os.path.isdir(os.path.join(self.config.training_data, class_name))
+            }
+            return class_files, {}, {}
+
+        with open(self.config.extract_manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        class_files, source_keys, zip_members = {}, {}, {}
+        for name, entry in manifest["members"].items():
+            path = os.path.join(manifest["root"], name)
+            parts = os.path.relpath(path, self.config.training_data).split(os.sep)
+            if entry["mode"] != "streamed" or parts[0] == os.pardir or len(parts) < 2:
+                continue
+            class_files.setdefault(parts[0], []).append(path)
+            source_keys[path] = {"path": path, "crc": entry["crc"], "size": entry["size"]}
+            zip_members[path] = name
+        class_files = {class_name: sorted(files) for class_name, files in class_files.items()}
+        return class_files, source_keys, zip_members
+
+    def list_files(self, subset: str) -> tuple:
+        """
+        Lists the image files and their class indices for the given subset.
+        Files are sorted per class and the first 20% of each class go to the validation subset,
+        exactly like `flow_from_directory` with `validation_split=0.20`.
+        Args:
+            subset (str): Either "training" or "validation".
+        Returns:
+            tuple: A list of file paths and a list of class indices.
+        """
+        if subset == "validation":
+            split = (0.0, VALIDATION_SPLIT)
+        elif subset == "training":
+            split = (VALIDATION_SPLIT, 1.0)
+        else:
+            raise ValueError(f"Invalid subset {subset}. Use 'training' or 'validation'.")
+
+        filepaths, labels = [], []
+        for class_name in self.class_names:
+            files = self.class_files[class_name]
+            start, stop = int(split[0] * len(files)), int(split[1] * len(files))
+            filepaths.extend(files[start:stop])
+            labels.extend([self.class_indices[class_name]] * (stop - start))
+        return filepaths, labels
+
+    def prepare_cache(self):
+        """
+        Builds (or reuses) the preprocessed image cache for both subsets and opens it read-only.
+        Once prepared, `build` reads decoded pixels from the cache instead of the JPEG files.
+        Streamed images are decoded again from the zip archive when the cache has to be rebuilt.
+        """
+        filepaths = self.list_files("training")[0] + self.list_files("validation")[0]
+        self.image_cache = ImageCache(
+            root_dir=self.config.image_cache_dir,
+            image_size=self.config.params_image_size,
+            source_keys=self.source_keys
+        )
+        if self.zip_members:
+            self.image_cache.prepare(filepaths, zip_path=self.config.local_data_file, members=self.zip_members)
+        else:
+            self.image_cache.prepare(filepaths)
+        self.cached_images, self.cached_rows = self.image_cache.load()
+
+    def _augmentation_layers(self) -> RandomAffine:
+        """
+        Builds the random augmentation applied to batches of training images.
+        It samples the transforms of the ImageDataGenerator path from the same AUGMENTATION_CONFIG.
+        """
+        return RandomAffine.from_params(self.config.params_augmentation_config)
+
+    def _load_image(self, path: tf.Tensor, label: tf.Tensor) -> tuple:
+        """
+        Reads, decodes and resizes a single image and one-hot encodes its label.
+        """
+        image = tf.io.read_file(path)
+        image = tf.io.decode_image(image, channels=3, expand_animations=False)
+        image = tf.image.resize(image, self.config.params_image_size[:-1], method="bilinear")
+        image.set_shape(self.config.params_image_size)
+        return image, tf.one_hot(label, depth=len(self.class_names))
+
+    def _load_cached_batch(self, rows: tf.Tensor, labels: tf.Tensor) -> tuple:
+        """
+        Gathers a batch of decoded images from the memory-mapped cache and one-hot encodes the labels.
+        """
+        images = tf.numpy_function(
+            lambda index: np.asarray(self.cached_images[index]),
+            [rows],
+            tf.uint8
+        )
+        images.set_shape([None, *self.config.params_image_size])
+        return tf.cast(images, tf.float32), tf.one_hot(labels, depth=len(self.class_names))
+
+    def build(self, subset: str, shuffle: bool, augment: bool = False, repeat: bool = False) -> tf.data.Dataset:
+        """
+        Builds the tf.data pipeline for the given subset.
+        Args:
+            subset (str): Either "training" or "validation".
+            shuffle (bool): Whether to shuffle the files every epoch.
+            augment (bool): Whether to apply random augmentation.
+            repeat (bool): Whether to repeat the dataset indefinitely (used with `steps_per_epoch`).
+        Returns:
+            tf.data.Dataset: Batched and prefetched dataset of (image, label) pairs.
+        """
+        # Streamed images only exist in the archive and the cache
+        if self.cached_images is None and self.config.stream_to_image_cache:
+            self.prepare_cache()
+        filepaths, labels = self.list_files(subset)
+        if self.cached_images is not None:
+            filepaths = [self.cached_rows[path] for path in filepaths]
+
+        dataset = tf.data.Dataset.from_tensor_slices((filepaths, labels))
+        if shuffle:
+            dataset = dataset.shuffle(buffer_size=len(filepaths), seed=SHUFFLE_SEED, reshuffle_each_iteration=True)
+        if repeat:
+            dataset = dataset.repeat()
+
+        if self.cached_images is not None:
+            # Decoded pixels come straight from the cache; only augmentation runs per epoch
+            dataset = dataset.batch(self.batch_size)
+            dataset = dataset.map(
+                self._load_cached_batch,
+                num_parallel_calls=self.num_parallel_calls,
+                deterministic=self.deterministic
+            )
+        else:
+            dataset = dataset.map(
+                self._load_image,
+                num_parallel_calls=self.num_parallel_calls,
+                deterministic=self.deterministic
+            )
+            dataset = dataset.batch(self.batch_size)
+
+        # Augmentation and preprocessing run on whole batches
+        if augment:
+            augmentation = self._augmentation_layers()
+            dataset = dataset.map(
+                lambda image, label: (augmentation(image, training=True), label),
+                num_parallel_calls=self.num_parallel_calls,
+                deterministic=self.deterministic
+            )
+
+        # Apply the preprocessing of the backbone (e.g. channel mean subtraction for VGG16)
+        dataset = dataset.map(
+            lambda image, label: (preprocess_input(tf.cast(image, tf.float32), self.config.params_backbone), label),
+            num_parallel_calls=self.num_parallel_calls,
+            deterministic=self.deterministic
+        )
+
+        # Under MultiWorkerMirroredStrategy every worker keeps its share of each global batch
+        options = tf.data.Options()
+        options.experimental_distribute.auto_shard_policy = tf.data.experimental.AutoShardPolicy.DATA
+        dataset = dataset.with_options(options)
+        return dataset.prefetch(tf.data.AUTOTUNE)
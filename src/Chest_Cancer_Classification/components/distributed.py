@@ -0,0 +1,124 @@
+"""
+This module contains helpers for multi-worker data-parallel training with `tf.distribute.MultiWorkerMirroredStrategy`.
+Workers are configured through the TF_CONFIG environment variable; `launch_local_workers` simulates a cluster
+by starting one training process per worker on localhost.
+"""
+
+import os
+import sys
+import json
+import socket
+import time
+import subprocess
+import tensorflow as tf
+from Chest_Cancer_Classification import logger
+from Chest_Cancer_Classification.constants import PROJECT_ROOT
+from Chest_Cancer_Classification.config.configuration import ENV_OVERRIDE_PREFIX
+
+
+def _tf_config() -> dict:
+    """
+    Returns the parsed TF_CONFIG environment variable, or an empty dict.
+    """
+    return json.loads(os.environ.get("TF_CONFIG", "{}"))
+
+
+def num_workers() -> int:
+    """
+    Returns the number of workers in the TF_CONFIG cluster (1 when not running distributed).
+    """
+    return len(_tf_config().get("cluster", {}).get("worker", [])) or 1
+
+
+def is_chief() -> bool:
+    """
+    Returns whether this process is the chief (worker 0), which is the only one writing artifacts.
+    """
+    task = _tf_config().get("task", {})
+    return task.get("type", "worker") in ("worker", "chief") and task.get("index", 0) == 0
+
+
+def get_strategy() -> tf.distribute.Strategy:
+    """
+    Returns a MultiWorkerMirroredStrategy when TF_CONFIG describes a cluster, otherwise the default strategy.
+    Must be called before any other TensorFlow operation of the process.
+    """
+    if num_workers() > 1:
+        return tf.distribute.MultiWorkerMirroredStrategy()
+    return tf.distribute.get_strategy()
+
+
+def broadcast_from_chief(strategy: tf.distribute.Strategy, values: list) -> list:
+    """
+    Returns the integer values of the chief on every worker. The collective also acts as a barrier:
+    no worker returns before the chief has called it, so files the chief wrote before are visible.
+    Args:
+        strategy (tf.distribute.Strategy): The strategy returned by `get_strategy`.
+        values (list): Integers; only those of the chief are used.
+    """
+    if num_workers() == 1:
+        return list(values)
+    contribution = tf.constant(values if is_chief() else [0] * len(values), dtype=tf.int64)
+
+    @tf.function
+    def all_reduce():
+        return strategy.run(
+            lambda: tf.distribute.get_replica_context().all_reduce(tf.distribute.ReduceOp.SUM, contribution)
+        )
+
+    return [int(value) for value in strategy.experimental_local_results(all_reduce())[0].numpy()]
+
+
+def _free_ports(count: int) -> list:
+    """
+    Reserves `count` free TCP ports on localhost.
+    """
+    sockets = [socket.socket() for _ in range(count)]
+    for sock in sockets:
+        sock.bind(("localhost", 0))
+    ports = [sock.getsockname()[1] for sock in sockets]
+    for sock in sockets:
+        sock.close()
+    return ports
+
+
+def launch_local_workers(workers: int, overrides: dict = None,
+                         module: str = "Chest_Cancer_Classification.pipeline.training_pipeline"):
+    """
+    Runs the training pipeline in `workers` local processes forming a MultiWorkerMirroredStrategy cluster.
+    If one worker fails, the others are terminated instead of waiting forever on collective operations.
+    Args:
+        workers (int): Number of worker processes.
+        overrides (dict): Configuration overrides of the parent process, forwarded as environment variables.
+        module (str): Module executed by every worker with `python -m`.
+    """
+    cluster = [f"localhost:{port}" for port in _free_ports(workers)]
+    logger.info(f"Launching {workers} local training workers: {cluster}")
+
+    override_env = {
+        ENV_OVERRIDE_PREFIX + key.replace(".", "__"): value if isinstance(value, str) else json.dumps(value)
+        for key, value in (overrides or {}).items()
+    }
+    python_path = os.pathsep.join(filter(None, [str(PROJECT_ROOT), str(PROJECT_ROOT / "src"), os.environ.get("PYTHONPATH")]))
+    processes = []
+    for index in range(workers):
+        env = {
+            **os.environ,
+            **override_env,
+            "PYTHONPATH": python_path,
+            "TF_CONFIG": json.dumps({"cluster": {"worker": cluster}, "task": {"type": "worker", "index": index}})
+        }
+        processes.append(subprocess.Popen([sys.executable, "-m", module], cwd=PROJECT_ROOT, env=env))
+
+    while any(process.poll() is None for process in processes):
+        if any(process.poll() for process in processes):
+            for process in processes:
+                if process.poll() is None:
+                    process.terminate()
+            break
+        time.sleep(1)
+
+    return_codes = [process.wait() for process in processes]
+    if any(return_codes):
+        raise RuntimeError(f"Training workers failed with exit codes {return_codes}")
+    logger.info("All training workers completed successfully.")
@@ -0,0 +1,117 @@
+"""
+This module contains the FeatureCache class, which stores the bottleneck activations of the frozen backbone.
+Since the VGG16 convolutional base is frozen, its output for a given image never changes during training.
+The backbone is run once over the dataset (optionally over several augmented passes), the activations are
+written to memory-mapped NumPy arrays, and only the classification head is trained on them.
+"""
+
+import os
+import json
+from pathlib import Path
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from Chest_Cancer_Classification import logger
+
+
+class FeatureCache:
+    """
+    This class is responsible for extracting, storing and loading bottleneck features.
+    Features are invalidated when the backbone file, the image size, the samples or the number of passes changes.
+    """
+    def __init__(self, root_dir: Path, fingerprint: dict):
+        """
+        Initializes the FeatureCache class.
+        Args:
+            root_dir (Path): Directory where the features are stored.
+            fingerprint (dict): Values identifying the backbone and input settings the features were computed with.
+        """
+        self.root_dir = Path(root_dir)
+        self.fingerprint = fingerprint
+
+    def _paths(self, subset: str) -> tuple:
+        """
+        Returns the features, labels and metadata paths for the given subset.
+        """
+        return (
+            self.root_dir / f"{subset}_features.npy",
+            self.root_dir / f"{subset}_labels.npy",
+            self.root_dir / f"{subset}_meta.json"
+        )
+
+    def is_valid(self, subset: str, passes: int) -> bool:
+        """
+        Checks whether features for the subset were computed with the current fingerprint.
+        """
+        features_path, labels_path, meta_path = self._paths(subset)
+        if not (features_path.exists() and labels_path.exists() and meta_path.exists()):
+            return False
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return meta == {**self.fingerprint, "passes": passes}
+
+    def extract(self, backbone: keras.Model, dataset: tf.data.Dataset, samples: int, subset: str, passes: int = 1):
+        """
+        Runs the backbone over the dataset and writes the activations to disk.
+        Args:
+            backbone (keras.Model): The frozen convolutional base.
+            dataset (tf.data.Dataset): Finite, batched dataset of (image, label) pairs.
+            samples (int): Number of images in one pass over the dataset.
+            subset (str): Name of the subset, used in the file names.
+            passes (int): Number of passes over the dataset; use more than one with an augmented dataset.
+        Raises:
+            ValueError: If the subset is empty or the dataset does not yield `samples` images per pass.
+        """
+        if self.is_valid(subset, passes):
+            logger.info(f"Cached {subset} features in {self.root_dir} are up to date")
+            return
+
+        if samples == 0:
+            raise ValueError(f"The {subset} subset has no images to extract features from")
+
+        os.makedirs(self.root_dir, exist_ok=True)
+        features_path, labels_path, meta_path = self._paths(subset)
+        if meta_path.exists():
+            os.remove(meta_path)
+
+        feature_shape = tuple(backbone.output_shape[1:])
+        logger.info(f"Extracting {subset} features of shape {feature_shape} for {samples} images x {passes} passes")
+        features = np.lib.format.open_memmap(
+            features_path, mode="w+", dtype=np.float32, shape=(samples * passes, *feature_shape)
+        )
+        labels = None
+
+        row = 0
+        for _ in range(passes):
+            for images, batch_labels in dataset:
+                batch_features = backbone(images, training=False).numpy()
+                if labels is None:
+                    labels = np.lib.format.open_memmap(
+                        labels_path, mode="w+", dtype=np.float32, shape=(samples * passes, batch_labels.shape[-1])
+                    )
+                features[row:row + len(batch_features)] = batch_features
+                labels[row:row + len(batch_features)] = batch_labels.numpy()
+                row += len(batch_features)
+
+        if row != samples * passes:
+            del features, labels
+            raise ValueError(
+                f"The {subset} dataset yielded {row} images instead of {samples} x {passes} passes; "
+                f"cached features in {self.root_dir} were not saved"
+            )
+        features.flush()
+        labels.flush()
+        del features, labels
+
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({**self.fingerprint, "passes": passes}, f)
+        logger.info(f"Cached {subset} features saved to {features_path}")
+
+    def load(self, subset: str) -> tuple:
+        """
+        Opens the cached features and labels of the subset read-only.
+        Returns:
+            tuple: Memory-mapped features and labels.
+        """
+        features_path, labels_path, _ = self._paths(subset)
+        return np.load(features_path, mmap_mode="r"), np.load(labels_path, mmap_mode="r")
@@ -0,0 +1,174 @@
+"""
+This module contains the ImageCache class, which stores the decoded and resized training images on disk.
+Every image is decoded and resized to IMAGE_SIZE once and written into a uint8 memory-mapped NumPy array,
+so that training epochs only read raw pixels and apply augmentation on the fly.
+The cache is keyed by file path, modification time, file size and target size, and is rebuilt
+automatically when any of them changes. It can also be filled straight from the dataset zip archive,
+in which case images are keyed by their CRC-32 and size instead of a file on disk.
+"""
+
+import io
+import os
+import json
+import zipfile
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from Chest_Cancer_Classification import logger
+
+IMAGES_FILE = "images.npy"
+MANIFEST_FILE = "manifest.json"
+
+
+class ImageCache:
+    """
+    This class is responsible for building and loading the preprocessed image store.
+    Each target size gets its own sub-directory, so changing IMAGE_SIZE never reuses stale pixels.
+    """
+    def __init__(self, root_dir: Path, image_size: list, source_keys: dict = None):
+        """
+        Initializes the ImageCache class.
+        Args:
+            root_dir (Path): Directory where the cache is stored.
+            image_size (list): Target image size as [height, width, channels].
+            source_keys (dict): Identity of images that only exist inside the zip archive, keyed by path.
+        """
+        self.image_size = list(image_size)
+        self.source_keys = source_keys or {}
+        height, width = self.image_size[:2]
+        self.cache_dir = Path(root_dir) / f"{height}x{width}"
+        self.images_path = self.cache_dir / IMAGES_FILE
+        self.manifest_path = self.cache_dir / MANIFEST_FILE
+
+    def _file_key(self, path: str) -> dict:
+        """
+        Returns the identity of a source image used to detect changes.
+        """
+        if str(path) in self.source_keys and not os.path.exists(path):
+            return self.source_keys[str(path)]
+        stat = os.stat(path)
+        return {"path": str(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def _load_manifest(self) -> dict:
+        """
+        Loads the manifest, or an empty dict if the cache has not been built.
+        """
+        if not self.manifest_path.exists() or not self.images_path.exists():
+            return {}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def is_valid(self, filepaths: list) -> bool:
+        """
+        Checks whether the cache holds exactly the given files at the current target size.
+        Args:
+            filepaths (list): Source image paths.
+        Returns:
+            bool: True if the cache is up to date.
+        """
+        manifest = self._load_manifest()
+        if manifest.get("image_size") != self.image_size:
+            return False
+        entries = sorted(manifest.get("entries", []), key=lambda entry: entry["path"])
+        return entries == sorted((self._file_key(path) for path in filepaths), key=lambda entry: entry["path"])
+
+    def decode(self, source) -> np.ndarray:
+        """
+        Decodes and resizes a single image (path or file object) the same way as `keras.utils.load_img` (RGB, bilinear).
+        """
+        height, width = self.image_size[:2]
+        with Image.open(source) as image:
+            image = image.convert("RGB").resize((width, height), Image.BILINEAR)
+            return np.asarray(image, dtype=np.uint8)
+
+    def build(self, filepaths: list, max_workers: int = None, reader=None):
+        """
+        Decodes every image once and writes the pixels into a memory-mapped array.
+        Args:
+            filepaths (list): Source image paths, in the order rows are stored.
+            max_workers (int): Number of decoding threads (defaults to the CPU count).
+            reader (Callable): Optional function returning a file object for a path, used instead of opening it.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        logger.info(f"Building image cache for {len(filepaths)} images in {self.cache_dir}")
+
+        # Remove the manifest first so an interrupted build is never mistaken for a valid cache
+        if self.manifest_path.exists():
+            os.remove(self.manifest_path)
+
+        images = np.lib.format.open_memmap(
+            self.images_path, mode="w+", dtype=np.uint8, shape=(len(filepaths), *self.image_size[:2], 3)
+        )
+
+        def _write(row: int):
+            if reader is None:
+                images[row] = self.decode(filepaths[row])
+            else:
+                with reader(filepaths[row]) as source:
+                    images[row] = self.decode(source)
+
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            list(executor.map(_write, range(len(filepaths))))
+        images.flush()
+        del images
+
+        manifest = {
+            "image_size": self.image_size,
+            "entries": [self._file_key(path) for path in filepaths]
+        }
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        logger.info(f"Image cache saved to {self.images_path}")
+
+    def build_from_zip(self, zip_path: Path, members: dict, max_workers: int = None):
+        """
+        Decodes images straight from the zip archive into the cache, without extracting them to disk.
+        Args:
+            zip_path (Path): Path to the zip archive.
+            members (dict): Maps the path each image would have once extracted to its archive member name.
+            max_workers (int): Number of decoding threads (defaults to the CPU count).
+        """
+        local = threading.local()
+        zip_refs = []
+
+        def _reader(path: str):
+            # ZipFile handles are not safe to share between threads, so each thread opens its own
+            if not hasattr(local, "zip_ref"):
+                local.zip_ref = zipfile.ZipFile(zip_path, "r")
+                zip_refs.append(local.zip_ref)
+            return io.BytesIO(local.zip_ref.read(members[path]))
+
+        try:
+            self.build(list(members), max_workers=max_workers, reader=_reader)
+        finally:
+            for zip_ref in zip_refs:
+                zip_ref.close()
+
+    def prepare(self, filepaths: list, zip_path: Path = None, members: dict = None):
+        """
+        Builds the cache unless it is already up to date for the given files.
+        Args:
+            filepaths (list): Source image paths, in the order rows are stored.
+            zip_path (Path): Zip archive to decode the images from, when they were not extracted.
+            members (dict): Maps the image paths to their archive member names (with `zip_path`).
+        """
+        if self.is_valid(filepaths):
+            logger.info(f"Image cache {self.cache_dir} is up to date")
+            return
+        if zip_path is None:
+            self.build(filepaths)
+        else:
+            self.build_from_zip(zip_path, {path: members[path] for path in filepaths})
+
+    def load(self) -> tuple:
+        """
+        Opens the cache read-only.
+        Returns:
+            tuple: The memory-mapped uint8 images and a dict mapping file path to row index.
+        """
+        manifest = self._load_manifest()
+        images = np.load(self.images_path, mmap_mode="r")
+        rows = {entry["path"]: row for row, entry in enumerate(manifest["entries"])}
+        return images, rows
@@ -0,0 +1,155 @@
+"""
+This module contains the ModelExport class, which converts the trained Keras model into inference-only artifacts.
+It writes a SavedModel without optimizer state and two TFLite models (float16 and int8 dynamic-range quantization),
+and reports the file size, load time and CPU latency of each artifact against the original .h5 file.
+"""
+
+import os
+import time
+from pathlib import Path
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from Chest_Cancer_Classification import logger
+from Chest_Cancer_Classification.entity.config_entity import ModelExportConfig
+from Chest_Cancer_Classification.utils.common import JSONHandler
+
+
+class ModelExport:
+    """
+    This class is responsible for exporting the trained model and benchmarking the exported artifacts.
+    """
+    def __init__(self, config: ModelExportConfig):
+        """
+        Initializes the ModelExport class with the given configuration.
+        Args:
+            config (ModelExportConfig): Configuration for exporting the model.
+        """
+        self.config = config
+        self.model = None
+
+    def get_model(self):
+        """
+        Loads the trained model without its optimizer state.
+        """
+        self.model = keras.models.load_model(self.config.trained_model_path, compile=False)
+
+    def export_saved_model(self):
+        """
+        Exports the model as a SavedModel with a single serving signature and no optimizer.
+        """
+        signature = tf.function(
+            lambda images: self.model(images, training=False),
+            input_signature=[tf.TensorSpec([None, *self.config.params_image_size], tf.float32, name="images")]
+        )
+        tf.saved_model.save(
+            self.model,
+            str(self.config.saved_model_path),
+            signatures={"serving_default": signature.get_concrete_function()}
+        )
+        logger.info(f"SavedModel exported to {self.config.saved_model_path}")
+
+    def export_tflite(self):
+        """
+        Exports the model to TFLite with float16 and with int8 dynamic-range quantization.
+        """
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+        Path(self.config.tflite_float16_path).write_bytes(converter.convert())
+        logger.info(f"Float16 TFLite model exported to {self.config.tflite_float16_path}")
+
+        # Without a representative dataset, Optimize.DEFAULT quantizes the weights to int8 (dynamic range)
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        Path(self.config.tflite_int8_path).write_bytes(converter.convert())
+        logger.info(f"Int8 dynamic-range TFLite model exported to {self.config.tflite_int8_path}")
+
+    @staticmethod
+    def _size_mb(path: Path) -> float:
+        """
+        Returns the size of a file, or of every file in a directory, in megabytes.
+        """
+        path = Path(path)
+        if path.is_dir():
+            size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+        else:
+            size = path.stat().st_size
+        return round(size / (1024 ** 2), 2)
+
+    @staticmethod
+    def _latency_ms(predict_fn, image: np.ndarray, runs: int) -> dict:
+        """
+        Measures single-image CPU latency after one warm-up call.
+        """
+        predict_fn(image)
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            predict_fn(image)
+            timings.append((time.perf_counter() - start) * 1000)
+        return {
+            "p50_latency_ms": round(float(np.percentile(timings, 50)), 3),
+            "p99_latency_ms": round(float(np.percentile(timings, 99)), 3)
+        }
+
+    @staticmethod
+    def _load_h5(path: Path):
+        """
+        Loads the Keras .h5 model and returns its predict function.
+        """
+        model = keras.models.load_model(path)
+        return lambda image: model(image, training=False)
+
+    @staticmethod
+    def _load_saved_model(path: Path):
+        """
+        Loads the SavedModel and returns its serving signature as predict function.
+        """
+        signature = tf.saved_model.load(str(path)).signatures["serving_default"]
+        return lambda image: signature(images=tf.constant(image))
+
+    @staticmethod
+    def _load_tflite(path: Path):
+        """
+        Loads a TFLite model into an interpreter and returns its predict function.
+        """
+        interpreter = tf.lite.Interpreter(model_path=str(path), num_threads=os.cpu_count())
+        interpreter.allocate_tensors()
+        input_index = interpreter.get_input_details()[0]["index"]
+        output_index = interpreter.get_output_details()[0]["index"]
+
+        def _predict(image: np.ndarray):
+            interpreter.set_tensor(input_index, image)
+            interpreter.invoke()
+            return interpreter.get_tensor(output_index)
+
+        return _predict
+
+    def benchmark(self):
+        """
+        Compares file size, load time and single-image CPU latency of the .h5 model and the exported artifacts,
+        and saves the comparison as a JSON report.
+        """
+        artifacts = {
+            "keras_h5": (self.config.trained_model_path, self._load_h5),
+            "saved_model": (self.config.saved_model_path, self._load_saved_model),
+            "tflite_float16": (self.config.tflite_float16_path, self._load_tflite),
+            "tflite_int8": (self.config.tflite_int8_path, self._load_tflite)
+        }
+        image = np.random.rand(1, *self.config.params_image_size).astype(np.float32)
+
+        report = {}
+        for name, (path, loader) in artifacts.items():
+            start = time.perf_counter()
+            predict_fn = loader(path)
+            load_time = time.perf_counter() - start
+            report[name] = {
+                "path": str(path),
+                "size_mb": self._size_mb(path),
+                "load_time_s": round(load_time, 3),
+                **self._latency_ms(predict_fn, image, runs=self.config.params_benchmark_runs)
+            }
+            logger.info(f"{name}: {report[name]}")
+
+        JSONHandler(path=str(self.config.report_path), data=report).save_json()
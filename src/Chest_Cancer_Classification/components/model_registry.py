@@ -0,0 +1,250 @@
+"""
+This module contains the ModelRegistry class, which serves several versions of the trained model side by side.
+Versions are the `.h5` files saved by `Trainer.save_model` under the models directory, named by their path relative
+to it without the suffix (e.g. "trained_vgg_16" or "ab/candidate"). A version is loaded on its first request and
+warmed up with a dummy batch, so that graph tracing does not land on a user request; at most MAX_RESIDENT_MODELS
+versions, weighing at most MAX_RESIDENT_MEMORY_MB together, stay in memory and the least recently used ones are
+evicted beyond that. Each resident version runs through its own CompiledPredictor and DynamicBatcher, so batches
+never mix models.
+"""
+
+import os
+import time
+import random
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from collections import OrderedDict
+import numpy as np
+from Chest_Cancer_Classification import logger
+from Chest_Cancer_Classification.entity.config_entity import PredictionConfig
+from Chest_Cancer_Classification.components.batcher import DynamicBatcher
+from Chest_Cancer_Classification.components.prediction_cache import model_version
+
+
+class UnknownModelVersion(KeyError):
+    """
+    Raised when a request names a model version that does not exist.
+    """
+
+
+class ServedModel:
+    """
+    A resident model version with its predictor and batcher.
+    """
+    def __init__(self, version: str, path: Path, file_version: str, predictor, batcher: DynamicBatcher,
+                 footprint_mb: float, load_s: float):
+        self.version = version
+        self.path = path
+        self.file_version = file_version
+        self.predictor = predictor
+        self.batcher = batcher
+        self.footprint_mb = footprint_mb
+        self.load_s = load_s
+        self.active = 0
+        self.retired = False
+
+
+class ModelRegistry:
+    """
+    This class is responsible for discovering model versions, loading them lazily and evicting the least
+    recently used ones. It is thread-safe; a version in use by a request is never unloaded under it.
+    """
+    def __init__(self, config: PredictionConfig):
+        """
+        Initializes the ModelRegistry class and discovers the available versions. No model is loaded yet.
+        Args:
+            config (PredictionConfig): Prediction configuration.
+        """
+        self.config = config
+        self.models_dir = Path(config.models_dir)
+        self.default_version = self.version_of(config.trained_model_path)
+        self.resident = OrderedDict()
+        self.versions = {}
+        self.lock = threading.Lock()
+        self.load_locks = {}
+        self.counters = {"loads": 0, "evictions": 0}
+        self.discover()
+
+    def version_of(self, path: Path) -> str:
+        """
+        Returns the version name of a model file under the models directory.
+        """
+        return Path(os.path.relpath(path, self.models_dir)).with_suffix("").as_posix()
+
+    def discover(self) -> dict:
+        """
+        Scans the models directory for saved models, skipping the temporary files of saves in progress.
+        The trained model of the configuration is always a version, even when it is saved elsewhere.
+        Returns:
+            dict: Version names mapped to their model files.
+        """
+        versions = {
+            self.version_of(path): path
+            for path in sorted(self.models_dir.rglob("*.h5"))
+            if ".tmp" not in path.name
+        }
+        if os.path.exists(self.config.trained_model_path):
+            versions.setdefault(self.default_version, Path(self.config.trained_model_path))
+        with self.lock:
+            self.versions = versions
+        return versions
+
+    def resolve(self, version: str = None) -> str:
+        """
+        Returns the version serving a request: the requested one, otherwise a version drawn from MODEL_TRAFFIC,
+        otherwise the trained model of the configuration.
+        Raises:
+            UnknownModelVersion: If the requested version does not exist.
+        """
+        if version is None:
+            traffic = self.config.params_model_traffic
+            if not traffic:
+                version = self.default_version
+            else:
+                version = random.choices(list(traffic), weights=list(traffic.values()))[0]
+        if version not in self.versions and version not in self.discover():
+            raise UnknownModelVersion(f"Unknown model version {version!r}. Available versions: {sorted(self.versions)}")
+        return version
+
+    def file_version(self, version: str) -> str:
+        """
+        Returns the file version of a model (see `model_version`), which changes whenever it is saved again.
+        """
+        return model_version(self.versions[version])
+
+    @staticmethod
+    def _footprint_mb(model) -> float:
+        """
+        Returns the memory taken by the weights of a model in MiB.
+        """
+        return sum(int(np.prod(weight.shape)) * weight.dtype.size for weight in model.weights) / 2**20
+
+    def _load(self, version: str, path: Path, file_version: str) -> ServedModel:
+        """
+        Loads a model version, warms it up with a dummy batch and starts its batcher.
+        """
+        from tensorflow import keras
+        from Chest_Cancer_Classification.components.compiled_predictor import CompiledPredictor
+
+        start = time.perf_counter()
+        model = keras.models.load_model(path)
+        predictor = CompiledPredictor.from_config(model, self.config)
+        predictor.warmup()
+        load_s = time.perf_counter() - start
+        batcher = DynamicBatcher(
+            predict_fn=predictor.predict,
+            max_batch_size=self.config.params_max_batch_size,
+            max_wait_ms=self.config.params_max_wait_ms
+        )
+        served = ServedModel(version, path, file_version, predictor, batcher, self._footprint_mb(model), load_s)
+        logger.info(f"Loaded model {version} ({served.footprint_mb:.0f} MiB) in {load_s:.1f}s")
+        return served
+
+    def _unload(self, served: ServedModel):
+        served.batcher.close()
+        served.predictor = None
+        logger.info(f"Unloaded model {served.version}")
+
+    def _evict(self, incoming_mb: float = 0.0):
+        """
+        Unloads the least recently used idle versions until the resident ones fit in the limits,
+        leaving room for `incoming_mb` more. Called with the lock held.
+        """
+        def fits() -> bool:
+            used_mb = sum(served.footprint_mb for served in self.resident.values())
+            return (len(self.resident) + (1 if incoming_mb else 0) <= self.config.params_max_resident_models
+                    and used_mb + incoming_mb <= self.config.params_max_resident_memory_mb)
+
+        for version in list(self.resident):
+            if fits():
+                return
+            served = self.resident[version]
+            if served.active:
+                continue
+            del self.resident[version]
+            self.counters["evictions"] += 1
+            self._unload(served)
+        if not fits():
+            logger.warning("Resident models exceed MAX_RESIDENT_MODELS or MAX_RESIDENT_MEMORY_MB while serving requests")
+
+    def _retire(self, served: ServedModel):
+        """
+        Removes a stale version from the resident ones; it is unloaded once its last request is done.
+        Called with the lock held.
+        """
+        if self.resident.get(served.version) is served:
+            del self.resident[served.version]
+        served.retired = True
+        if not served.active:
+            self._unload(served)
+
+    @contextmanager
+    def acquire(self, version: str):
+        """
+        Context manager yielding the resident ServedModel of a version, loading it first when needed.
+        The version cannot be unloaded while the context is open.
+        """
+        path = self.versions[version]
+        file_version = model_version(path)
+        with self.lock:
+            served = self.resident.get(version)
+            if served is not None and served.file_version != file_version:
+                logger.info(f"Model {version} was saved again, reloading it")
+                self._retire(served)
+                served = None
+            load_lock = self.load_locks.setdefault(version, threading.Lock())
+            if served is not None:
+                self.resident.move_to_end(version)
+                served.active += 1
+
+        if served is None:
+            # Loads take seconds: only requests for the same version wait for it
+            with load_lock:
+                with self.lock:
+                    served = self.resident.get(version)
+                    if served is not None and served.file_version == file_version:
+                        self.resident.move_to_end(version)
+                        served.active += 1
+                    else:
+                        if served is not None:
+                            self._retire(served)
+                        served = None
+                        # The file size approximates the weights, so memory is freed before loading
+                        self._evict(incoming_mb=max(os.path.getsize(path) / 2**20, 1e-6))
+                if served is None:
+                    served = self._load(version, path, file_version)
+                    with self.lock:
+                        served.active += 1
+                        self.resident[version] = served
+                        self.counters["loads"] += 1
+                        self._evict()
+
+        try:
+            yield served
+        finally:
+            with self.lock:
+                served.active -= 1
+                if served.retired and not served.active:
+                    self._unload(served)
+
+    def stats(self) -> dict:
+        """
+        Returns the available and resident versions, with the footprint, load time and batching statistics
+        of each resident version.
+        """
+        with self.lock:
+            return {
+                **self.counters,
+                "default_version": self.default_version,
+                "available": sorted(self.versions),
+                "resident_mb": round(sum(served.footprint_mb for served in self.resident.values()), 1),
+                "resident": {
+                    version: {
+                        "footprint_mb": round(served.footprint_mb, 1),
+                        "load_s": round(served.load_s, 2),
+                        **served.batcher.stats.summary()
+                    }
+                    for version, served in self.resident.items()
+                }
+            }
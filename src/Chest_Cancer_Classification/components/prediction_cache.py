@@ -0,0 +1,166 @@
+"""
+This module contains the PredictionCache class, which remembers the predictions of images already scored.
+Entries are keyed by a SHA-256 of the decoded, resized pixels together with the version of the model, so a
+resubmitted scan is answered without running the model and a retrained model never serves stale predictions.
+The cache has an in-memory LRU tier and an optional SQLite tier on disk that survives restarts; both tiers
+evict their least recently used entries beyond their size and drop entries older than the TTL.
+"""
+
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+import numpy as np
+from Chest_Cancer_Classification.entity.config_entity import PredictionConfig
+
+
+def model_version(path: Path) -> str:
+    """
+    Returns a version string of a model file, which changes whenever the file is rewritten.
+    """
+    stat = os.stat(path)
+    return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+class PredictionCache:
+    """
+    This class is responsible for caching prediction probabilities by image content and model version.
+    It is thread-safe, so it can be shared by the request threads of the HTTP server.
+    """
+    def __init__(self, max_entries: int, ttl_s: float, disk_path: Path = None, max_disk_entries: int = 0):
+        """
+        Initializes the PredictionCache class.
+        Args:
+            max_entries (int): Maximum number of entries kept in memory (0 disables the memory tier).
+            ttl_s (float): Age in seconds after which an entry is no longer served (0 for no expiry).
+            disk_path (Path): SQLite file of the disk tier, or None to keep the cache in memory only.
+            max_disk_entries (int): Maximum number of entries kept on disk.
+        """
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.max_disk_entries = max_disk_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+        self.db = None
+        if disk_path is not None:
+            os.makedirs(Path(disk_path).parent, exist_ok=True)
+            self.db = sqlite3.connect(str(disk_path), check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions "
+                "(key TEXT PRIMARY KEY, probabilities TEXT, created REAL, accessed REAL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS predictions_accessed ON predictions (accessed)")
+            self.db.commit()
+
+    @classmethod
+    def from_config(cls, config: PredictionConfig) -> "PredictionCache":
+        """
+        Builds the cache from the PREDICTION_CACHE_* parameters.
+        """
+        return cls(
+            max_entries=config.params_cache_size,
+            ttl_s=config.params_cache_ttl_s,
+            disk_path=config.prediction_cache_path if config.params_cache_disk else None,
+            max_disk_entries=config.params_cache_disk_size
+        )
+
+    @staticmethod
+    def key(image: np.ndarray, version: str) -> str:
+        """
+        Returns the cache key of a decoded image for a model version.
+        Args:
+            image (np.ndarray): Decoded uint8 image, after resizing to the model input size.
+            version (str): Version of the model (see `model_version`).
+        """
+        digest = hashlib.sha256(str(image.shape).encode("utf-8") + np.ascontiguousarray(image).tobytes()).hexdigest()
+        return f"{version}:{digest}"
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl_s > 0 and time.time() - created > self.ttl_s
+
+    def get(self, key: str):
+        """
+        Returns the cached probabilities of a key, or None.
+        """
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1]):
+                    self.memory.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return entry[0]
+                del self.memory[key]
+                self.counters["expired"] += 1
+
+            if self.db is not None:
+                row = self.db.execute(
+                    "SELECT probabilities, created FROM predictions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    probabilities, created = np.asarray(json.loads(row[0]), dtype=np.float32), row[1]
+                    if not self._expired(created):
+                        self.db.execute("UPDATE predictions SET accessed = ? WHERE key = ?", (time.time(), key))
+                        self.db.commit()
+                        self._put_memory(key, probabilities, created)
+                        self.counters["disk_hits"] += 1
+                        return probabilities
+                    self.db.execute("DELETE FROM predictions WHERE key = ?", (key,))
+                    self.db.commit()
+                    self.counters["expired"] += 1
+
+            self.counters["misses"] += 1
+            return None
+
+    def _put_memory(self, key: str, probabilities: np.ndarray, created: float):
+        """
+        Inserts an entry in the memory tier and evicts the least recently used ones beyond its size.
+        """
+        if self.max_entries <= 0:
+            return
+        self.memory[key] = (probabilities, created)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def put(self, key: str, probabilities: np.ndarray):
+        """
+        Caches the probabilities of a key in both tiers.
+        """
+        now = time.time()
+        probabilities = np.asarray(probabilities, dtype=np.float32)
+        with self.lock:
+            self._put_memory(key, probabilities, now)
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(probabilities.tolist()), now, now)
+                )
+                excess = self.db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] - self.max_disk_entries
+                if excess > 0:
+                    self.db.execute(
+                        "DELETE FROM predictions WHERE key IN "
+                        "(SELECT key FROM predictions ORDER BY accessed LIMIT ?)", (excess,)
+                    )
+                    self.counters["evictions"] += excess
+                self.db.commit()
+
+    def stats(self) -> dict:
+        """
+        Returns the hit/miss counters, the hit rate and the number of entries of each tier.
+        """
+        with self.lock:
+            hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+            lookups = hits + self.counters["misses"]
+            disk_entries = self.db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] if self.db else 0
+            return {
+                **self.counters,
+                "hit_rate": round(hits / lookups, 4) if lookups else None,
+                "memory_entries": len(self.memory),
+                "disk_entries": disk_entries
+            }
@@ -1,12 +1,22 @@
 """
 This module contains the PrepareBaseModel class, which is responsible for preparing a base model for fine-tuning.
 It includes methods for loading a pre-trained model, modifying it for a specific task, and saving the updated model.
-It uses TensorFlow and Keras for model handling and assumes the use of VGG16 as the base model.
+It uses TensorFlow and Keras for model handling; the base model is picked from the backbone registry (VGG16 by default).
+Both models are published to the artifact registry, which writes them in the background and hands the updated model
+to the Trainer without an .h5 round trip when both stages run in the same process.
 """
 
 from pathlib import Path
 from tensorflow import keras
 from Chest_Cancer_Classification.entity.config_entity import PrepareModelConfig
+from Chest_Cancer_Classification.components.backbones import get_backbone
+from Chest_Cancer_Classification.utils.artifacts import artifacts
+
+HEAD_POOLING = {
+    "flatten": keras.layers.Flatten,
+    "avg": keras.layers.GlobalAveragePooling2D,
+    "max": keras.layers.GlobalMaxPooling2D
+}
 
 
 class PrepareModel:
@@ -26,19 +36,64 @@ class PrepareModel:
 
     def get_model(self):
         """
-        Loads the base model (VGG16) with the specified parameters.
+        Loads the base model selected by BACKBONE with the specified parameters.
         The model is loaded with the specified input shape, weights, and whether to include the top layers.
         """
-        self.model = keras.applications.vgg16.VGG16(
+        self.model = get_backbone(self.config.params_backbone).build(
             input_shape=self.config.params_image_size,
             weights=self.config.params_weights,
             include_top=self.config.params_include_top
         )
 
-        self.save_model(path=self.config.model_path, model=self.model)
+        artifacts.publish(self.config.model_path, self.model, self._save_fn)
+
+    @staticmethod
+    def freeze_layers(model: keras.Model, freeze_all: bool, freeze_till: int):
+        """
+        Sets which layers of the base model are trainable.
+        Args:
+            model (keras.Model): The base model.
+            freeze_all (bool): Whether to freeze all layers of the base model.
+            freeze_till (int): The number of layers at the end of the model that stay trainable;
+                every layer before them is frozen.
+        """
+        if freeze_all:
+            for layer in model.layers:
+                layer.trainable = False
+        elif freeze_till is not None and freeze_till > 0:
+            for layer in model.layers[:-freeze_till]:
+                layer.trainable = False
+            for layer in model.layers[-freeze_till:]:
+                layer.trainable = True
 
     @staticmethod
-    def _prepare_full_model(model: keras.Model, classes: int, freeze_all: bool, freeze_till: int, learning_rate: float) -> keras.Model:
+    def build_head(classes: int, pooling: str = "flatten", hidden_units: int = 0, dropout: float = 0.0) -> list:
+        """
+        Builds the classification head layers placed on top of the base model.
+        Args:
+            classes (int): The number of output classes.
+            pooling (str): How the feature maps are reduced: "flatten", "avg" (global average) or "max" (global max).
+            hidden_units (int): Width of an optional hidden Dense layer (0 for none).
+            dropout (float): Dropout rate applied before each Dense layer (0 for none).
+        Returns:
+            list: The head layers, in order.
+        """
+        if pooling not in HEAD_POOLING:
+            raise ValueError(f"Invalid head pooling {pooling}. Use one of {', '.join(HEAD_POOLING)}.")
+
+        layers = [HEAD_POOLING[pooling]()]
+        if hidden_units:
+            if dropout:
+                layers.append(keras.layers.Dropout(dropout))
+            layers.append(keras.layers.Dense(units=hidden_units, activation="relu", name="hidden_layer"))
+        if dropout:
+            layers.append(keras.layers.Dropout(dropout))
+        layers.append(keras.layers.Dense(units=classes, activation="softmax", name="output_layer"))
+        return layers
+
+    @staticmethod
+    def _prepare_full_model(model: keras.Model, classes: int, freeze_all: bool, freeze_till: int, learning_rate: float,
+                            pooling: str = "flatten", hidden_units: int = 0, dropout: float = 0.0) -> keras.Model:
         """
         Prepares the full model for fine-tuning using a Sequential model.
         Args:
@@ -47,26 +102,19 @@ class PrepareModel:
             freeze_all (bool): Whether to freeze all layers of the base model.
             freeze_till (int): The number of layers to freeze from the end of the model.
             learning_rate (float): The learning rate for the optimizer.
+            pooling (str): Head pooling, see `build_head`.
+            hidden_units (int): Width of the optional hidden layer of the head.
+            dropout (float): Dropout rate of the head.
         Returns:
             keras.Model: The modified model ready for fine-tuning.
         """
         # Freeze layers based on the provided configuration
-        if freeze_all:
-            for layer in model.layers:
-                layer.trainable = False
-        elif freeze_till is not None and freeze_till > 0:
-            for layer in model.layers[:-freeze_till]:
-                layer.trainable = False
+        PrepareModel.freeze_layers(model, freeze_all=freeze_all, freeze_till=freeze_till)
 
         # Create a Sequential model and add the base model and new layers
         full_model = keras.Sequential([
             model,
-            keras.layers.Flatten(),
-            keras.layers.Dense(
-                units=classes,
-                activation="softmax",
-                name="output_layer"
-            )
+            *PrepareModel.build_head(classes, pooling=pooling, hidden_units=hidden_units, dropout=dropout)
         ])
 
         # Compile the model with the specified optimizer, loss, and metrics
@@ -85,15 +133,27 @@ class PrepareModel:
         Updates the base model by adding new layers and compiling it for fine-tuning.
         The model is saved after updating.
         """
+        # Freezing layers modifies the base model, so its pending write must finish first
+        artifacts.discard(self.config.model_path)
         self.full_model = self._prepare_full_model(
             model=self.model,
             classes=self.config.params_classes,
             freeze_all=True,
             freeze_till=None,
-            learning_rate=self.config.params_learning_rate
+            learning_rate=self.config.params_learning_rate,
+            pooling=self.config.params_head_pooling,
+            hidden_units=self.config.params_head_hidden_units,
+            dropout=self.config.params_head_dropout
         )
 
-        self.save_model(path=self.config.updated_model_path, model=self.full_model)
+        artifacts.publish(self.config.updated_model_path, self.full_model, self._save_fn)
+
+    @staticmethod
+    def _save_fn(model: keras.Model, path: Path):
+        """
+        Artifact registry writer of the models.
+        """
+        PrepareModel.save_model(path=path, model=model)
 
     @staticmethod
     def save_model(path: Path, model: keras.Model):
@@ -1,7 +1,29 @@
+import os
+import json
+import hashlib
 from pathlib import Path
+from dataclasses import asdict
 from tensorflow import keras
 from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
 from Chest_Cancer_Classification.entity.config_entity import TrainingConfig
+from Chest_Cancer_Classification.components.data_pipeline import DataPipeline
+from Chest_Cancer_Classification.components.feature_cache import FeatureCache
+from Chest_Cancer_Classification.components import distributed
+from Chest_Cancer_Classification.components.prepare_model import PrepareModel
+from Chest_Cancer_Classification.components.backbones import block_of, get_backbone, preprocess_input
+from Chest_Cancer_Classification.components.callbacks import InputTimer, ThroughputLogger
+from Chest_Cancer_Classification.components.checkpointing import TrainingCheckpointer
+from Chest_Cancer_Classification.utils.artifacts import artifacts
+from Chest_Cancer_Classification import logger
+
+# Training settings that change the weights or the optimizer state; the others (logging, profiling, paths,
+# checkpoint cadence, input pipeline tuning) can change without invalidating the checkpoints of a run
+CHECKPOINT_FINGERPRINT_FIELDS = (
+    "updated_base_model_path", "training_data", "params_batch_size", "params_is_augmentation",
+    "params_augmentation_config", "params_image_size", "params_data_pipeline", "params_training_mode",
+    "params_feature_augment_passes", "params_mixed_precision", "params_num_workers", "params_fine_tuning_phases",
+    "params_unfreeze_blocks", "params_backbone"
+)
 
 
 class Trainer:
@@ -10,43 +32,138 @@ class Trainer:
     It initializes the model, sets up data generators for training and validation,
     and provides methods to train the model and save it to a specified path.
     """
-    def __init__(self, config: ConfigurationManager):
+    def __init__(self, config: ConfigurationManager, callbacks: list = None):
         """
         Initializes the Training class with the given configuration.
         Args:
             config (TrainingConfig): Configuration object containing training parameters.
+            callbacks (list): Additional Keras callbacks passed to every fit call (e.g. sweep pruning).
         """
         self.config = config
+        self.extra_callbacks = callbacks or []
         self.prepare_model_config = config.get_prepare_model_config()
         self.training_config = config.get_training_config()
+        # The strategy must exist before any other TensorFlow operation
+        self.strategy = distributed.get_strategy()
+        self.num_workers = distributed.num_workers()
+        self.global_batch_size = self.training_config.params_batch_size * self.num_workers
         self.model = None
         self.train_generator = None
         self.valid_generator = None
+        self.train_samples = None
+        self.valid_samples = None
         self.steps_per_epoch = None
         self.validation_steps = None
         self.get_model()
         self.train_valid_generator()
+        # Training modifies the model: take ownership of it once its file is written (which the fingerprints read)
+        artifacts.discard(self.prepare_model_config.updated_model_path)
+        self.checkpointer = TrainingCheckpointer(
+            directory=self.training_config.checkpoint_dir,
+            fingerprint={
+                "training": {field: getattr(self.training_config, field) for field in CHECKPOINT_FINGERPRINT_FIELDS},
+                "prepare_model": asdict(self.prepare_model_config),
+                "base_model_mtime_ns": os.stat(self.prepare_model_config.updated_model_path).st_mtime_ns
+            },
+            max_to_keep=self.training_config.params_checkpoint_keep,
+            every_epochs=self.training_config.params_checkpoint_every_epochs,
+            strategy=self.strategy
+        )
 
     
     def get_model(self):
         """
         Loads the base model from the specified path and compiles it.
+        When the prepare_model stage ran in this process, its live model is used instead of reloading the file.
+        Under a distribution strategy the variables are created in the strategy scope.
         """
-        self.model = keras.models.load_model(
-            self.prepare_model_config.updated_model_path
-        )
+        with self.strategy.scope():
+            self.model = artifacts.get(self.prepare_model_config.updated_model_path, keras.models.load_model)
+            if self.training_config.params_mixed_precision != "float32":
+                self.model = self.apply_precision_policy(self.model, self.training_config.params_mixed_precision)
+
+    @staticmethod
+    def _set_layer_dtypes(layer_config, policy: str):
+        """
+        Recursively sets the dtype policy of every layer in a serialized model config,
+        keeping input layers and the softmax `output_layer` in float32 for numerical stability.
+        """
+        if isinstance(layer_config, dict):
+            config = layer_config.get("config")
+            if "class_name" in layer_config and isinstance(config, dict) and "dtype" in config:
+                if layer_config["class_name"] != "InputLayer":
+                    config["dtype"] = "float32" if config.get("name") == "output_layer" else policy
+            for value in layer_config.values():
+                Trainer._set_layer_dtypes(value, policy)
+        elif isinstance(layer_config, list):
+            for value in layer_config:
+                Trainer._set_layer_dtypes(value, policy)
+
+    @staticmethod
+    def apply_precision_policy(model: keras.Model, policy: str) -> keras.Model:
+        """
+        Rebuilds a model under a mixed precision policy and copies its weights.
+        Layers loaded from an .h5 file keep the dtype they were saved with, so setting the
+        global policy alone is not enough; the serialized config is rewritten instead.
+        Args:
+            model (keras.Model): The float32 model.
+            policy (str): "mixed_float16" or "mixed_bfloat16".
+        Returns:
+            keras.Model: The same architecture and weights running under the given policy.
+        """
+        keras.mixed_precision.set_global_policy(policy)
+        model_config = {"class_name": model.__class__.__name__, "config": model.get_config()}
+        Trainer._set_layer_dtypes(model_config, policy)
+        mixed_model = model.__class__.from_config(model_config["config"])
+        mixed_model.set_weights(model.get_weights())
+        return mixed_model
 
     def train_valid_generator(self):
+        """
+        Sets up the data generators for training and validation.
+        The input engine is selected with `DATA_PIPELINE` in params.yaml:
+        "tf_data" builds parallel tf.data pipelines, "keras" keeps the ImageDataGenerator iterators.
+        """
+        if self.training_config.params_data_pipeline == "tf_data":
+            self._tf_data_generator()
+        elif self.training_config.params_data_pipeline == "keras":
+            self._keras_generator()
+        else:
+            raise ValueError(
+                f"Invalid data pipeline {self.training_config.params_data_pipeline}. Use 'tf_data' or 'keras'."
+            )
+
+    def _tf_data_generator(self):
+        """
+        Sets up tf.data pipelines for training and validation.
+        Images are decoded, resized and augmented in parallel and batches are prefetched,
+        with the same 80/20 split and class indexing as `flow_from_directory`.
+        """
+        data_pipeline = DataPipeline(config=self.training_config, batch_size=self.global_batch_size)
+        if self.training_config.params_use_image_cache:
+            data_pipeline.prepare_cache()
+        self.train_samples = len(data_pipeline.list_files("training")[0])
+        self.valid_samples = len(data_pipeline.list_files("validation")[0])
+
+        self.valid_generator = data_pipeline.build(subset="validation", shuffle=False)
+        self.train_generator = data_pipeline.build(
+            subset="training",
+            shuffle=True,
+            augment=self.training_config.params_is_augmentation,
+            repeat=True
+        )
+
+    def _keras_generator(self):
         """
         Sets up the data generators for training and validation.
         It uses the ImageDataGenerator class from Keras to create data generators
-        that can augment the training data and normalize the pixel values.
+        that can augment the training data and apply the preprocessing of the backbone.
         The training data is split into training and validation sets based on the
         specified validation split in the configuration.
         """
         # Define the data generator parameters
         datagenerator_kwargs = dict(
-            rescale=1./255,         # Normalize pixel values to [0, 1]
+            preprocessing_function=lambda image: preprocess_input(image, self.training_config.params_backbone),
             validation_split=0.20   # Split the data into training and validation sets
         )
 
@@ -70,13 +187,12 @@ class Trainer:
         )
 
         if self.training_config.params_is_augmentation:
+            # AUGMENTATION_CONFIG keys are the upper-cased ImageDataGenerator arguments
+            augmentation_kwargs = {
+                key.lower(): value for key, value in self.training_config.params_augmentation_config.items()
+            }
             train_datagenerator = keras.preprocessing.image.ImageDataGenerator(
-                rotation_range=40,
-                horizontal_flip=True,
-                width_shift_range=0.2,
-                height_shift_range=0.2,
-                shear_range=0.2,
-                zoom_range=0.2,
+                **augmentation_kwargs,
                 **datagenerator_kwargs
             )
         else:
@@ -88,43 +204,262 @@ class Trainer:
             shuffle=True,
             **dataflow_kwargs
         )
+        self.train_samples = self.train_generator.samples
+        self.valid_samples = self.valid_generator.samples
 
     @staticmethod
     def save_model(path: Path, model: keras.Model):
         """
         Saves the trained model to the specified path.
+        The model is written next to it first and then renamed, so an interrupted save never leaves a truncated file.
         Args:
             path (Path): The path where the model will be saved.
             model (keras.Model): The trained Keras model to be saved.
         """
-        model.save(path)
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
+        model.save(tmp_path)
+        os.replace(tmp_path, path)
     
+    def _compile(self, model: keras.Model, learning_rate: float = None):
+        """
+        Compiles the given model with the training optimizer, loss and metrics.
+        The learning rate defaults to LEARNING_RATE.
+        """
+        with self.strategy.scope():
+            model.compile(
+                optimizer=keras.optimizers.AdamW(
+                    learning_rate=learning_rate or self.prepare_model_config.params_learning_rate
+                ),
+                loss=keras.losses.CategoricalCrossentropy(),
+                metrics=["accuracy"],
+                jit_compile=self.training_config.params_jit_compile
+            )
+
     def train(self):
         """
+        Trains the model and saves it to the specified path.
+        The training mode is selected with `TRAINING_MODE` in params.yaml:
+        "full" pushes every image through the whole network each epoch, with the last UNFREEZE_BLOCKS
+        blocks of the backbone trainable,
+        "cached_features" trains only the head on cached backbone activations,
+        "progressive" runs the phases of FINE_TUNING_PHASES one after the other.
+        Training is checkpointed every CHECKPOINT_EVERY_EPOCHS epochs and an interrupted run resumes from its
+        latest checkpoint; the checkpoints are removed once the trained model is saved.
+        """
+        if self.num_workers > 1 and (self.training_config.params_training_mode != "full"
+                                     or self.training_config.params_data_pipeline != "tf_data"):
+            raise ValueError("Multi-worker training requires TRAINING_MODE: full and DATA_PIPELINE: tf_data.")
+
+        if self.training_config.params_training_mode == "full":
+            if self.training_config.params_unfreeze_blocks:
+                self._unfreeze_blocks(self.training_config.params_unfreeze_blocks)
+            self._train_full()
+        elif self.training_config.params_training_mode == "cached_features":
+            self._train_cached_features()
+        elif self.training_config.params_training_mode == "progressive":
+            self._train_progressive()
+        else:
+            raise ValueError(
+                f"Invalid training mode {self.training_config.params_training_mode}. "
+                f"Use 'full', 'cached_features' or 'progressive'."
+            )
+
+        if distributed.is_chief():
+            self.save_model(
+                path=self.training_config.trained_model_path,
+                model=self.model
+            )
+        self.checkpointer.clear()
+
+    def _callbacks(self, batch_size: int, phase: str, input_timer: InputTimer = None) -> list:
+        """
+        Builds the callbacks of a fit call: the callbacks given to the Trainer, the throughput log and, with PROFILE,
+        a TensorBoard profiler trace of the PROFILE_BATCHES step window. Only the chief writes the log and trace.
+        """
+        if not distributed.is_chief():
+            return list(self.extra_callbacks)
+        callbacks = [*self.extra_callbacks, ThroughputLogger(
+            log_path=self.training_config.metrics_log_path,
+            batch_size=batch_size,
+            input_timer=input_timer,
+            phase=phase
+        )]
+        if self.training_config.params_profile:
+            callbacks.append(keras.callbacks.TensorBoard(
+                log_dir=str(Path(self.training_config.profile_dir) / phase),
+                profile_batch=tuple(self.training_config.params_profile_batches),
+                write_graph=False
+            ))
+        return callbacks
+
+    def _train_full(self, epochs: int = None, learning_rate: float = None, initial_epoch: int = 0,
+                    phase: str = "full", phase_index: int = 0):
+        """
         Trains the model using the training and validation data generators.
         It sets the number of steps per epoch and validation steps based on the
         number of samples in the training and validation data.
-        The model is trained for the specified number of epochs and the trained
-        model is saved to the specified path.
+        The model is trained for the specified number of epochs (EPOCHS by default),
+        minus the epochs of the phase already completed by an interrupted run.
         """
-        self.steps_per_epoch = self.train_generator.samples // self.train_generator.batch_size
-        self.validation_steps = self.valid_generator.samples // self.valid_generator.batch_size
+        self.steps_per_epoch = self.train_samples // self.global_batch_size
+        self.validation_steps = self.valid_samples // self.global_batch_size
+        epochs = epochs or self.training_config.params_epochs
 
-        self.model.compile(
-            optimizer=keras.optimizers.AdamW(learning_rate=self.prepare_model_config.params_learning_rate),
-            loss=keras.losses.CategoricalCrossentropy(),
-            metrics=["accuracy"]
-        )
+        self._compile(self.model, learning_rate=learning_rate)
+        completed = self.checkpointer.restore(self.model, self.model.optimizer, phase_index)
+        if completed >= epochs:
+            return
+
+        # The timed wrapper pulls every batch through Python, so it only runs when profiling, and only on
+        # single-process tf.data training, where it cannot change sharding
+        input_timer = None
+        train_data = self.train_generator
+        if (self.training_config.params_profile and self.training_config.params_data_pipeline == "tf_data"
+                and self.num_workers == 1):
+            input_timer = InputTimer()
+            train_data = input_timer.wrap(self.train_generator)
 
         self.model.fit(
-            self.train_generator,
-            epochs=self.training_config.params_epochs,
+            train_data,
+            epochs=initial_epoch + epochs,
+            initial_epoch=initial_epoch + completed,
             steps_per_epoch=self.steps_per_epoch,
             validation_steps=self.validation_steps,
-            validation_data=self.valid_generator
+            validation_data=self.valid_generator,
+            callbacks=[
+                *self._callbacks(self.global_batch_size, phase, input_timer),
+                self.checkpointer.callback(self.model, self.model.optimizer, phase_index, initial_epoch)
+            ]
+        )
+
+    def _extract_features(self) -> FeatureCache:
+        """
+        Runs the frozen backbone once over both subsets and caches the activations.
+        With `FEATURE_AUGMENT_PASSES` > 0 the training features are computed over that many augmented passes.
+        """
+        backbone = self.model.layers[0]
+        passes = self.training_config.params_feature_augment_passes
+        data_pipeline = DataPipeline(config=self.training_config)
+        # The features are only valid for the exact samples they were computed on, in the same order
+        subsets = {subset: data_pipeline.list_files(subset) for subset in ("training", "validation")}
+        files = json.dumps({"subsets": subsets, "sources": data_pipeline.source_keys}, sort_keys=True)
+        backbone_name = self.training_config.params_backbone
+        feature_cache = FeatureCache(
+            root_dir=self.training_config.features_dir,
+            fingerprint={
+                "backbone": str(self.prepare_model_config.updated_model_path),
+                "backbone_mtime_ns": os.stat(self.prepare_model_config.updated_model_path).st_mtime_ns,
+                "image_size": list(self.training_config.params_image_size),
+                "samples": {subset: len(filepaths) for subset, (filepaths, _) in subsets.items()},
+                "files_sha256": hashlib.sha256(files.encode("utf-8")).hexdigest(),
+                "preprocessing": f"{backbone_name}:{get_backbone(backbone_name).preprocess.__qualname__}",
+                # Augmented passes depend on the augmentation settings, plain passes do not
+                "augmentation": dict(self.training_config.params_augmentation_config) if passes > 0 else None
+            }
         )
 
-        self.save_model(
-            path=self.training_config.trained_model_path,
-            model=self.model
+        if self.training_config.params_use_image_cache:
+            data_pipeline.prepare_cache()
+
+        feature_cache.extract(
+            backbone=backbone,
+            dataset=data_pipeline.build(subset="training", shuffle=False, augment=passes > 0),
+            samples=self.train_samples,
+            subset="training",
+            passes=max(passes, 1)
         )
+        feature_cache.extract(
+            backbone=backbone,
+            dataset=data_pipeline.build(subset="validation", shuffle=False),
+            samples=self.valid_samples,
+            subset="validation"
+        )
+        return feature_cache
+
+    def _train_cached_features(self, epochs: int = None, learning_rate: float = None, phase: str = "cached_features",
+                               phase_index: int = 0):
+        """
+        Trains only the classification head on cached backbone activations.
+        The head model shares its layers with the full model, so the trained weights
+        end up in `self.model`, which keeps the same interface as the full training mode.
+        Epochs and learning rate default to EPOCHS and LEARNING_RATE.
+        """
+        epochs = epochs or self.training_config.params_epochs
+        feature_cache = self._extract_features()
+        train_features, train_labels = feature_cache.load("training")
+        valid_features, valid_labels = feature_cache.load("validation")
+
+        backbone = self.model.layers[0]
+        head = keras.Sequential([keras.Input(shape=backbone.output_shape[1:]), *self.model.layers[1:]])
+        self._compile(head, learning_rate=learning_rate)
+        # The checkpoint tracks the full model, which owns the head layers, with the optimizer of the head
+        completed = self.checkpointer.restore(self.model, head.optimizer, phase_index)
+
+        if completed < epochs:
+            head.fit(
+                x=train_features,
+                y=train_labels,
+                batch_size=self.training_config.params_batch_size,
+                epochs=epochs,
+                initial_epoch=completed,
+                shuffle=True,
+                validation_data=(valid_features, valid_labels),
+                callbacks=[
+                    *self._callbacks(self.training_config.params_batch_size, phase),
+                    self.checkpointer.callback(self.model, head.optimizer, phase_index)
+                ]
+            )
+
+        # Compile the reassembled model so the saved file matches the full training mode
+        self._compile(self.model)
+
+    def _unfreeze_blocks(self, blocks: int):
+        """
+        Makes the last `blocks` blocks of the backbone trainable and freezes the rest.
+        Blocks are groups of consecutive layers sharing a name prefix, e.g. `block<N>_...` in VGG16.
+        The layers after the last block (final convolution or pooling) are unfrozen with it.
+        """
+        backbone = self.model.layers[0]
+        backbone_name = self.training_config.params_backbone
+        layer_blocks = [block_of(layer.name, backbone_name) for layer in backbone.layers]
+        block_names = list(dict.fromkeys(block for block in layer_blocks if block is not None))
+
+        unfrozen = set(block_names[-blocks:]) if blocks > 0 else set()
+        first = min((i for i, block in enumerate(layer_blocks) if block in unfrozen), default=len(layer_blocks))
+        freeze_till = len(layer_blocks) - first
+        PrepareModel.freeze_layers(backbone, freeze_all=freeze_till == 0, freeze_till=freeze_till)
+        logger.info(f"Unfroze backbone blocks {sorted(unfrozen)} ({freeze_till} layers)")
+
+    def _train_progressive(self):
+        """
+        Trains in the phases listed in FINE_TUNING_PHASES, each with its own EPOCHS, LEARNING_RATE and UNFREEZE_BLOCKS.
+        Phases with UNFREEZE_BLOCKS: 0 train the head on cached backbone features; the following phases
+        unfreeze the last blocks of the backbone and fine-tune the whole network on images.
+        The model stays in memory between phases and is only recompiled, never reloaded from disk.
+        A resumed run skips the phases finished before the latest checkpoint.
+        """
+        latest = self.checkpointer.latest()
+        resume_phase = latest[0] if latest is not None else 0
+        epoch = 0
+        backbone_changed = False
+        for index, phase in enumerate(self.training_config.params_fine_tuning_phases, start=1):
+            epochs, learning_rate, blocks = phase["EPOCHS"], phase["LEARNING_RATE"], phase["UNFREEZE_BLOCKS"]
+            if blocks == 0 and backbone_changed:
+                raise ValueError("Head-only phases (UNFREEZE_BLOCKS: 0) must come before fine-tuning phases.")
+            if index < resume_phase:
+                logger.info(f"Phase {index}: already completed, skipping")
+            elif blocks == 0:
+                logger.info(f"Phase {index}: {epochs} epochs at learning rate {learning_rate}, head only")
+                self._train_cached_features(
+                    epochs=epochs, learning_rate=learning_rate, phase=f"progressive-{index}", phase_index=index
+                )
+            else:
+                logger.info(f"Phase {index}: {epochs} epochs at learning rate {learning_rate}, {blocks} unfrozen blocks")
+                self._unfreeze_blocks(blocks)
+                self._train_full(
+                    epochs=epochs, learning_rate=learning_rate, initial_epoch=epoch,
+                    phase=f"progressive-{index}", phase_index=index
+                )
+            backbone_changed = backbone_changed or blocks > 0
+            epoch += epochs
@@ -3,14 +3,60 @@ This module contains the ConfigurationManager class, which is responsible for ma
 It reads the configuration and parameters from YAML files and provides methods to access them.
 It uses the `read_yaml` function to read the YAML files and the `create_directories` function to create necessary directories.
 It also defines the `ConfigurationManager` class, which provides methods to get the data ingestion and model preparation configurations.
+Every configuration object is built and validated once and memoized until config.yaml or params.yaml changes on disk
+(the sweep configuration also until its specification changes), and values can be overridden from environment
+variables or the command line.
 """
 
 import os
+import functools
 from pathlib import Path
+from dataclasses import fields
+import yaml
 from Chest_Cancer_Classification.constants import *
 from Chest_Cancer_Classification.entity.config_entity import *
 from Chest_Cancer_Classification.utils.common import read_yaml, create_directories
 
+# Environment variables such as CHEST_CANCER__params__LEARNING_RATE=0.001 override params.LEARNING_RATE
+ENV_OVERRIDE_PREFIX = "CHEST_CANCER__"
+
+
+def _validate(entity):
+    """
+    Checks that every field of a configuration entity has the type declared in its dataclass.
+    Integers are accepted for float fields and None for string fields (optional values).
+    """
+    for field_ in fields(entity):
+        value = getattr(entity, field_.name)
+        if field_.type is float:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        elif field_.type is int:
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        elif field_.type is str:
+            valid = value is None or isinstance(value, str)
+        else:
+            valid = isinstance(value, field_.type)
+        if not valid:
+            raise TypeError(
+                f"{type(entity).__name__}.{field_.name} must be of type {field_.type.__name__}, got {value!r}"
+            )
+    return entity
+
+
+def _memoized(getter):
+    """
+    Caches the validated configuration object returned by a ConfigurationManager getter,
+    so that directories are created and values are checked only once per configuration version.
+    """
+    @functools.wraps(getter)
+    def wrapper(self):
+        self.reload_if_changed()
+        if getter.__name__ not in self._entities:
+            self._entities[getter.__name__] = _validate(getter(self))
+        return self._entities[getter.__name__]
+    return wrapper
+
+
 class ConfigurationManager:
     """
     This class is responsible for managing the configuration of the project.
@@ -20,11 +66,76 @@ class ConfigurationManager:
         config (dict): Configuration settings.
         params (dict): Parameters settings.
     """
-    def __init__(self, config_filepath=CONFIG_FILE_PATH, params_filepath=PARAMS_FILE_PATH):
-        self.config = read_yaml(str(config_filepath))
-        self.params = read_yaml(str(params_filepath))
+    def __init__(self, config_filepath=CONFIG_FILE_PATH, params_filepath=PARAMS_FILE_PATH, overrides: dict = None):
+        """
+        Args:
+            config_filepath (Path): Path to config.yaml.
+            params_filepath (Path): Path to params.yaml.
+            overrides (dict): Values overriding the YAML files, keyed by dotted path
+                such as "params.LEARNING_RATE" or "config.training.root_dir".
+                They take precedence over CHEST_CANCER__* environment variables.
+        """
+        self.config_filepath = str(config_filepath)
+        self.params_filepath = str(params_filepath)
+        self.overrides = {**self._env_overrides(), **(overrides or {})}
+        self._entities = {}
+        self._mtimes = None
+        self._load()
+
+    @staticmethod
+    def _env_overrides() -> dict:
+        """
+        Collects overrides from environment variables, e.g. CHEST_CANCER__params__BATCH_SIZE=32.
+        """
+        return {
+            name[len(ENV_OVERRIDE_PREFIX):].replace("__", "."): value
+            for name, value in os.environ.items()
+            if name.startswith(ENV_OVERRIDE_PREFIX)
+        }
+
+    def _file_mtimes(self) -> tuple:
+        """
+        Returns the modification times of config.yaml and params.yaml.
+        """
+        return os.stat(self.config_filepath).st_mtime_ns, os.stat(self.params_filepath).st_mtime_ns
+
+    def _load(self):
+        """
+        Reads both YAML files, applies the overrides and clears the memoized configuration objects.
+        """
+        self._mtimes = self._file_mtimes()
+        self.config = read_yaml(self.config_filepath)
+        self.params = read_yaml(self.params_filepath)
+        for key, value in self.overrides.items():
+            self._apply_override(key, value)
+        self._entities = {}
         create_directories([self.config.artifacts_root])
 
+    def reload_if_changed(self):
+        """
+        Reloads the configuration if config.yaml or params.yaml changed on disk since it was read.
+        """
+        if self._file_mtimes() != self._mtimes:
+            self._load()
+
+    def _apply_override(self, key: str, value):
+        """
+        Sets a single dotted-path override. String values are parsed as YAML, so "0.001" becomes a float.
+        """
+        root, *path = key.split(".")
+        if root not in ("config", "params") or not path:
+            raise ValueError(f"Invalid override {key}. Use 'params.<KEY>' or 'config.<section>.<key>'.")
+        if isinstance(value, str):
+            value = yaml.safe_load(value)
+
+        target = getattr(self, root)
+        for part in path[:-1]:
+            if part not in target:
+                target[part] = {}
+            target = target[part]
+        target[path[-1]] = value
+
+    @_memoized
     def get_data_ingestion_config(self) -> DataIngestionConfig:
         """
         This method is responsible for setting up the data ingestion configuration.
@@ -40,10 +151,18 @@ class ConfigurationManager:
             root_dir=Path(config.root_dir),
             source_URL=config.source_URL,
             local_data_file=Path(config.local_data_file),
-            unzip_dir=Path(config.unzip_dir)
+            unzip_dir=Path(config.unzip_dir),
+            sha256=config.get("sha256"),
+            download_chunks=config.get("download_chunks", 1),
+            extract_manifest_path=Path(config.extract_manifest),
+            extract_workers=config.extract_workers,
+            stream_to_image_cache=config.stream_to_image_cache,
+            image_cache_dir=Path(self.config.image_cache.root_dir),
+            params_image_size=self.params.IMAGE_SIZE
         )
         return data_ingestion_config
 
+    @_memoized
     def get_prepare_model_config(self) -> PrepareModelConfig:
         """
         This method is responsible for setting up the model preparation configuration.
@@ -63,10 +182,15 @@ class ConfigurationManager:
             params_learning_rate=self.params.LEARNING_RATE,
             params_include_top=self.params.INCLUDE_TOP,
             params_weights=self.params.WEIGHTS,
-            params_classes=self.params.CLASSES
+            params_classes=self.params.CLASSES,
+            params_backbone=self.params.BACKBONE,
+            params_head_pooling=self.params.HEAD_POOLING,
+            params_head_hidden_units=self.params.HEAD_HIDDEN_UNITS,
+            params_head_dropout=self.params.HEAD_DROPOUT
         )
         return prepare_model_config
     
+    @_memoized
     def get_training_config(self) -> TrainingConfig:
         """
         This method is responsible for setting up the training configuration.
@@ -88,7 +212,137 @@ class ConfigurationManager:
             params_epochs=params.EPOCHS,
             params_batch_size=params.BATCH_SIZE,
             params_is_augmentation=params.AUGMENTATION,
-            params_image_size=params.IMAGE_SIZE
+            params_image_size=params.IMAGE_SIZE,
+            params_data_pipeline=params.DATA_PIPELINE,
+            params_num_parallel_calls=params.NUM_PARALLEL_CALLS,
+            params_deterministic=params.DETERMINISTIC,
+            image_cache_dir=Path(self.config.image_cache.root_dir),
+            params_use_image_cache=params.IMAGE_CACHE,
+            extract_manifest_path=Path(self.config.data_ingestion.extract_manifest),
+            stream_to_image_cache=self.config.data_ingestion.stream_to_image_cache,
+            local_data_file=Path(self.config.data_ingestion.local_data_file),
+            features_dir=Path(training.features_dir),
+            params_training_mode=params.TRAINING_MODE,
+            params_feature_augment_passes=params.FEATURE_AUGMENT_PASSES,
+            params_mixed_precision=params.MIXED_PRECISION,
+            params_jit_compile=params.JIT_COMPILE,
+            params_num_workers=params.NUM_WORKERS,
+            params_fine_tuning_phases=params.FINE_TUNING_PHASES,
+            params_backbone=params.BACKBONE,
+            metrics_log_path=Path(training.metrics_log_path),
+            profile_dir=Path(training.profile_dir),
+            params_profile=params.PROFILE,
+            params_profile_batches=params.PROFILE_BATCHES,
+            checkpoint_dir=Path(training.checkpoint_dir),
+            params_checkpoint_every_epochs=params.CHECKPOINT_EVERY_EPOCHS,
+            params_checkpoint_keep=params.CHECKPOINT_KEEP,
+            params_augmentation_config=params.AUGMENTATION_CONFIG,
+            params_unfreeze_blocks=params.UNFREEZE_BLOCKS
         )
 
         return training_config
+
+    @_memoized
+    def get_prediction_config(self) -> PredictionConfig:
+        """
+        This method is responsible for setting up the prediction configuration.
+        It points to the trained model and the directory of served model versions, and prepares the batching,
+        caching and model residency parameters for serving.
+        Returns:
+            PredictionConfig: The prediction configuration object.
+        """
+        params = self.params
+        training_data = os.path.join(self.config.data_ingestion.unzip_dir, "Chest-CT-Scan-data")
+
+        prediction_config = PredictionConfig(
+            trained_model_path=Path(self.config.training.trained_model_path),
+            training_data=Path(training_data),
+            params_image_size=params.IMAGE_SIZE,
+            params_classes=params.CLASSES,
+            params_max_batch_size=params.MAX_BATCH_SIZE,
+            params_max_wait_ms=params.MAX_WAIT_MS,
+            params_backbone=params.BACKBONE,
+            prediction_cache_path=Path(self.config.prediction_cache.path),
+            params_cache_size=params.PREDICTION_CACHE_SIZE,
+            params_cache_ttl_s=params.PREDICTION_CACHE_TTL_S,
+            params_cache_disk=params.PREDICTION_CACHE_DISK,
+            params_cache_disk_size=params.PREDICTION_CACHE_DISK_SIZE,
+            models_dir=Path(self.config.model_registry.models_dir),
+            params_max_resident_models=params.MAX_RESIDENT_MODELS,
+            params_max_resident_memory_mb=params.MAX_RESIDENT_MEMORY_MB,
+            params_model_traffic=params.MODEL_TRAFFIC,
+            params_predict_buckets=params.PREDICT_BUCKETS,
+            params_jit_compile=params.JIT_COMPILE
+        )
+
+        return prediction_config
+
+    @_memoized
+    def get_model_export_config(self) -> ModelExportConfig:
+        """
+        This method is responsible for setting up the model export configuration.
+        It creates the necessary directories and prepares the configuration for model export.
+        Returns:
+            ModelExportConfig: The model export configuration object.
+        """
+        config = self.config.model_export
+        create_directories([config.root_dir])
+
+        model_export_config = ModelExportConfig(
+            root_dir=Path(config.root_dir),
+            trained_model_path=Path(self.config.training.trained_model_path),
+            saved_model_path=Path(config.saved_model_path),
+            tflite_float16_path=Path(config.tflite_float16_path),
+            tflite_int8_path=Path(config.tflite_int8_path),
+            report_path=Path(config.report_path),
+            params_image_size=self.params.IMAGE_SIZE,
+            params_benchmark_runs=self.params.EXPORT_BENCHMARK_RUNS
+        )
+        return model_export_config
+
+    def _sweep_spec_path(self) -> Path:
+        """
+        Returns the path of the sweep specification. A relative path is resolved against the directory of
+        config.yaml, so it does not depend on the working directory.
+        """
+        return Path(self.config_filepath).parent / self.config.sweep.spec_path
+
+    def get_sweep_config(self) -> SweepConfig:
+        """
+        Returns the memoized sweep configuration, rebuilt when the sweep specification changes on disk.
+        Only the sweep reads the specification, so it is not watched by `reload_if_changed`.
+        """
+        self.reload_if_changed()
+        spec_mtime = os.stat(self._sweep_spec_path()).st_mtime_ns
+        if self._entities.get("sweep_spec_mtime") != spec_mtime:
+            self._entities.pop("_get_sweep_config", None)
+            self._entities["sweep_spec_mtime"] = spec_mtime
+        return self._get_sweep_config()
+
+    @_memoized
+    def _get_sweep_config(self) -> SweepConfig:
+        """
+        This method is responsible for setting up the hyperparameter sweep configuration.
+        It reads the sweep specification and creates the output directory of the sweep.
+        Returns:
+            SweepConfig: The sweep configuration object.
+        """
+        config = self.config.sweep
+        spec = read_yaml(self._sweep_spec_path())
+        root_dir = Path(config.root_dir) / spec.name
+        create_directories([root_dir])
+
+        sweep_config = SweepConfig(
+            root_dir=root_dir,
+            name=spec.name,
+            method=spec.method,
+            trials=spec.trials,
+            seed=spec.seed,
+            parallel=spec.parallel,
+            metric=spec.metric,
+            direction=spec.direction,
+            warmup_epochs=spec.pruning.warmup_epochs,
+            min_trials=spec.pruning.min_trials,
+            parameters=dict(spec.parameters)
+        )
+        return sweep_config
@@ -17,3 +17,5 @@ PROJECT_ROOT = find_project_root()
 CONFIG_FILE_PATH = PROJECT_ROOT / "config/config.yaml"
 PARAMS_FILE_PATH = PROJECT_ROOT / "params.yaml"
 
+# Image file extensions accepted in the dataset (same as `keras.preprocessing.image.DirectoryIterator`)
+WHITE_LIST_FORMATS = ("png", "jpg", "jpeg", "bmp", "ppm", "tif", "tiff")
@@ -15,6 +15,13 @@ class DataIngestionConfig:
     source_URL: str
     local_data_file: Path
     unzip_dir: Path
+    sha256: str
+    download_chunks: int
+    extract_manifest_path: Path
+    extract_workers: int
+    stream_to_image_cache: bool
+    image_cache_dir: Path
+    params_image_size: list
 
 
 @dataclass(frozen=True)
@@ -30,6 +37,10 @@ class PrepareModelConfig:
     params_include_top: bool
     params_weights: str
     params_classes: int
+    params_backbone: str
+    params_head_pooling: str
+    params_head_hidden_units: int
+    params_head_dropout: float
 
 
 @dataclass(frozen=True)
@@ -45,4 +56,87 @@ class TrainingConfig:
     params_batch_size: int
     params_is_augmentation: bool
     params_image_size: list
+    params_data_pipeline: str
+    params_num_parallel_calls: int
+    params_deterministic: bool
+    image_cache_dir: Path
+    params_use_image_cache: bool
+    extract_manifest_path: Path
+    stream_to_image_cache: bool
+    local_data_file: Path
+    features_dir: Path
+    params_training_mode: str
+    params_feature_augment_passes: int
+    params_mixed_precision: str
+    params_jit_compile: bool
+    params_num_workers: int
+    params_fine_tuning_phases: list
+    params_backbone: str
+    metrics_log_path: Path
+    profile_dir: Path
+    params_profile: bool
+    params_profile_batches: list
+    checkpoint_dir: Path
+    params_checkpoint_every_epochs: int
+    params_checkpoint_keep: int
+    params_augmentation_config: dict
+    params_unfreeze_blocks: int
+
+
+
+@dataclass(frozen=True)
+class PredictionConfig:
+    """
+    Prediction Configuration
+    """
+    trained_model_path: Path
+    training_data: Path
+    params_image_size: list
+    params_classes: int
+    params_max_batch_size: int
+    params_max_wait_ms: float
+    params_backbone: str
+    prediction_cache_path: Path
+    params_cache_size: int
+    params_cache_ttl_s: float
+    params_cache_disk: bool
+    params_cache_disk_size: int
+    models_dir: Path
+    params_max_resident_models: int
+    params_max_resident_memory_mb: float
+    params_model_traffic: dict
+    params_predict_buckets: list
+    params_jit_compile: bool
+
 
+@dataclass(frozen=True)
+class ModelExportConfig:
+    """
+    Model Export Configuration
+    """
+    root_dir: Path
+    trained_model_path: Path
+    saved_model_path: Path
+    tflite_float16_path: Path
+    tflite_int8_path: Path
+    report_path: Path
+    params_image_size: list
+    params_benchmark_runs: int
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """
+    Hyperparameter Sweep Configuration
+    """
+    root_dir: Path
+    name: str
+    method: str
+    trials: int
+    seed: int
+    parallel: int
+    metric: str
+    direction: str
+    warmup_epochs: int
+    min_trials: int
+    parameters: dict
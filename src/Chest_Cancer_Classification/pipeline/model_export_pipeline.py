@@ -0,0 +1,32 @@
+"""
+This module defines the ModelExportPipeline class, which is responsible for exporting the trained model.
+It writes inference-only artifacts (SavedModel and quantized TFLite models) and a benchmark report.
+"""
+
+from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
+
+class ModelExportPipeline:
+    """
+    This class is responsible for exporting the trained model.
+    It converts the trained model into inference-only formats and benchmarks them against the .h5 file.
+    """
+    def __init__(self, config: ConfigurationManager):
+        """
+        Initializes the ModelExportPipeline class.
+        This class is responsible for exporting the trained model.
+        """
+        self.config = config
+
+    def main(self):
+        """
+        Main method to execute the model export pipeline.
+        It loads the trained model, exports it and writes the benchmark report.
+        """
+        # Imported here so that TensorFlow is only loaded when the stage actually runs
+        from src.Chest_Cancer_Classification.components.model_export import ModelExport
+        model_export_config = self.config.get_model_export_config()
+        model_export = ModelExport(config=model_export_config)
+        model_export.get_model()
+        model_export.export_saved_model()
+        model_export.export_tflite()
+        model_export.benchmark()
@@ -0,0 +1,73 @@
+"""
+This module contains the PredictionPipeline class, which serves predictions from the trained models.
+Model versions are loaded on demand by the ModelRegistry and shared by every request; concurrent requests for a
+version are grouped into micro-batches by its DynamicBatcher before reaching the model. Images already scored by
+the same model are answered from the prediction cache, without loading the model.
+"""
+
+import numpy as np
+from Chest_Cancer_Classification.config.configuration import ConfigurationManager
+from Chest_Cancer_Classification.components.backbones import preprocess_input
+from Chest_Cancer_Classification.components.model_registry import ModelRegistry
+from Chest_Cancer_Classification.components.prediction_cache import PredictionCache
+from Chest_Cancer_Classification.utils.common import ImageBase64Handler, get_class_names
+
+
+class PredictionPipeline:
+    """
+    This class is responsible for predicting the class of base64 encoded chest CT images.
+    Every model version is expected to share the IMAGE_SIZE, BACKBONE and classes of the configuration.
+    """
+    def __init__(self, config: ConfigurationManager):
+        """
+        Initializes the PredictionPipeline class. Models are loaded by their first request.
+        Args:
+            config (ConfigurationManager): Configuration manager of the project.
+        """
+        self.config = config.get_prediction_config()
+        self.registry = ModelRegistry(self.config)
+        self.cache = PredictionCache.from_config(self.config)
+        self.class_names = get_class_names(self.config.training_data, self.config.params_classes)
+
+    def decode(self, imgstring: str) -> np.ndarray:
+        """
+        Decodes a base64 image and resizes it to the model input size.
+        Args:
+            imgstring (str): Base64 encoded image, as produced by `ImageBase64Handler.encode_image_into_base64`.
+        Returns:
+            np.ndarray: Uint8 image of shape IMAGE_SIZE.
+        """
+        return ImageBase64Handler.decode_image_to_array(imgstring, self.config.params_image_size, "uint8")
+
+    def preprocess(self, image: np.ndarray) -> np.ndarray:
+        """
+        Applies the preprocessing of the backbone to a decoded image, like the training pipeline.
+        Args:
+            image (np.ndarray): Uint8 image returned by `decode`.
+        Returns:
+            np.ndarray: Preprocessed float32 image of shape IMAGE_SIZE.
+        """
+        return preprocess_input(image.astype(np.float32), self.config.params_backbone)
+
+    def predict(self, imgstring: str, version: str = None) -> dict:
+        """
+        Predicts the class of a single base64 encoded image.
+        Args:
+            imgstring (str): Base64 encoded image.
+            version (str): Model version to use; by default it is drawn from MODEL_TRAFFIC, or is the trained model.
+        Returns:
+            dict: The predicted class name, the probability of every class and the model version that served it.
+        """
+        version = self.registry.resolve(version)
+        image = self.decode(imgstring)
+        key = self.cache.key(image, self.registry.file_version(version))
+        probabilities = self.cache.get(key)
+        if probabilities is None:
+            with self.registry.acquire(version) as served:
+                probabilities = served.batcher.predict(self.preprocess(image))
+            self.cache.put(key, probabilities)
+        return {
+            "prediction": self.class_names[int(np.argmax(probabilities))],
+            "probabilities": dict(zip(self.class_names, map(float, probabilities))),
+            "model_version": version
+        }
@@ -4,7 +4,6 @@ It loads a pre-trained model, modifies it for the specific task, and saves the u
 """
 
 from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
-from src.Chest_Cancer_Classification.components.prepare_model import PrepareModel
 
 class PrepareModelTrainingPipeline:
     """
@@ -23,6 +22,8 @@ class PrepareModelTrainingPipeline:
         Main method to execute the model preparation pipeline.
         It loads the base model, modifies it for the specific task, and saves the updated model.
         """
+        # Imported here so that TensorFlow is only loaded when the stage actually runs
+        from src.Chest_Cancer_Classification.components.prepare_model import PrepareModel
         prepare_model_config = self.config.get_prepare_model_config()
         prepare_model = PrepareModel(config=prepare_model_config)
         prepare_model.get_model()
@@ -0,0 +1,274 @@
+"""
+This module contains the StageRunner class, which runs the pipeline stages and skips the ones that are up to date.
+Like `dvc repro`, every stage declares the config.yaml sections and params.yaml keys it reads, the artifacts it
+depends on and the artifacts it produces. A stage is skipped when its outputs exist and neither its inputs nor
+its outputs changed since its last successful run. Files are fingerprinted by path, size and modification time,
+which is cheap even for large archives and models.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from dataclasses import dataclass, field
+from Chest_Cancer_Classification import logger
+from Chest_Cancer_Classification.config.configuration import ConfigurationManager
+from Chest_Cancer_Classification.utils.artifacts import artifacts
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    Pipeline Stage Definition
+    """
+    name: str
+    title: str
+    pipeline: str
+    config_keys: list = field(default_factory=list)
+    params_keys: list = field(default_factory=list)
+    deps: list = field(default_factory=list)
+    outs: list = field(default_factory=list)
+
+
+def build_stages(config: ConfigurationManager) -> list:
+    """
+    Declares the stages of the pipeline, in execution order.
+    Args:
+        config (ConfigurationManager): Configuration manager of the project.
+    Returns:
+        list: The pipeline stages.
+    """
+    data_ingestion = config.config.data_ingestion
+    prepare_model = config.config.prepare_model
+    training = config.config.training
+    model_export = config.config.model_export
+    training_data = os.path.join(data_ingestion.unzip_dir, "Chest-CT-Scan-data")
+
+    return [
+        Stage(
+            name="data_ingestion",
+            title="Data Ingestion",
+            pipeline="Chest_Cancer_Classification.pipeline.data_ingestion_pipeline.DataIngestionPipeline",
+            config_keys=["data_ingestion", "image_cache"],
+            params_keys=["IMAGE_SIZE"],
+            outs=[data_ingestion.local_data_file, data_ingestion.extract_manifest]
+        ),
+        Stage(
+            name="prepare_model",
+            title="Prepare Model",
+            pipeline="Chest_Cancer_Classification.pipeline.prepare_model_pipeline.PrepareModelTrainingPipeline",
+            config_keys=["prepare_model"],
+            params_keys=[
+                "IMAGE_SIZE", "INCLUDE_TOP", "WEIGHTS", "CLASSES", "LEARNING_RATE", "BACKBONE",
+                "HEAD_POOLING", "HEAD_HIDDEN_UNITS", "HEAD_DROPOUT"
+            ],
+            outs=[prepare_model.model_path, prepare_model.updated_model_path]
+        ),
+        Stage(
+            name="training",
+            title="Model Training",
+            pipeline="Chest_Cancer_Classification.pipeline.training_pipeline.ModelTrainingPipeline",
+            config_keys=["training", "image_cache"],
+            params_keys=[
+                "AUGMENTATION", "AUGMENTATION_CONFIG", "IMAGE_SIZE", "BATCH_SIZE", "EPOCHS", "LEARNING_RATE", "DATA_PIPELINE",
+                "NUM_PARALLEL_CALLS", "DETERMINISTIC", "IMAGE_CACHE", "TRAINING_MODE", "UNFREEZE_BLOCKS", "FEATURE_AUGMENT_PASSES",
+                "MIXED_PRECISION", "JIT_COMPILE", "NUM_WORKERS",
+                "FINE_TUNING_PHASES", "BACKBONE"
+            ],
+            deps=[prepare_model.updated_model_path, training_data, data_ingestion.extract_manifest],
+            outs=[training.trained_model_path]
+        ),
+        Stage(
+            name="model_export",
+            title="Model Export",
+            pipeline="Chest_Cancer_Classification.pipeline.model_export_pipeline.ModelExportPipeline",
+            config_keys=["model_export"],
+            params_keys=["IMAGE_SIZE", "EXPORT_BENCHMARK_RUNS"],
+            deps=[training.trained_model_path],
+            outs=[
+                model_export.saved_model_path, model_export.tflite_float16_path,
+                model_export.tflite_int8_path, model_export.report_path
+            ]
+        )
+    ]
+
+
+class StageRunner:
+    """
+    This class is responsible for running the pipeline stages in order, skipping the ones that are up to date.
+    The fingerprints of the last successful run of every stage are stored in a JSON state file.
+    """
+    def __init__(self, config: ConfigurationManager, stages: list = None):
+        """
+        Initializes the StageRunner class.
+        Args:
+            config (ConfigurationManager): Configuration manager of the project.
+            stages (list): Stages to run, defaults to `build_stages(config)`.
+        """
+        self.config = config
+        self.stages = stages if stages is not None else build_stages(config)
+        self.state_path = Path(config.config.stage_runner.state_path)
+        self.state = self._load_state()
+
+    def _load_state(self) -> dict:
+        """
+        Loads the fingerprints of the last successful runs, or an empty dict.
+        """
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self):
+        """
+        Writes the state file atomically, so an interrupted run never leaves it half written.
+        """
+        os.makedirs(self.state_path.parent, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=4)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _stamp(path: str):
+        """
+        Returns the (size, mtime) stamp of a file, of every file in a directory, or None if it does not exist.
+        """
+        path = Path(path)
+        if path.is_file():
+            stat = path.stat()
+            return [stat.st_size, stat.st_mtime_ns]
+        if path.is_dir():
+            return sorted(
+                [str(f.relative_to(path)), f.stat().st_size, f.stat().st_mtime_ns]
+                for f in path.rglob("*") if f.is_file()
+            )
+        return None
+
+    @staticmethod
+    def _digest(value) -> str:
+        """
+        Returns the SHA-256 of a JSON-serializable value.
+        """
+        return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def fingerprint(self, stage: Stage) -> dict:
+        """
+        Computes the fingerprints of a stage's inputs and outputs.
+        Args:
+            stage (Stage): The stage.
+        Returns:
+            dict: The "inputs" and "outputs" digests.
+        """
+        inputs = {
+            "config": {key: self.config.config.get(key) for key in stage.config_keys},
+            "params": {key: self.config.params.get(key) for key in stage.params_keys},
+            "deps": {str(dep): self._stamp(dep) for dep in stage.deps}
+        }
+        outputs = {str(out): self._stamp(out) for out in stage.outs}
+        return {"inputs": self._digest(inputs), "outputs": self._digest(outputs)}
+
+    def status(self, stage: Stage) -> str:
+        """
+        Returns why the stage has to run, or None if it is up to date.
+        """
+        if any(not os.path.exists(out) for out in stage.outs):
+            return "missing outputs"
+        recorded = self.state.get(stage.name)
+        if recorded is None:
+            return "never run"
+        current = self.fingerprint(stage)
+        if recorded["inputs"] != current["inputs"]:
+            return "inputs changed"
+        if recorded["outputs"] != current["outputs"]:
+            return "outputs changed"
+        return None
+
+    def plan(self, force: bool = False, from_stage: str = None) -> list:
+        """
+        Decides which stages run.
+        Stages before `from_stage` are left out; `from_stage` and the stages after it are forced.
+        Returns:
+            list: (stage, reason) pairs, where reason is None for stages that are skipped.
+        """
+        names = [stage.name for stage in self.stages]
+        if from_stage is not None and from_stage not in names:
+            raise ValueError(f"Unknown stage {from_stage}. Available stages: {', '.join(names)}")
+        start = names.index(from_stage) if from_stage is not None else 0
+
+        plan = []
+        for index, stage in enumerate(self.stages):
+            if index < start:
+                continue
+            if force or from_stage is not None:
+                plan.append((stage, "forced"))
+            else:
+                plan.append((stage, self.status(stage)))
+        return plan
+
+    def _record(self, stages: list):
+        """
+        Waits for the background writes of the artifacts, then records the fingerprints of the stages that ran.
+        """
+        artifacts.flush()
+        for stage in stages:
+            self.state[stage.name] = self.fingerprint(stage)
+        if stages:
+            self._save_state()
+
+    @staticmethod
+    def _load_pipeline(path: str):
+        """
+        Imports a pipeline class from its dotted path.
+        """
+        module_name, class_name = path.rsplit(".", 1)
+        module = __import__(module_name, fromlist=[class_name])
+        return getattr(module, class_name)
+
+    def run(self, force: bool = False, from_stage: str = None, dry_run: bool = False) -> list:
+        """
+        Runs the stages that are out of date (or forced) in order.
+        A stage that runs also runs every later stage that depends on its outputs.
+        Stages hand live models to each other through the artifact registry while their files are written in the
+        background, so the fingerprints are recorded once the writes are flushed: after the last stage, or when
+        a stage fails. A failed write is raised after a successful run, but only logged when a stage failed,
+        so that it never hides the error of the stage.
+        Args:
+            force (bool): Run every stage regardless of its state.
+            from_stage (str): Name of the first stage to run; it and every later stage are forced.
+            dry_run (bool): Only report what would run.
+        Returns:
+            list: Names of the stages that ran (or would run, in a dry run).
+        """
+        executed, completed, rewritten = [], [], set()
+        try:
+            for stage, reason in self.plan(force=force, from_stage=from_stage):
+                # An upstream stage that ran (or would run) may have changed this stage's dependencies
+                if reason is None and rewritten.intersection(str(dep) for dep in stage.deps):
+                    reason = "upstream changed"
+                if reason is None:
+                    logger.info(f"Stage {stage.name}: up to date, skipping")
+                    continue
+                rewritten.update(str(out) for out in stage.outs)
+                if dry_run:
+                    logger.info(f"Stage {stage.name}: would run ({reason})")
+                    executed.append(stage.name)
+                    continue
+
+                logger.info(f"{'>>'*20} Stage {stage.name}: {stage.title} ({reason}) {'<<'*20}")
+                pipeline = self._load_pipeline(stage.pipeline)(config=self.config)
+                pipeline.main()
+                completed.append(stage)
+                executed.append(stage.name)
+                logger.info(f"{stage.title} Pipeline completed successfully.")
+        except BaseException:
+            try:
+                self._record(completed)
+            except Exception as e:
+                logger.error(f"Fingerprints of the completed stages were not recorded: {e}")
+            raise
+        else:
+            self._record(completed)
+        finally:
+            artifacts.discard()
+        return executed
@@ -0,0 +1,282 @@
+"""
+This module contains the SweepRunner class, which runs a hyperparameter sweep over params.yaml.
+The sweep specification (config/sweep.yaml) lists values for dotted configuration keys; it is expanded into a grid
+or a random sample of trials, each of which is a set of `ConfigurationManager` overrides. Trials train in a pool
+of processes, each limited to its share of the CPU threads, and read the same image cache, which is built once
+before the sweep starts. Trials reporting a validation metric below the median of the other trials at the same
+epoch are pruned, and a leaderboard of all trials is written as they finish.
+"""
+
+import os
+import json
+import math
+import time
+import random
+import itertools
+import statistics
+import multiprocessing as mp
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from Chest_Cancer_Classification import logger
+from Chest_Cancer_Classification.config.configuration import ConfigurationManager
+from Chest_Cancer_Classification.pipeline.stage_runner import StageRunner, build_stages
+
+
+class TrialPruned(Exception):
+    """
+    Raised by the pruning callback to stop a trial that performs worse than the other trials.
+    """
+
+
+def _median_pruner(trial_id: str, history, metric: str, direction: str, warmup_epochs: int, min_trials: int):
+    """
+    Builds the Keras callback reporting a trial's metric after every epoch and pruning the trial when the
+    metric is worse than the median of the other trials at the same epoch.
+    Args:
+        trial_id (str): Identifier of the trial.
+        history: Dict shared between the trial processes, mapping trial ids to their reported metrics.
+        metric (str): Name of the metric in the Keras logs, e.g. "val_accuracy".
+        direction (str): "maximize" or "minimize".
+        warmup_epochs (int): Number of epochs before a trial can be pruned.
+        min_trials (int): Number of other trials that must have reported the epoch.
+    """
+    from tensorflow import keras
+
+    class MedianPruner(keras.callbacks.Callback):
+        def on_epoch_end(self, epoch, logs=None):
+            value = (logs or {}).get(metric)
+            if value is None:
+                return
+            # Progressive training restarts the Keras epoch count every phase, so reports are counted instead
+            scores = history.get(trial_id, []) + [float(value)]
+            history[trial_id] = scores
+            step = len(scores) - 1
+            peers = [other[step] for other_id, other in history.items() if other_id != trial_id and len(other) > step]
+            if len(scores) < warmup_epochs or len(peers) < min_trials:
+                return
+            median = statistics.median(peers)
+            if (value < median) if direction == "maximize" else (value > median):
+                raise TrialPruned(f"{metric} {value:.4f} worse than median {median:.4f} of {len(peers)} trials at epoch {step + 1}")
+
+    return MedianPruner()
+
+
+def _init_worker(threads: int):
+    """
+    Limits the threads of a trial process, before TensorFlow creates its thread pools.
+    """
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(min(threads, 2))
+
+
+def _run_trial(trial: dict, overrides: dict, history, pruning: dict) -> dict:
+    """
+    Trains one trial in a worker process.
+    Args:
+        trial (dict): The trial id, its parameters and whether it prepares its own model.
+        overrides (dict): Configuration overrides of the trial.
+        history: Dict shared between the trial processes for pruning.
+        pruning (dict): Arguments of the pruning callback.
+    Returns:
+        dict: The result of the trial.
+    """
+    from Chest_Cancer_Classification.components.prepare_model import PrepareModel
+    from Chest_Cancer_Classification.components.trainer import Trainer
+
+    start = time.perf_counter()
+    status, error = "completed", None
+    try:
+        config = ConfigurationManager(overrides=overrides)
+        if trial["prepare_model"]:
+            prepare_model = PrepareModel(config=config.get_prepare_model_config())
+            prepare_model.get_model()
+            prepare_model.update_model()
+        trainer = Trainer(config=config, callbacks=[_median_pruner(trial["id"], history, **pruning)])
+        trainer.train()
+    except TrialPruned as e:
+        status, error = "pruned", str(e)
+    except Exception as e:
+        status, error = "failed", f"{type(e).__name__}: {e}"
+
+    return {
+        "trial": trial["id"],
+        "params": trial["params"],
+        "status": status,
+        "history": list(history.get(trial["id"], [])),
+        "duration_s": round(time.perf_counter() - start, 1),
+        "error": error
+    }
+
+
+class SweepRunner:
+    """
+    This class is responsible for expanding a sweep specification into trials, running them in parallel
+    and writing the leaderboard.
+    """
+    def __init__(self, config: ConfigurationManager):
+        """
+        Initializes the SweepRunner class.
+        Args:
+            config (ConfigurationManager): Configuration manager of the project; its overrides apply to every trial.
+        """
+        self.config = config
+        self.sweep_config = config.get_sweep_config()
+        self.leaderboard_path = self.sweep_config.root_dir / "leaderboard.json"
+        self.stages = {stage.name: stage for stage in build_stages(config)}
+
+    def _sample(self, values, rng: random.Random):
+        """
+        Samples a value for random search: a choice from a list, or a uniform (optionally log-uniform)
+        value from a {low, high, log} range.
+        """
+        if isinstance(values, list):
+            return rng.choice(values)
+        low, high = values["low"], values["high"]
+        if isinstance(low, int) and isinstance(high, int) and not values.get("log"):
+            return rng.randint(low, high)
+        if values.get("log"):
+            return float(10 ** rng.uniform(math.log10(low), math.log10(high)))
+        return rng.uniform(low, high)
+
+    def trials(self) -> list:
+        """
+        Expands the sweep specification into trials.
+        Returns:
+            list: Trials with their id, parameters (dotted overrides) and whether they prepare their own model.
+        """
+        parameters = self.sweep_config.parameters
+        keys = list(parameters)
+        if self.sweep_config.method == "grid":
+            combinations = [dict(zip(keys, values)) for values in itertools.product(*parameters.values())]
+        elif self.sweep_config.method == "random":
+            rng = random.Random(self.sweep_config.seed)
+            combinations = [
+                {key: self._sample(parameters[key], rng) for key in keys}
+                for _ in range(self.sweep_config.trials)
+            ]
+        else:
+            raise ValueError(f"Invalid sweep method {self.sweep_config.method}. Use 'grid' or 'random'.")
+
+        # The Trainer recompiles with its own learning rate, so only the other prepare_model params need a new model
+        prepare_keys = {f"params.{key}" for key in self.stages["prepare_model"].params_keys} - {"params.LEARNING_RATE"}
+        return [
+            {
+                "id": f"trial_{index:03d}",
+                "params": params,
+                "prepare_model": bool(prepare_keys.intersection(params))
+            }
+            for index, params in enumerate(combinations)
+        ]
+
+    def _overrides(self, trial: dict, threads: int) -> dict:
+        """
+        Builds the configuration overrides of a trial: its parameters, a thread budget and its own output paths.
+        """
+        trial_dir = self.sweep_config.root_dir / trial["id"]
+        overrides = {
+            **self.config.overrides,
+            **trial["params"],
+            "params.NUM_WORKERS": 1,
+            "params.NUM_PARALLEL_CALLS": threads,
+            "config.training.root_dir": str(trial_dir),
+            "config.training.trained_model_path": str(trial_dir / "model.h5"),
+            "config.training.features_dir": str(trial_dir / "features"),
+            "config.training.metrics_log_path": str(trial_dir / "training_log.jsonl"),
+            "config.training.profile_dir": str(trial_dir / "profile"),
+            "config.training.checkpoint_dir": str(trial_dir / "checkpoints")
+        }
+        if trial["prepare_model"]:
+            overrides.update({
+                "config.prepare_model.root_dir": str(trial_dir),
+                "config.prepare_model.model_path": str(trial_dir / "base_model.h5"),
+                "config.prepare_model.updated_model_path": str(trial_dir / "updated_model.h5")
+            })
+        return overrides
+
+    def prepare(self, trials: list):
+        """
+        Brings the data ingestion and model preparation stages up to date and builds the image cache
+        of every image size used by the trials, so that the trials share them instead of racing to build them.
+        """
+        StageRunner(self.config, stages=[self.stages["data_ingestion"], self.stages["prepare_model"]]).run()
+
+        if not self.config.params.IMAGE_CACHE:
+            return
+        from Chest_Cancer_Classification.components.data_pipeline import DataPipeline
+        image_sizes = {json.dumps(trial["params"].get("params.IMAGE_SIZE")) for trial in trials}
+        for image_size in image_sizes:
+            overrides = {**self.config.overrides}
+            if image_size != "null":
+                overrides["params.IMAGE_SIZE"] = json.loads(image_size)
+            DataPipeline(config=ConfigurationManager(overrides=overrides).get_training_config()).prepare_cache()
+
+    def _write_leaderboard(self, results: list):
+        """
+        Writes the trials ranked by their best metric (trials without a metric last), atomically.
+        """
+        maximize = self.sweep_config.direction == "maximize"
+        for result in results:
+            history = result["history"]
+            result["best"] = (max(history) if maximize else min(history)) if history else None
+        ranked = sorted(
+            results,
+            key=lambda result: (result["best"] is None, -(result["best"] or 0) if maximize else (result["best"] or 0))
+        )
+        leaderboard = {
+            "sweep": self.sweep_config.name,
+            "metric": self.sweep_config.metric,
+            "direction": self.sweep_config.direction,
+            "trials": ranked
+        }
+        tmp_path = self.leaderboard_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(leaderboard, f, indent=4)
+        os.replace(tmp_path, self.leaderboard_path)
+
+    def run(self) -> list:
+        """
+        Runs every trial of the sweep and writes the leaderboard after each finished trial.
+        Returns:
+            list: The trial results, best first.
+        """
+        trials = self.trials()
+        parallel = max(1, min(self.sweep_config.parallel, len(trials)))
+        threads = max(1, (os.cpu_count() or 1) // parallel)
+        logger.info(f"Sweep {self.sweep_config.name}: {len(trials)} trials, {parallel} in parallel with {threads} threads each")
+        self.prepare(trials)
+
+        pruning = {
+            "metric": self.sweep_config.metric,
+            "direction": self.sweep_config.direction,
+            "warmup_epochs": self.sweep_config.warmup_epochs,
+            "min_trials": self.sweep_config.min_trials
+        }
+        # TensorFlow is not fork-safe: trial processes are spawned
+        context = mp.get_context("spawn")
+        results = []
+        with context.Manager() as manager:
+            history = manager.dict()
+            with ProcessPoolExecutor(max_workers=parallel, mp_context=context,
+                                     initializer=_init_worker, initargs=(threads,)) as pool:
+                futures = {
+                    pool.submit(_run_trial, trial, self._overrides(trial, threads), history, pruning): trial
+                    for trial in trials
+                }
+                for future in as_completed(futures):
+                    trial = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # The trial process itself died (e.g. out of memory)
+                        result = {"trial": trial["id"], "params": trial["params"], "status": "failed",
+                                  "history": list(history.get(trial["id"], [])), "duration_s": None,
+                                  "error": f"{type(e).__name__}: {e}"}
+                    logger.info(f"{result['trial']} {result['status']}: {result['params']}")
+                    results.append(result)
+                    self._write_leaderboard(results)
+
+        self._write_leaderboard(results)
+        logger.info(f"Leaderboard written to {self.leaderboard_path}")
+        return json.loads(Path(self.leaderboard_path).read_text(encoding="utf-8"))["trials"]
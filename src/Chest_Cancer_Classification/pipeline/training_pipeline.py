@@ -4,8 +4,8 @@ It initializes the model, sets up data generators for training and validation,
 and provides methods to train the model and save it to a specified path.
 """
 
+import os
 from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
-from src.Chest_Cancer_Classification.components.trainer import Trainer
 
 class ModelTrainingPipeline:
     """
@@ -24,6 +24,29 @@ class ModelTrainingPipeline:
         """
         Main method to execute the model training pipeline.
         It loads the model, sets up data generators, and trains the model.
+        With NUM_WORKERS > 1 it launches one local worker process per worker instead,
+        each of which runs this pipeline under MultiWorkerMirroredStrategy.
         """
+        # Imported here so that TensorFlow is only loaded when the stage actually runs
+        from src.Chest_Cancer_Classification.components.trainer import Trainer
+        from src.Chest_Cancer_Classification.components.distributed import launch_local_workers
+        from src.Chest_Cancer_Classification.components.data_pipeline import DataPipeline
+        from Chest_Cancer_Classification.utils.artifacts import artifacts
+
+        training_config = self.config.get_training_config()
+        if training_config.params_num_workers > 1 and "TF_CONFIG" not in os.environ:
+            # Build the image cache once here rather than concurrently in every worker
+            if training_config.params_use_image_cache:
+                DataPipeline(config=training_config).prepare_cache()
+            # The workers load the prepared model from disk
+            artifacts.flush()
+            launch_local_workers(workers=training_config.params_num_workers, overrides=self.config.overrides)
+            return
+
         training = Trainer(config=self.config)
         training.train()
+
+
+if __name__ == "__main__":
+    # Entry point of the worker processes started by `launch_local_workers`
+    ModelTrainingPipeline(config=ConfigurationManager()).main()
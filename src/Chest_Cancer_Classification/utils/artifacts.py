@@ -0,0 +1,116 @@
+"""
+This module contains the in-process artifact registry used to hand live objects (e.g. Keras models) from one pipeline
+stage to the next. A stage publishes an artifact under its output path; the registry keeps the object in memory and
+writes it to disk in a background thread, so the next stage running in the same process gets the object directly
+instead of deserializing the file. A stage running on its own, in a fresh process, finds nothing in the registry
+and loads the file from disk.
+
+An object must not be modified while it is being written: call `flush(path)` before mutating a published artifact,
+and before reading its file (fingerprints, other processes).
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from Chest_Cancer_Classification import logger
+
+
+class ArtifactRegistry:
+    """
+    This class is responsible for keeping published artifacts in memory and persisting them asynchronously.
+    Writes run one at a time on a single background thread, in publication order.
+    """
+    def __init__(self):
+        self._objects = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-writer")
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.abspath(path)
+
+    @staticmethod
+    def _write(obj: Any, path: Path, save_fn: Callable):
+        """
+        Writes an artifact next to its path and renames it, so a reader never sees a partial file.
+        """
+        path = Path(path)
+        os.makedirs(path.parent, exist_ok=True)
+        tmp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
+        try:
+            save_fn(obj, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # Also logged here, as nobody may wait for the write of a stage run on its own
+            logger.exception(f"Failed to write artifact {path}: {e}")
+            raise
+        logger.info(f"Artifact written to {path}")
+
+    def publish(self, path: Path, obj: Any, save_fn: Callable) -> Future:
+        """
+        Registers a live artifact and schedules its write to disk.
+        Args:
+            path (Path): Output path of the artifact, which is also its key.
+            obj (Any): The artifact.
+            save_fn (Callable): `save_fn(obj, path)` writes the artifact to a file.
+        Returns:
+            Future: Completes when the file is written.
+        """
+        key = self._key(path)
+        self.flush(path)
+        with self._lock:
+            self._objects[key] = obj
+            future = self._executor.submit(self._write, obj, path, save_fn)
+            self._pending[key] = future
+        return future
+
+    def get(self, path: Path, load_fn: Callable) -> Any:
+        """
+        Returns the live artifact published under a path, or loads it from disk with `load_fn(path)`.
+        """
+        with self._lock:
+            obj = self._objects.get(self._key(path))
+        if obj is not None:
+            logger.info(f"Using in-memory artifact {path}")
+            return obj
+        return load_fn(path)
+
+    def flush(self, path: Path = None):
+        """
+        Waits until the pending write of an artifact (or of every artifact) is on disk.
+        Raises the exception of the first failed write, once: the failed write is no longer pending afterwards.
+        """
+        with self._lock:
+            if path is None:
+                futures = list(self._pending.items())
+            else:
+                key = self._key(path)
+                futures = [(key, self._pending[key])] if key in self._pending else []
+        error = None
+        for key, future in futures:
+            exception = future.exception()
+            error = error or exception
+            with self._lock:
+                if self._pending.get(key) is future:
+                    del self._pending[key]
+        if error is not None:
+            raise error
+
+    def discard(self, path: Path = None):
+        """
+        Flushes and forgets an artifact (or every artifact).
+        A stage taking ownership of a live artifact discards it before modifying it, so that the registry
+        never hands out an object that no longer matches its file; it also releases the memory of large models.
+        """
+        self.flush(path)
+        with self._lock:
+            if path is None:
+                self._objects.clear()
+            else:
+                self._objects.pop(self._key(path), None)
+
+
+artifacts = ArtifactRegistry()
@@ -4,12 +4,17 @@ handling binary files and creating directories if they do not exist.
 """
 
 import os
+import csv
+import copy
 import json
 from pathlib import Path
-from typing import Any, Union
+from typing import Any, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+import io
 import base64
 import yaml
-import joblib
+import numpy as np
+from PIL import Image
 from box import ConfigBox
 from ensure import ensure_annotations
 # `ensure_annotations` is a library that helps ensure that function annotations
@@ -24,10 +29,15 @@ from ensure import ensure_annotations
 
 from Chest_Cancer_Classification import logger
 
-@ensure_annotations
+# Parsed YAML files keyed by absolute path, with the modification time they were parsed at
+_YAML_CACHE = {}
+
+
 def read_yaml(path_to_yaml: Union[str, Path]) -> ConfigBox:
     """
     Reads a YAML file and returns its content as a ConfigBox object.
+    The parsed content is memoized by file modification time, so repeated reads of an unchanged
+    file skip parsing. Not wrapped in `ensure_annotations`, since it sits on the hot configuration path.
 
     Args:
         path_to_yaml (str): Path to the YAML file.
@@ -36,10 +46,16 @@ def read_yaml(path_to_yaml: Union[str, Path]) -> ConfigBox:
         ConfigBox: Content of the YAML file as a ConfigBox object.
     """
     try:
-        with open(str(path_to_yaml), encoding='utf-8') as yaml_file:
-            content = yaml.safe_load(yaml_file)
+        path = os.path.abspath(str(path_to_yaml))
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = _YAML_CACHE.get(path)
+        if cached is None or cached[0] != mtime_ns:
+            with open(path, encoding='utf-8') as yaml_file:
+                content = yaml.safe_load(yaml_file) or {}
+            _YAML_CACHE[path] = (mtime_ns, content)
             logger.info("YAML file %s loaded successfully.", path_to_yaml)
-            return ConfigBox(content)
+        # Copy so that callers applying overrides never mutate the cached content
+        return ConfigBox(copy.deepcopy(_YAML_CACHE[path][1]))
     except (yaml.YAMLError, FileNotFoundError, OSError) as e:
         logger.error("Error reading YAML file %s: %s", path_to_yaml, e)
         return ConfigBox({})
@@ -98,6 +114,113 @@ class JSONHandler:
             return data
 
 
+def _truncate_partial_line(path: str):
+    """
+    Drops an incomplete trailing line left behind by an interrupted write,
+    so that appended records always start on a new line.
+    """
+    with open(path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+            logger.info("Truncated incomplete last record of %s", path)
+
+
+class JSONLHandler:
+    """
+    A class to handle JSON Lines file operations, one JSON record per line.
+    Records are appended and flushed incrementally so that partial results survive interruptions.
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+    def append(self, records: list):
+        """
+        Appends records to the JSON Lines file.
+
+        Args:
+            records (list): List of dictionaries to append.
+        """
+        with open(self.path, 'a', encoding='utf-8') as jsonl_file:
+            for record in records:
+                jsonl_file.write(json.dumps(record) + "\n")
+
+    def load(self) -> list:
+        """
+        Loads every complete record of the JSON Lines file, dropping an incomplete last line.
+
+        Returns:
+            list: Records of the file, or an empty list if it does not exist.
+        """
+        if not os.path.exists(self.path):
+            return []
+        _truncate_partial_line(self.path)
+        with open(self.path, 'r', encoding='utf-8') as jsonl_file:
+            records = [json.loads(line) for line in jsonl_file if line.strip()]
+        logger.info("JSONL file %s loaded with %d records.", self.path, len(records))
+        return records
+
+
+class CSVHandler:
+    """
+    A class to handle CSV file operations with a fixed header.
+    Rows are appended and flushed incrementally so that partial results survive interruptions.
+    """
+    def __init__(self, path: str, fieldnames: list):
+        self.path = path
+        self.fieldnames = fieldnames
+
+    def append(self, records: list):
+        """
+        Appends records to the CSV file, writing the header if the file is new.
+
+        Args:
+            records (list): List of dictionaries keyed by the field names.
+        """
+        write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, 'a', encoding='utf-8', newline='') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=self.fieldnames)
+            if write_header:
+                writer.writeheader()
+            writer.writerows(records)
+
+    def load(self) -> list:
+        """
+        Loads every complete row of the CSV file, dropping an incomplete last line.
+
+        Returns:
+            list: Rows of the file as dictionaries, or an empty list if it does not exist.
+        """
+        if not os.path.exists(self.path):
+            return []
+        _truncate_partial_line(self.path)
+        with open(self.path, 'r', encoding='utf-8', newline='') as csv_file:
+            records = list(csv.DictReader(csv_file))
+        logger.info("CSV file %s loaded with %d records.", self.path, len(records))
+        return records
+
+
+@ensure_annotations
+def get_class_names(training_data: Union[str, Path], classes: int) -> list:
+    """
+    Returns the class names in training order (sorted sub-directories of the training data),
+    or the class indices as strings when the training data is not available.
+
+    Args:
+        training_data (str | Path): Directory with one sub-directory per class.
+        classes (int): Number of classes of the model.
+
+    Returns:
+        list: Class names indexed like the model outputs.
+    """
+    if os.path.isdir(training_data):
+        return sorted(
+            entry for entry in os.listdir(training_data)
+            if os.path.isdir(os.path.join(training_data, entry))
+        )
+    return [str(index) for index in range(classes)]
+
+
 class BinaryHandler:
     """
     A class to handle binary file operations.
@@ -113,6 +236,8 @@ class BinaryHandler:
         Args:
             data (Any): Data to be saved as binary.
         """
+        import joblib  # Imported lazily: only needed for binary artifacts
+
         joblib.dump(value=data, filename=self.path)
         logger.info("Binary file saved at: %s", self.path)
 
@@ -124,6 +249,8 @@ class BinaryHandler:
         Returns:
             Any: Object stored in the file.
         """
+        import joblib  # Imported lazily: only needed for binary artifacts
+
         data = joblib.load(self.path)
         logger.info("Binary file loaded from: %s", self.path)
         return data
@@ -191,3 +318,52 @@ class ImageBase64Handler:
         with open(file_name, 'wb') as f:
             f.write(imgdata)
         logger.info("Image decoded and saved to %s", file_name)
+
+    @staticmethod
+    def decode_image_to_array(imgstring: Union[str, bytes], target_size: Union[list, tuple],
+                              dtype: str = "float32") -> np.ndarray:
+        """
+        Decodes a Base64 encoded image directly into a ready-to-predict array, without writing an intermediate file.
+        Not wrapped in `ensure_annotations`, since it runs on every prediction request.
+
+        Args:
+            imgstring (str | bytes): Base64 encoded image, as a string or a bytes-like object such as the request
+                body bytes or a memoryview of them.
+            target_size (list | tuple): Target size as (height, width); extra dimensions are ignored.
+            dtype (str): "uint8" for raw pixels, or "float32" for pixels rescaled to [0, 1].
+
+        Returns:
+            np.ndarray: Image array of shape (height, width, 3).
+        """
+        height, width = target_size[:2]
+        imgdata = base64.b64decode(imgstring)
+        with Image.open(io.BytesIO(imgdata)) as image:
+            image = image.convert("RGB").resize((width, height), Image.BILINEAR)
+            array = np.asarray(image, dtype=np.uint8)
+        if dtype == "uint8":
+            return array
+        if dtype == "float32":
+            return array.astype(np.float32) / 255.0
+        raise ValueError("Invalid dtype. Use 'uint8' or 'float32'.")
+
+    @staticmethod
+    def decode_images_to_array(imgstrings: list, target_size: Union[list, tuple], dtype: str = "float32",
+                               max_workers: Optional[int] = None) -> np.ndarray:
+        """
+        Decodes a list of Base64 encoded images into a single batch array using a thread pool.
+
+        Args:
+            imgstrings (list): Base64 encoded images, as strings or bytes-like objects.
+            target_size (list | tuple): Target size as (height, width); extra dimensions are ignored.
+            dtype (str): "uint8" for raw pixels, or "float32" for pixels rescaled to [0, 1].
+            max_workers (int): Number of decoding threads (defaults to the executor's default).
+
+        Returns:
+            np.ndarray: Batch array of shape (len(imgstrings), height, width, 3).
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            images = list(executor.map(
+                lambda imgstring: ImageBase64Handler.decode_image_to_array(imgstring, target_size, dtype),
+                imgstrings
+            ))
+        return np.stack(images)
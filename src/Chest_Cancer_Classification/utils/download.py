@@ -0,0 +1,138 @@
+"""
+Utility functions for downloading files over HTTP(S), including resuming partial downloads with
+range requests, fetching large files in parallel ranged chunks and verifying SHA-256 checksums.
+Only the standard library is used, so any HTTP server (including a local stand-in) can serve the files.
+"""
+
+import os
+import shutil
+import hashlib
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from Chest_Cancer_Classification import logger
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def sha256sum(path: str) -> str:
+    """
+    Computes the SHA-256 checksum of a file.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        str: Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _copy_response(response, path: str, mode: str):
+    """
+    Streams an HTTP response body into a file.
+    """
+    with open(path, mode) as f:
+        shutil.copyfileobj(response, f, CHUNK_SIZE)
+
+
+def _fetch_range(url: str, path: str, start: int = 0, end: int = None, timeout: float = 60) -> bool:
+    """
+    Downloads bytes [start, end] of a URL into `path`, resuming from what `path` already holds.
+    Falls back to a full download when the server ignores the range request.
+
+    Returns:
+        bool: True if the server honoured the range request.
+    """
+    offset = os.path.getsize(path) if os.path.exists(path) else 0
+    if end is not None and start + offset > end:
+        return True
+
+    request = urllib.request.Request(url)
+    if start + offset > 0 or end is not None:
+        request.add_header("Range", f"bytes={start + offset}-{'' if end is None else end}")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            if response.status == 206:
+                _copy_response(response, path, "ab")
+                return True
+            _copy_response(response, path, "wb")
+            return False
+    except urllib.error.HTTPError as e:
+        # 416: the partial file already holds every byte that was requested
+        if e.code == 416:
+            return True
+        raise
+
+
+def download_with_resume(url: str, path: str, timeout: float = 60):
+    """
+    Downloads a URL into `path`, resuming a previous partial download (`<path>.part`) with a range request.
+
+    Args:
+        url (str): URL of the file.
+        path (str): Destination path.
+        timeout (float): Socket timeout in seconds.
+    """
+    part_path = f"{path}.part"
+    if os.path.exists(part_path):
+        logger.info("Resuming download of %s from byte %d", url, os.path.getsize(part_path))
+    _fetch_range(url, part_path, timeout=timeout)
+    os.replace(part_path, path)
+
+
+def _remote_size(url: str, timeout: float = 60) -> int:
+    """
+    Returns the size of the remote file if the server supports range requests, otherwise None.
+    """
+    request = urllib.request.Request(url, method="HEAD")
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+            return None
+        length = response.headers.get("Content-Length")
+        return int(length) if length else None
+
+
+def download_in_chunks(url: str, path: str, num_chunks: int, timeout: float = 60):
+    """
+    Downloads a URL in parallel ranged chunks (`<path>.part<i>`), each resumable, and joins them into `path`.
+    Falls back to a single resumable download when the server does not support range requests.
+
+    Args:
+        url (str): URL of the file.
+        path (str): Destination path.
+        num_chunks (int): Number of parallel chunks.
+        timeout (float): Socket timeout in seconds.
+    """
+    size = _remote_size(url, timeout) if num_chunks > 1 else None
+    if not size:
+        download_with_resume(url, path, timeout)
+        return
+
+    # Every chunk must hold at least one byte, otherwise its part file is never created
+    num_chunks = min(num_chunks, size)
+    bounds = [(size * i // num_chunks, size * (i + 1) // num_chunks - 1) for i in range(num_chunks)]
+    part_paths = [f"{path}.part{i}" for i in range(num_chunks)]
+    logger.info("Downloading %s (%d bytes) in %d chunks", url, size, num_chunks)
+
+    with ThreadPoolExecutor(max_workers=num_chunks) as executor:
+        honoured = list(executor.map(
+            lambda args: _fetch_range(url, args[0], args[1][0], args[1][1], timeout),
+            zip(part_paths, bounds)
+        ))
+    if not all(honoured):
+        for part_path, ok in zip(part_paths, honoured):
+            if not ok:
+                os.remove(part_path)
+        raise IOError(f"Server stopped honouring range requests for {url}")
+
+    with open(path, "wb") as out:
+        for part_path in part_paths:
+            with open(part_path, "rb") as part:
+                shutil.copyfileobj(part, out, CHUNK_SIZE)
+    for part_path in part_paths:
+        os.remove(part_path)
@@ -0,0 +1,44 @@
+"""
+Runs a hyperparameter sweep: every trial of the sweep specification trains the model with its own overrides
+of params.yaml, several trials at a time, and the ranked results are written to
+artifacts/sweeps/<name>/leaderboard.json.
+
+Usage:
+    ```bash
+    python sweep.py                                     # run config/sweep.yaml
+    python sweep.py --spec config/lr_sweep.yaml         # run another specification
+    python sweep.py --set params.EPOCHS=3               # override a value for every trial
+    python sweep.py --dry-run                           # list the trials without running them
+    ```
+"""
+
+import os
+import argparse
+from src.Chest_Cancer_Classification import logger
+from src.Chest_Cancer_Classification.config.configuration import ConfigurationManager
+from src.Chest_Cancer_Classification.pipeline.sweep_runner import SweepRunner
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a hyperparameter sweep over params.yaml.")
+    parser.add_argument("--spec", default=None, help="Sweep specification, defaults to sweep.spec_path in config.yaml.")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a value for every trial, e.g. params.EPOCHS=3.")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the trials.")
+    args = parser.parse_args()
+    overrides = dict(override.split("=", 1) for override in args.set)
+    if args.spec is not None:
+        # The specification path in config.yaml is relative to its directory, the command line one to the cwd
+        overrides["config.sweep.spec_path"] = os.path.abspath(args.spec)
+
+    try:
+        sweep_runner = SweepRunner(config=ConfigurationManager(overrides=overrides))
+        if args.dry_run:
+            for trial in sweep_runner.trials():
+                logger.info(f"{trial['id']}: {trial['params']}")
+        else:
+            for result in sweep_runner.run():
+                logger.info(f"{result['trial']} {result['status']} best={result['best']}: {result['params']}")
+    except Exception as e:
+        logger.exception(f"Exception occurred during the sweep: {e}")
+        raise e
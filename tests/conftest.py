@@ -0,0 +1,38 @@
+"""
+Shared pytest setup: the tests import the package like the pipeline scripts do, both as
+`Chest_Cancer_Classification` (installed from src/) and as `src.Chest_Cancer_Classification`.
+"""
+
+import os
+import sys
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """
+    Returns a factory of ConfigurationManager objects whose artifacts all live under `tmp_path`.
+    Keyword arguments are dotted-path overrides, e.g. `**{"params.IMAGE_SIZE": [8, 8, 3]}`.
+    """
+    from Chest_Cancer_Classification.constants import CONFIG_FILE_PATH
+    from Chest_Cancer_Classification.config.configuration import ConfigurationManager
+    from Chest_Cancer_Classification.utils.common import read_yaml
+
+    redirected = {"config.artifacts_root": str(tmp_path / "artifacts")}
+    for section, values in read_yaml(CONFIG_FILE_PATH).items():
+        if not isinstance(values, dict):
+            continue
+        for key, value in values.items():
+            if isinstance(value, str) and value.startswith("artifacts"):
+                redirected[f"config.{section}.{key}"] = str(tmp_path / value)
+
+    def _make(**overrides) -> ConfigurationManager:
+        return ConfigurationManager(overrides={**redirected, **overrides})
+
+    return _make
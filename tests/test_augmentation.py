@@ -0,0 +1,42 @@
+"""
+Tests of the RandomAffine augmentation layer.
+"""
+
+import numpy as np
+from Chest_Cancer_Classification.components.augmentation import RandomAffine
+
+AUGMENTATION_CONFIG = {
+    "ROTATION_RANGE": 40, "WIDTH_SHIFT_RANGE": 0.2, "HEIGHT_SHIFT_RANGE": 0.2,
+    "SHEAR_RANGE": 0.2, "ZOOM_RANGE": 0.2, "HORIZONTAL_FLIP": True
+}
+
+
+def _images(batch_size=3, height=12, width=10):
+    return np.random.default_rng(0).uniform(0, 255, (batch_size, height, width, 3)).astype(np.float32)
+
+
+def test_output_shape_and_dtype():
+    layer = RandomAffine.from_params(AUGMENTATION_CONFIG)
+    images = _images()
+    assert layer(images, training=True).shape == images.shape
+    assert layer(images[0], training=True).shape == images[0].shape
+    assert layer(images.astype(np.uint8), training=True).dtype == "uint8"
+
+
+def test_identity_outside_training():
+    layer = RandomAffine.from_params(AUGMENTATION_CONFIG)
+    images = _images()
+    np.testing.assert_array_equal(layer(images, training=False), images)
+    np.testing.assert_array_equal(layer(images), images)
+
+
+def test_zero_ranges_leave_images_unchanged():
+    images = _images()
+    np.testing.assert_allclose(RandomAffine()(images, training=True), images, atol=1e-3)
+
+
+def test_horizontal_flip_only_mirrors_images():
+    images = _images(batch_size=16)
+    augmented = RandomAffine(horizontal_flip=True)(images, training=True).numpy()
+    for image, result in zip(images, augmented):
+        assert np.allclose(result, image, atol=1e-3) or np.allclose(result, image[:, ::-1], atol=1e-3)
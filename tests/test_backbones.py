@@ -0,0 +1,25 @@
+"""
+Tests of the backbone registry: every backbone builds offline and its layers group into ordered blocks.
+"""
+
+import pytest
+from Chest_Cancer_Classification.components.backbones import BACKBONES, block_of, get_backbone
+
+
+@pytest.mark.parametrize("name", sorted(BACKBONES))
+def test_layers_group_into_ordered_blocks(name):
+    model = get_backbone(name).build(input_shape=(64, 64, 3), include_top=False, weights=None)
+    runs = []
+    for layer in model.layers:
+        block = block_of(layer.name, name)
+        if block is not None and (not runs or runs[-1] != block):
+            runs.append(block)
+
+    # Progressive fine-tuning unfreezes the last blocks, so every block must be a single run of layers
+    assert len(runs) > 1
+    assert len(runs) == len(set(runs))
+
+
+def test_unknown_backbone_is_rejected():
+    with pytest.raises(ValueError, match="Invalid backbone"):
+        get_backbone("alexnet")
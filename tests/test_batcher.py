@@ -0,0 +1,35 @@
+"""
+Tests of the DynamicBatcher request coalescing and shutdown.
+"""
+
+import threading
+import numpy as np
+import pytest
+from Chest_Cancer_Classification.components.batcher import DynamicBatcher
+
+
+def test_concurrent_requests_are_batched():
+    release = threading.Event()
+
+    def predict_fn(batch):
+        release.wait()
+        return batch * 2
+
+    batcher = DynamicBatcher(predict_fn, max_batch_size=4, max_wait_ms=50)
+    # The first batch blocks the worker, so the next requests queue up and are served together
+    futures = [batcher.submit(np.array([index])) for index in range(5)]
+    release.set()
+    assert [future.result(timeout=5)[0] for future in futures] == [0, 2, 4, 6, 8]
+    assert batcher.stats.summary()["batches"] < 5
+    batcher.close()
+
+
+def test_close_serves_queued_requests_and_rejects_new_ones():
+    batcher = DynamicBatcher(lambda batch: batch, max_batch_size=2, max_wait_ms=0)
+    futures = [batcher.submit(np.array([index])) for index in range(3)]
+    batcher.close()
+    assert [future.result(timeout=5)[0] for future in futures] == [0, 1, 2]
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit(np.array([3]))
+    batcher.worker.join(timeout=5)
+    assert not batcher.worker.is_alive()
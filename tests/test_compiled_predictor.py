@@ -0,0 +1,39 @@
+"""
+Tests of the bucketing and padding of the CompiledPredictor.
+"""
+
+import numpy as np
+import pytest
+from tensorflow import keras
+from Chest_Cancer_Classification.components.compiled_predictor import CompiledPredictor
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    model = keras.Sequential([
+        keras.Input(shape=(4, 4, 3)),
+        keras.layers.GlobalAveragePooling2D(),
+        keras.layers.Dense(2, activation="softmax")
+    ])
+    predictor = CompiledPredictor(model, image_size=[4, 4, 3], buckets=[4, 1, 2, 8])
+    predictor.warmup()
+    return predictor
+
+
+@pytest.mark.parametrize("batch_size, bucket", [(1, 1), (2, 2), (3, 4), (5, 8), (8, 8), (20, 8)])
+def test_bucket(predictor, batch_size, bucket):
+    assert predictor.bucket(batch_size) == bucket
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 8, 19])
+def test_padded_batches_match_the_model(predictor, batch_size):
+    images = np.random.default_rng(batch_size).uniform(size=(batch_size, 4, 4, 3)).astype(np.float32)
+    probabilities = predictor.predict(images)
+    assert probabilities.shape == (batch_size, 2) and probabilities.dtype == np.float32
+    np.testing.assert_allclose(probabilities, predictor.model(images, training=False).numpy(), atol=1e-6)
+
+
+def test_function_is_traced_once(predictor):
+    for batch_size in (1, 2, 3, 5, 8, 13):
+        predictor.predict(np.zeros((batch_size, 4, 4, 3), dtype=np.float32))
+    assert predictor.tracing_count == 1
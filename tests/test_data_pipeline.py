@@ -0,0 +1,50 @@
+"""
+Tests of the tf.data input pipeline when ingestion streams the images into the image cache.
+"""
+
+import zipfile
+import numpy as np
+from PIL import Image
+from Chest_Cancer_Classification.components.data_ingestion import DataIngestion
+from Chest_Cancer_Classification.components.data_pipeline import DataPipeline
+
+
+def _write_dataset_zip(path, classes=("adenocarcinoma", "normal"), images_per_class=5):
+    rng = np.random.default_rng(0)
+    with zipfile.ZipFile(path, "w") as zip_ref:
+        # A non-image member is extracted under the training data directory
+        zip_ref.writestr("Chest-CT-Scan-data/README.txt", "not an image")
+        for class_name in classes:
+            for index in range(images_per_class):
+                image = Image.fromarray(rng.integers(0, 255, (20, 20, 3), dtype=np.uint8))
+                with zip_ref.open(f"Chest-CT-Scan-data/{class_name}/{index}.png", "w") as f:
+                    image.save(f, format="PNG")
+
+
+def _ingest(config):
+    ingestion_config = config.get_data_ingestion_config()
+    _write_dataset_zip(ingestion_config.local_data_file)
+    DataIngestion(config=ingestion_config).extract_zip_file()
+
+
+def test_streamed_images_are_listed_from_the_manifest(make_config):
+    config = make_config(**{"config.data_ingestion.stream_to_image_cache": True, "params.IMAGE_SIZE": [8, 8, 3]})
+    _ingest(config)
+
+    data_pipeline = DataPipeline(config=config.get_training_config())
+    assert data_pipeline.class_names == ["adenocarcinoma", "normal"]
+    assert len(data_pipeline.list_files("training")[0]) == 8
+    assert len(data_pipeline.list_files("validation")[0]) == 2
+
+
+def test_streamed_image_cache_is_rebuilt_from_the_zip(make_config):
+    overrides = {
+        "config.data_ingestion.stream_to_image_cache": True, "params.BATCH_SIZE": 4, "params.IMAGE_CACHE": False
+    }
+    _ingest(make_config(**overrides, **{"params.IMAGE_SIZE": [8, 8, 3]}))
+
+    # A new image size needs a new cache, although the images were never extracted
+    config = make_config(**overrides, **{"params.IMAGE_SIZE": [6, 6, 3]})
+    dataset = DataPipeline(config=config.get_training_config()).build(subset="training", shuffle=False)
+    batches = list(dataset)
+    assert [tuple(images.shape) for images, _ in batches] == [(4, 6, 6, 3), (4, 6, 6, 3)]
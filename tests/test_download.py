@@ -0,0 +1,114 @@
+"""
+Tests of the HTTP download utilities against a local stand-in server supporting HEAD and range requests.
+"""
+
+import os
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from Chest_Cancer_Classification.utils.download import download_in_chunks, download_with_resume, sha256sum
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """
+    Serves `server.payload` at any path, honouring single `bytes=start-end` ranges when `server.ranges` is set.
+    """
+    def log_message(self, *args):
+        pass
+
+    def _headers(self, status: int, length: int, content_range: str = None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        if self.server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if content_range:
+            self.send_header("Content-Range", content_range)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._headers(200, len(self.server.payload))
+
+    def do_GET(self):
+        payload = self.server.payload
+        self.server.requests.append(self.headers.get("Range"))
+        requested = self.headers.get("Range")
+        if not (self.server.ranges and requested):
+            self._headers(200, len(payload))
+            self.wfile.write(payload)
+            return
+        start, end = requested.split("=")[1].split("-")
+        start, end = int(start), int(end) if end else len(payload) - 1
+        if start >= len(payload):
+            self._headers(416, 0)
+            return
+        body = payload[start:end + 1]
+        self._headers(206, len(body), f"bytes {start}-{start + len(body) - 1}/{len(payload)}")
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    """
+    Starts the stand-in server on a free local port.
+    """
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+    httpd.payload = os.urandom(100_003)
+    httpd.ranges = True
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}/data.zip"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.parametrize("num_chunks", [1, 4, 7])
+def test_download_in_chunks_reassembles_file(server, tmp_path, num_chunks):
+    path = str(tmp_path / "data.zip")
+    download_in_chunks(_url(server), path, num_chunks=num_chunks)
+    assert sha256sum(path) == _sha256(server.payload)
+    assert os.listdir(tmp_path) == ["data.zip"]
+
+
+def test_download_in_chunks_with_fewer_bytes_than_chunks(server, tmp_path):
+    server.payload = b"abc"
+    path = str(tmp_path / "data.zip")
+    download_in_chunks(_url(server), path, num_chunks=8)
+    assert open(path, "rb").read() == b"abc"
+    assert os.listdir(tmp_path) == ["data.zip"]
+
+
+def test_download_in_chunks_resumes_partial_chunks(server, tmp_path):
+    path = str(tmp_path / "data.zip")
+    # The first of two chunks was interrupted after 1000 bytes
+    with open(f"{path}.part0", "wb") as f:
+        f.write(server.payload[:1000])
+    download_in_chunks(_url(server), path, num_chunks=2)
+    assert sha256sum(path) == _sha256(server.payload)
+    assert "bytes=1000-50000" in server.requests
+
+
+def test_download_in_chunks_falls_back_without_range_support(server, tmp_path):
+    server.ranges = False
+    path = str(tmp_path / "data.zip")
+    download_in_chunks(_url(server), path, num_chunks=4)
+    assert sha256sum(path) == _sha256(server.payload)
+    assert server.requests == [None]
+
+
+def test_download_with_resume_continues_part_file(server, tmp_path):
+    path = str(tmp_path / "data.zip")
+    with open(f"{path}.part", "wb") as f:
+        f.write(server.payload[:5000])
+    download_with_resume(_url(server), path)
+    assert sha256sum(path) == _sha256(server.payload)
+    assert server.requests == ["bytes=5000-"]
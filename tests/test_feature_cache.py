@@ -0,0 +1,66 @@
+"""
+Tests of the invalidation of the cached bottleneck features.
+"""
+
+import numpy as np
+import pytest
+import tensorflow as tf
+from Chest_Cancer_Classification.components.feature_cache import FeatureCache
+
+
+class _Backbone:
+    """
+    Stand-in for the frozen convolutional base: averages every channel and counts the batches it runs on.
+    """
+    output_shape = (None, 3)
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, images, training=False):
+        self.calls += 1
+        return tf.reduce_mean(images, axis=[1, 2])
+
+
+def _dataset(samples=6, batch_size=4):
+    images = np.arange(samples * 4 * 4 * 3, dtype=np.float32).reshape(samples, 4, 4, 3)
+    labels = np.eye(2, dtype=np.float32)[np.arange(samples) % 2]
+    return tf.data.Dataset.from_tensor_slices((images, labels)).batch(batch_size)
+
+
+def test_features_are_extracted_once(tmp_path):
+    backbone = _Backbone()
+    feature_cache = FeatureCache(tmp_path, fingerprint={"backbone": "a"})
+    feature_cache.extract(backbone, _dataset(), samples=6, subset="training", passes=2)
+
+    features, labels = feature_cache.load("training")
+    assert features.shape == (12, 3) and labels.shape == (12, 2)
+    assert backbone.calls == 4
+
+    FeatureCache(tmp_path, fingerprint={"backbone": "a"}).extract(backbone, _dataset(), 6, "training", passes=2)
+    assert backbone.calls == 4
+
+
+@pytest.mark.parametrize("fingerprint, passes", [({"backbone": "b"}, 1), ({"backbone": "a"}, 2)])
+def test_features_are_invalidated(tmp_path, fingerprint, passes):
+    backbone = _Backbone()
+    FeatureCache(tmp_path, fingerprint={"backbone": "a"}).extract(backbone, _dataset(), 6, "training")
+
+    feature_cache = FeatureCache(tmp_path, fingerprint=fingerprint)
+    assert not feature_cache.is_valid("training", passes)
+    feature_cache.extract(backbone, _dataset(), 6, "training", passes=passes)
+    assert feature_cache.is_valid("training", passes)
+    assert backbone.calls == 2 + 2 * passes
+
+
+def test_wrong_sample_count_is_not_cached(tmp_path):
+    feature_cache = FeatureCache(tmp_path, fingerprint={"backbone": "a"})
+    with pytest.raises(ValueError, match="yielded 6 images"):
+        feature_cache.extract(_Backbone(), _dataset(samples=6), samples=8, subset="training")
+    assert not feature_cache.is_valid("training", 1)
+
+
+def test_empty_subset_is_rejected(tmp_path):
+    feature_cache = FeatureCache(tmp_path, fingerprint={"backbone": "a"})
+    with pytest.raises(ValueError, match="no images"):
+        feature_cache.extract(_Backbone(), _dataset(samples=0), samples=0, subset="validation")
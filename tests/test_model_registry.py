@@ -0,0 +1,71 @@
+"""
+Tests of the lazy loading and eviction of the ModelRegistry. Loading is replaced by a stand-in model whose
+footprint is set by the test, so no Keras model is built.
+"""
+
+import pytest
+from Chest_Cancer_Classification.components.batcher import DynamicBatcher
+from Chest_Cancer_Classification.components.model_registry import ModelRegistry, ServedModel, UnknownModelVersion
+
+
+def _registry(make_config, versions=("a", "b", "c"), footprint_mb=10.0, **overrides) -> ModelRegistry:
+    config = make_config(**overrides).get_prediction_config()
+    config.models_dir.mkdir(parents=True, exist_ok=True)
+    for version in versions:
+        (config.models_dir / f"{version}.h5").write_bytes(b"model")
+    registry = ModelRegistry(config)
+
+    def load(version, path, file_version):
+        batcher = DynamicBatcher(predict_fn=lambda images: images, max_batch_size=1, max_wait_ms=0)
+        return ServedModel(version, path, file_version, None, batcher, footprint_mb, load_s=0.0)
+
+    registry._load = load
+    return registry
+
+
+def _use(registry, *versions):
+    for version in versions:
+        with registry.acquire(version):
+            pass
+
+
+def test_least_recently_used_version_is_evicted(make_config):
+    registry = _registry(make_config, **{"params.MAX_RESIDENT_MODELS": 2})
+    _use(registry, "a", "b", "a", "c")
+    assert list(registry.resident) == ["a", "c"]
+    assert registry.counters == {"loads": 3, "evictions": 1}
+
+
+def test_memory_limit_evicts_versions(make_config):
+    registry = _registry(
+        make_config, footprint_mb=60.0, **{"params.MAX_RESIDENT_MODELS": 3, "params.MAX_RESIDENT_MEMORY_MB": 100}
+    )
+    _use(registry, "a", "b")
+    assert list(registry.resident) == ["b"]
+    assert registry.stats()["resident_mb"] == 60.0
+
+
+def test_version_in_use_is_not_evicted(make_config):
+    registry = _registry(make_config, **{"params.MAX_RESIDENT_MODELS": 1})
+    with registry.acquire("a") as served:
+        _use(registry, "b")
+        assert list(registry.resident) == ["a", "b"] and not served.retired
+    _use(registry, "c")
+    assert list(registry.resident) == ["c"]
+
+
+def test_saved_again_version_is_reloaded(make_config):
+    registry = _registry(make_config)
+    _use(registry, "a")
+    first = registry.resident["a"]
+    (registry.models_dir / "a.h5").write_bytes(b"retrained model")
+    _use(registry, "a")
+    assert registry.resident["a"] is not first and first.retired
+    assert registry.counters["loads"] == 2
+
+
+def test_unknown_version_is_rejected(make_config):
+    registry = _registry(make_config)
+    assert registry.resolve("b") == "b"
+    with pytest.raises(UnknownModelVersion):
+        registry.resolve("missing")
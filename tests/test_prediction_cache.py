@@ -0,0 +1,58 @@
+"""
+Tests of the LRU and TTL eviction of the PredictionCache tiers.
+"""
+
+import time
+import itertools
+import numpy as np
+from Chest_Cancer_Classification.components.prediction_cache import PredictionCache
+
+
+def _key(index: int, version: str = "v1") -> str:
+    return PredictionCache.key(np.full((2, 2, 3), index, dtype=np.uint8), version)
+
+
+def test_keys_depend_on_pixels_and_model_version():
+    assert _key(0) != _key(1)
+    assert _key(0) != _key(0, version="v2")
+    assert _key(0) == _key(0)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = PredictionCache(max_entries=2, ttl_s=0)
+    cache.put(_key(0), [0.1, 0.9])
+    cache.put(_key(1), [0.2, 0.8])
+    assert cache.get(_key(0)) is not None
+    cache.put(_key(2), [0.3, 0.7])
+
+    assert cache.get(_key(1)) is None
+    np.testing.assert_allclose(cache.get(_key(0)), [0.1, 0.9])
+    np.testing.assert_allclose(cache.get(_key(2)), [0.3, 0.7])
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_not_served(tmp_path, monkeypatch):
+    cache = PredictionCache(max_entries=2, ttl_s=60, disk_path=tmp_path / "cache.sqlite", max_disk_entries=10)
+    cache.put(_key(0), [0.1, 0.9])
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+
+    assert cache.get(_key(0)) is None
+    stats = cache.stats()
+    assert stats["expired"] == 2 and stats["memory_entries"] == 0 and stats["disk_entries"] == 0
+
+
+def test_disk_tier_survives_restarts_and_is_bounded(tmp_path, monkeypatch):
+    # Distinct access times, so the least recently used entry is well defined
+    clock = itertools.count(time.time())
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+    disk_path = tmp_path / "cache.sqlite"
+    cache = PredictionCache(max_entries=1, ttl_s=0, disk_path=disk_path, max_disk_entries=2)
+    for index in range(3):
+        cache.put(_key(index), [index / 10, 1 - index / 10])
+    assert cache.stats()["disk_entries"] == 2
+
+    restarted = PredictionCache(max_entries=1, ttl_s=0, disk_path=disk_path, max_disk_entries=2)
+    assert restarted.get(_key(0)) is None
+    np.testing.assert_allclose(restarted.get(_key(2)), [0.2, 0.8])
+    assert restarted.stats()["disk_hits"] == 1
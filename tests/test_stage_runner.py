@@ -0,0 +1,93 @@
+"""
+Tests of the fingerprinting and skipping of the pipeline stages.
+"""
+
+import json
+import pytest
+from Chest_Cancer_Classification.pipeline.stage_runner import Stage, StageRunner
+
+
+def _stages(tmp_path) -> list:
+    return [
+        Stage(name="first", title="First", pipeline="first", params_keys=["BATCH_SIZE"],
+              outs=[str(tmp_path / "first.txt")]),
+        Stage(name="second", title="Second", pipeline="second", deps=[str(tmp_path / "first.txt")],
+              outs=[str(tmp_path / "second.txt")]),
+    ]
+
+
+def _runner(config, tmp_path, calls: list, fail: str = None) -> StageRunner:
+    """
+    Returns a runner whose stages write their outputs and append their name to `calls`.
+    """
+    runner = StageRunner(config, stages=_stages(tmp_path))
+
+    def load_pipeline(name):
+        stage = next(stage for stage in runner.stages if stage.name == name)
+
+        class Pipeline:
+            def __init__(self, config):
+                pass
+
+            def main(self):
+                calls.append(name)
+                if name == fail:
+                    raise RuntimeError(f"{name} failed")
+                for out in stage.outs:
+                    with open(out, "w", encoding="utf-8") as f:
+                        f.write(f"{name} {len(calls)}")
+
+        return Pipeline
+
+    runner._load_pipeline = load_pipeline
+    return runner
+
+
+def test_up_to_date_stages_are_skipped(make_config, tmp_path):
+    config, calls = make_config(), []
+    assert _runner(config, tmp_path, calls).run() == ["first", "second"]
+    assert _runner(config, tmp_path, calls).run() == []
+    assert calls == ["first", "second"]
+
+
+def test_changed_params_rerun_the_stage_and_its_dependents(make_config, tmp_path):
+    calls = []
+    _runner(make_config(), tmp_path, calls).run()
+
+    runner = _runner(make_config(**{"params.BATCH_SIZE": 3}), tmp_path, calls)
+    assert [reason for _, reason in runner.plan()] == ["inputs changed", None]
+    assert runner.run() == ["first", "second"]
+
+
+def test_missing_or_modified_outputs_rerun_the_stage(make_config, tmp_path):
+    config, calls = make_config(), []
+    _runner(config, tmp_path, calls).run()
+
+    (tmp_path / "second.txt").unlink()
+    assert _runner(config, tmp_path, calls).run() == ["second"]
+
+    (tmp_path / "first.txt").write_text("edited by hand", encoding="utf-8")
+    runner = _runner(config, tmp_path, calls)
+    assert runner.status(runner.stages[0]) == "outputs changed"
+    assert runner.run() == ["first", "second"]
+
+
+def test_dry_run_and_from_stage(make_config, tmp_path):
+    config, calls = make_config(), []
+    assert _runner(config, tmp_path, calls).run(dry_run=True) == ["first", "second"]
+    assert calls == []
+
+    _runner(config, tmp_path, calls).run()
+    assert _runner(config, tmp_path, calls).run(from_stage="second") == ["second"]
+    with pytest.raises(ValueError, match="Unknown stage"):
+        _runner(config, tmp_path, calls).plan(from_stage="third")
+
+
+def test_failed_stage_keeps_the_fingerprints_of_completed_stages(make_config, tmp_path):
+    config, calls = make_config(), []
+    with pytest.raises(RuntimeError, match="second failed"):
+        _runner(config, tmp_path, calls, fail="second").run()
+
+    with open(config.config.stage_runner.state_path, "r", encoding="utf-8") as f:
+        assert list(json.load(f)) == ["first"]
+    assert _runner(config, tmp_path, calls).run() == ["second"]